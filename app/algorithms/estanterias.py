@@ -1,7 +1,37 @@
-from itertools import combinations
+import atexit
+import heapq
+import multiprocessing
+import os
+import threading
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from itertools import accumulate, combinations
+from math import comb
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency: pure Python engine
+    np = None
 
 PESO_MAX = 8  # 8 Kg maximum allowed
 
+# Engine enumerating the 4-book combinations over the limit
+MOTOR_COMBINACIONES = "numpy" if np is not None else "python"
+
+# Most processes a parallel scan may use
+MAX_WORKERS = os.cpu_count() or 1
+
+# Elements compared per vectorized step (~256 KiB of int64 pair sums)
+TAMANO_BLOQUE = 32_768
+
+# Memory kept for precomputed pair sums per scan (NumPy engine)
+MAX_BYTES_PARES = 64 * 2 ** 20
+
+# Largest value of a 64-bit integer (NumPy int64, array("q"))
+MAX_ENTERO_64 = 2 ** 63 - 1
+
 
 # ============================================================
 #   1) BRUTE FORCE - Combinations of 4 books exceeding 8 kg
@@ -28,6 +58,488 @@ def combinaciones_peligrosas(libros):
     return peligrosas
 
 
+# ============================================================
+#   1b) COUNT ONLY - How many 4-book combinations exceed 8 kg
+# ============================================================
+
+def _pesos_enteros(pesos, peso_max):
+    """
+    Scales the weights (as written, e.g. 2.35) and the limit to integers,
+    so sums are exact and do not depend on float rounding order.
+    The scale is not bounded (weights with many decimals give big Python
+    ints): check _cabe_en_64 before using 64-bit arrays.
+    Returns (integer weights, integer limit, scale factor).
+    Raises ValueError for a NaN or infinite weight.
+    """
+    decimales = [Decimal(repr(float(p))) for p in pesos] + [Decimal(repr(float(peso_max)))]
+    if not all(d.is_finite() for d in decimales):
+        raise ValueError("Weights must be finite numbers (no NaN or infinity)")
+    escala = 10 ** max(0, max(-d.as_tuple().exponent for d in decimales))
+    return [int(d * escala) for d in decimales[:-1]], int(decimales[-1] * escala), escala
+
+
+def _cabe_en_64(pesos, limite):
+    """
+    True if any sum of 4 weights (and the limit) fits in a 64-bit integer,
+    so the NumPy engine and array("q") can hold them without overflow.
+    """
+    return 4 * max([abs(limite)] + [abs(p) for p in pesos]) <= MAX_ENTERO_64
+
+
+def _pares_que_superan(valores, umbral):
+    """
+    Two pointers over a SORTED list: number of pairs i < j whose sum is
+    greater than `umbral`. O(len(valores)).
+    """
+    total = 0
+    i, j = 0, len(valores) - 1
+    while i < j:
+        if valores[i] + valores[j] > umbral:
+            total += j - i
+            j -= 1
+        else:
+            i += 1
+    return total
+
+
+def contar_combinaciones_peligrosas(libros, peso_max=PESO_MAX):
+    """
+    Returns HOW MANY combinations of 4 books weigh more than `peso_max`,
+    without enumerating them (same count as iterar_combinaciones_peligrosas yields;
+    weights compared exactly, so it can differ from the float combinaciones_peligrosas
+    at exactly `peso_max`).
+
+    Meet in the middle over pairs, O(n^2 log n) instead of O(n^4):
+    - A = pairs of distinct book-pairs {P, Q} with peso(P) + peso(Q) > max
+      (sort the n(n-1)/2 pair sums once, then two pointers).
+    - Pairs {P, Q} sharing one book a are 2*w(a) + w(b) + w(c) > max;
+      B counts them with a two-pointer pass per book.
+    - Every 4-book set splits into 3 disjoint pairs of pairs: (A - B) / 3.
+    """
+    n = len(libros)
+    if n < 4:
+        return 0
+
+    pesos, limite, _ = _pesos_enteros([libro.peso for libro in libros], peso_max)
+    pesos.sort()
+
+    # A: pairs of different book-pairs (may share a book) over the limit
+    sumas = sorted(pesos[i] + pesos[j] for i in range(n) for j in range(i + 1, n))
+    pares_de_pares = _pares_que_superan(sumas, limite)
+
+    # B: pairs of book-pairs sharing exactly one book a
+    compartidos = 0
+    for a in range(n):
+        restante = limite - 2 * pesos[a]
+        # pairs {b, c} over the limit among all books, minus those using a
+        con_a = sum(1 for c in range(n) if c != a and pesos[a] + pesos[c] > restante)
+        compartidos += _pares_que_superan(pesos, restante) - con_a
+
+    return (pares_de_pares - compartidos) // 3
+
+
+# ============================================================
+#   1c) LAZY - Combinations of 4 books exceeding 8 kg, one at a time
+# ============================================================
+
+def iterar_combinaciones_peligrosas(libros, peso_max=PESO_MAX):
+    """
+    Generator version of combinaciones_peligrosas: yields each combination
+    of 4 books whose total weight exceeds `peso_max` as soon as it is found,
+    in the same order as itertools.combinations. Memory stays constant.
+
+    Weights are compared exactly (as written), like contar_combinaciones_peligrosas.
+    The combinations come in blocks from the same engines as
+    bloques_combinaciones_peligrosas.
+
+    Yields: {"libros": (4 books), "peso_total": float}
+    """
+    if len(libros) < 4:
+        return
+    pesos, limite, escala = _pesos_enteros([libro.peso for libro in libros], peso_max)
+    for bloque in _bloques(pesos, limite):
+        for i, j, k, l in bloque:
+            yield {
+                "libros": (libros[i], libros[j], libros[k], libros[l]),
+                "peso_total": (pesos[i] + pesos[j] + pesos[k] + pesos[l]) / escala,
+            }
+
+
+def bloques_combinaciones_peligrosas(libros, peso_max=PESO_MAX):
+    """
+    Index tuples (i, j, k, l), i < j < k < l, of the combinations of 4 books
+    weighing more than `peso_max`, in itertools.combinations order and in
+    blocks (each block a sequence of rows of 4 positions in `libros`).
+
+    Uses NumPy when installed (MOTOR_COMBINACIONES == "numpy") and the
+    scaled weights fit in 64 bits, otherwise the same enumeration in pure
+    Python (arbitrary precision ints).
+    """
+    if len(libros) < 4:
+        return iter(())
+    pesos, limite, _ = _pesos_enteros([libro.peso for libro in libros], peso_max)
+    return _bloques(pesos, limite)
+
+
+def _bloques(pesos, limite):
+    """
+    Engine selection over already scaled integer weights.
+    """
+    if np is not None and _cabe_en_64(pesos, limite):
+        return _bloques_numpy(pesos, limite)
+    return _bloques_python(pesos, limite)
+
+
+def _bloques_python(pesos, limite, desde=0, hasta=None, tamano=TAMANO_BLOQUE // 8):
+    """
+    Nested loops over integer weights; a branch is skipped when even the
+    heaviest remaining books cannot push it over the limit.
+    Only first indices i in [desde, hasta) are enumerated.
+    Yields lists of (i, j, k, l).
+    """
+    n = len(pesos)
+    hasta = n - 3 if hasta is None else min(hasta, n - 3)
+
+    # heaviest weight from position i to the end
+    maximo_desde = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        maximo_desde[i] = max(pesos[i], maximo_desde[i + 1])
+
+    bloque = []
+    for i in range(desde, hasta):
+        s1 = pesos[i]
+        if s1 + 3 * maximo_desde[i + 1] <= limite:
+            continue
+        for j in range(i + 1, n - 2):
+            s2 = s1 + pesos[j]
+            if s2 + 2 * maximo_desde[j + 1] <= limite:
+                continue
+            for k in range(j + 1, n - 1):
+                s3 = s2 + pesos[k]
+                if s3 + maximo_desde[k + 1] <= limite:
+                    continue
+                for l in range(k + 1, n):
+                    if s3 + pesos[l] > limite:
+                        bloque.append((i, j, k, l))
+                if len(bloque) >= tamano:
+                    yield bloque
+                    bloque = []
+    if bloque:
+        yield bloque
+
+
+class _TablaPares:
+    """
+    Pair sums w[k] + w[l] (k < l) in (k, l) order, split into segments of
+    consecutive rows k with about TAMANO_BLOQUE pairs each.
+
+    Segments are built on first use and kept while they fit in
+    MAX_BYTES_PARES (16 bytes per pair); past that budget they are rebuilt
+    each time they are needed. Memory stays bounded whatever the number of
+    books, and nothing is built before the first segment is scanned.
+    """
+
+    def __init__(self, pesos, presupuesto=None):
+        n = len(pesos)
+        self.n = n
+        self.w = np.asarray(pesos, dtype=np.int64)
+        self.presupuesto = MAX_BYTES_PARES if presupuesto is None else presupuesto
+        # position of the first pair of each row in the (k, l) order
+        self.inicio_fila = list(accumulate([n - 1 - k for k in range(n)], initial=0))
+
+        # heaviest pair of each row, and from each row to the end
+        mas_pesado, mejor_fila = None, [None] * n
+        for k in range(n - 1, -1, -1):
+            mejor_fila[k] = pesos[k] + mas_pesado if mas_pesado is not None else None
+            mas_pesado = pesos[k] if mas_pesado is None else max(mas_pesado, pesos[k])
+        self.mejor_desde = [None] * (n + 1)
+        for k in range(n - 2, -1, -1):
+            siguiente = self.mejor_desde[k + 1]
+            self.mejor_desde[k] = mejor_fila[k] if siguiente is None else max(mejor_fila[k], siguiente)
+
+        # segments: rows [a, b), their heaviest pair, and the segment of each row
+        self.cortes, self.mejor_segmento, self.segmento_de_fila = [], [], [0] * n
+        a = 0
+        while a < n - 1:
+            b = a + 1
+            while b < n - 1 and self.inicio_fila[b + 1] - self.inicio_fila[a] <= TAMANO_BLOQUE:
+                b += 1
+            for fila in range(a, b):
+                self.segmento_de_fila[fila] = len(self.cortes)
+            self.mejor_segmento.append(max(mejor_fila[a:b]))
+            self.cortes.append((a, b))
+            a = b
+        self._segmentos = {}
+        self._bytes = 0
+
+    def segmento(self, s):
+        """(k, l, sums) arrays of segment s."""
+        guardado = self._segmentos.get(s)
+        if guardado is not None:
+            return guardado
+        a, b = self.cortes[s]
+        filas = np.arange(a, b, dtype=np.int32)
+        largos = self.n - 1 - filas
+        k = np.repeat(filas, largos)
+        inicio = np.repeat(np.asarray(self.inicio_fila[a:b], dtype=np.int64) - self.inicio_fila[a], largos)
+        l = (np.arange(len(k), dtype=np.int64) - inicio + k + 1).astype(np.int32)
+        sumas = self.w[k] + self.w[l]
+        segmento = (k, l, sumas)
+        if self._bytes + 16 * len(k) <= self.presupuesto:
+            self._segmentos[s] = segmento
+            self._bytes += 16 * len(k)
+        return segmento
+
+
+def _bloques_numpy(pesos, limite, desde=0, hasta=None, tabla=None):
+    """
+    Vectorized enumeration. Pair sums w[k] + w[l] (k < l) are laid out in
+    (k, l) order (see _TablaPares); for a prefix (i, j) the valid (k, l)
+    pairs (k > j) are a contiguous suffix of that order, so one comparison
+    against `limite - w[i] - w[j]` per segment finds them. Prefixes and
+    segments that cannot exceed the limit even with their heaviest pair
+    are skipped. Only first indices i in [desde, hasta) are enumerated.
+    Yields int arrays of shape (m, 4).
+    """
+    n = len(pesos)
+    hasta = n - 3 if hasta is None else min(hasta, n - 3)
+    if tabla is None:
+        tabla = _TablaPares(pesos)
+    mejor_desde, cortes = tabla.mejor_desde, tabla.cortes
+
+    for i in range(desde, hasta):
+        for j in range(i + 1, n - 2):
+            umbral = limite - pesos[i] - pesos[j]
+            if mejor_desde[j + 1] <= umbral:
+                continue
+            for s in range(tabla.segmento_de_fila[j + 1], len(cortes)):
+                a, b = cortes[s]
+                primera = max(a, j + 1)
+                if mejor_desde[primera] <= umbral:
+                    break
+                if tabla.mejor_segmento[s] <= umbral:
+                    continue
+                k, l, sumas = tabla.segmento(s)
+                desplazamiento = tabla.inicio_fila[primera] - tabla.inicio_fila[a]
+                posiciones = np.flatnonzero(sumas[desplazamiento:] > umbral) + desplazamiento
+                if posiciones.size:
+                    bloque = np.empty((posiciones.size, 4), dtype=np.intp)
+                    bloque[:, 0] = i
+                    bloque[:, 1] = j
+                    bloque[:, 2] = k[posiciones]
+                    bloque[:, 3] = l[posiciones]
+                    yield bloque
+
+
+# ============================================================
+#   1d) PARALLEL - Brute-force scan split across processes
+# ============================================================
+
+def _tramos(n, partes):
+    """
+    Splits the first index range [0, n - 3) into at most `partes`
+    contiguous (desde, hasta) ranges of similar work. Prefix i has
+    C(n - 1 - i, 3) combinations, so early prefixes are much heavier:
+    ranges are cut on the cumulative work, not on the number of indices.
+    """
+    primeros = max(0, n - 3)
+    trabajo = list(accumulate(comb(n - 1 - i, 3) for i in range(primeros)))
+    if not trabajo:
+        return []
+    total = trabajo[-1]
+    tramos, desde = [], 0
+    for parte in range(1, partes + 1):
+        objetivo = total * parte / partes
+        hasta = desde
+        while hasta < primeros and (trabajo[hasta] <= objetivo or hasta == desde):
+            hasta += 1
+        if hasta > desde:
+            tramos.append((desde, hasta))
+            desde = hasta
+    if desde < primeros:
+        tramos[-1] = (tramos[-1][0], primeros)
+    return tramos
+
+
+# Pair table of the last weights scanned in this process (pool workers)
+_tabla_worker = {"pesos": None, "tabla": None}
+
+
+def _tabla_para(pesos):
+    """
+    Pair table for these weights, built once per worker process and reused
+    by every range of the same scan (and by later scans of the same shelf).
+    """
+    if _tabla_worker["pesos"] != pesos:
+        _tabla_worker["pesos"], _tabla_worker["tabla"] = None, None  # free the old one first
+        _tabla_worker["tabla"] = _TablaPares(pesos)
+        _tabla_worker["pesos"] = pesos
+    return _tabla_worker["tabla"]
+
+
+def _escanear_tramo(pesos, limite, desde, hasta, tabla=None):
+    """
+    Worker: index tuples over the limit for first indices [desde, hasta).
+    Receives the integer weights as a compact array (not Libro objects)
+    and returns one flat array of indices (4 per combination), cheap to
+    send back to the parent process. `tabla` is the pair table when run in
+    the calling process; pool workers keep their own (see _tabla_para).
+    """
+    pesos = list(pesos)
+    if np is not None and _cabe_en_64(pesos, limite):
+        tabla = tabla if tabla is not None else _tabla_para(pesos)
+        bloques = list(_bloques_numpy(pesos, limite, desde, hasta, tabla))
+        return np.concatenate(bloques).astype(np.int32).ravel() if bloques else np.empty(0, np.int32)
+    plano = array("i")
+    for bloque in _bloques_python(pesos, limite, desde, hasta):
+        for fila in bloque:
+            plano.extend(fila)
+    return plano
+
+
+# Long-lived process pool shared by parallel scans (MAX_WORKERS processes)
+_pool = {"executor": None}
+_pool_lock = threading.Lock()
+
+
+def _obtener_pool():
+    """
+    Returns the shared ProcessPoolExecutor of MAX_WORKERS processes,
+    creating it on first use. It is never resized nor shut down while the
+    API runs (other requests may be using it); each scan limits its own
+    parallelism instead (see escanear_paralelo).
+
+    Workers are started with "forkserver" (or "spawn"), never by forking
+    the threaded API process; start-up (interpreter + imports, ~0.1-0.3 s
+    per process) is paid once, not per request.
+    """
+    with _pool_lock:
+        if _pool["executor"] is None:
+            metodo = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool["executor"] = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context(metodo))
+        return _pool["executor"]
+
+
+def cerrar_pool():
+    """Shuts down the shared process pool (if started): at exit, when no scan is running."""
+    with _pool_lock:
+        if _pool["executor"] is not None:
+            _pool["executor"].shutdown()
+            _pool["executor"] = None
+
+
+atexit.register(cerrar_pool)
+
+
+def escanear_paralelo(pesos, limite, workers=1, tareas_por_worker=4):
+    """
+    Runs the scan over integer weights on `workers` processes (at most
+    MAX_WORKERS). Returns the flat index arrays of every range, in range
+    order (their concatenation is in itertools.combinations order).
+
+    Ranges go to the shared pool with at most `workers` of them in flight,
+    so a request never takes more than its share of the pool.
+    """
+    workers = max(1, min(workers, MAX_WORKERS))
+    tramos = _tramos(len(pesos), workers * tareas_por_worker)
+    if workers == 1:
+        # one pair table for every range, dropped when the scan ends
+        tabla = _TablaPares(pesos) if np is not None and _cabe_en_64(pesos, limite) else None
+        return [_escanear_tramo(pesos, limite, d, h, tabla) for d, h in tramos]
+    # 64-bit array when the weights fit, plain Python ints otherwise
+    compactos = array("q", pesos) if _cabe_en_64(pesos, limite) else tuple(pesos)
+    pool = _obtener_pool()
+    pendientes, planos = deque(), []
+    for desde, hasta in tramos:
+        if len(pendientes) == workers:
+            planos.append(pendientes.popleft().result())
+        pendientes.append(pool.submit(_escanear_tramo, compactos, limite, desde, hasta))
+    planos.extend(futuro.result() for futuro in pendientes)
+    return planos
+
+
+def combinaciones_peligrosas_paralelo(libros, peso_max=PESO_MAX, workers=1, tareas_por_worker=4):
+    """
+    Same combinations as iterar_combinaciones_peligrosas, computed with the block
+    engine (NumPy or pure Python) on `workers` processes.
+
+    The combination space is partitioned by the first index into about
+    `tareas_por_worker` ranges per worker, balanced by their number of
+    combinations; ranges are submitted in order to the shared process pool,
+    at most `workers` at a time (see escanear_paralelo), so the result is in itertools.combinations order
+    for any `workers`. `workers` is capped at MAX_WORKERS; workers=1 runs
+    in the calling process (no pool).
+
+    Weights are compared exactly (as written), like contar_combinaciones_peligrosas.
+
+    Returns: [{"libros": (4 books), "peso_total": float}, ...]
+    """
+    if len(libros) < 4:
+        return []
+    pesos, limite, escala = _pesos_enteros([libro.peso for libro in libros], peso_max)
+
+    peligrosas = []
+    for plano in escanear_paralelo(pesos, limite, workers, tareas_por_worker):
+        plano = plano.tolist()
+        for p in range(0, len(plano), 4):
+            i, j, k, l = plano[p:p + 4]
+            peligrosas.append({
+                "libros": (libros[i], libros[j], libros[k], libros[l]),
+                "peso_total": (pesos[i] + pesos[j] + pesos[k] + pesos[l]) / escala,
+            })
+    return peligrosas
+
+
+# ============================================================
+#   1e) TOP-K - Heaviest combinations of 4 books, best first
+# ============================================================
+
+def combinaciones_mas_pesadas(libros, k, peso_max=PESO_MAX):
+    """
+    Returns the `k` heaviest combinations of 4 books among those weighing
+    more than `peso_max`, heaviest first, without enumerating the rest.
+
+    Lazy k-best enumeration: books are sorted by weight (heaviest first)
+    and a combination is 4 positions a < b < c < d in that order, starting
+    at (0, 1, 2, 3), the heaviest one. Moving one position to the next
+    book never adds weight, so popping a bounded max-heap of frontier
+    combinations returns them in decreasing weight; each pop pushes at
+    most 4 successors. Cost is O(n log n + k log k).
+
+    Weights are compared exactly (as written); ties keep the sorted order.
+
+    Returns: [{"libros": (4 books), "peso_total": float}, ...] (at most k)
+    """
+    n = len(libros)
+    if n < 4 or k <= 0:
+        return []
+    pesos, limite, escala = _pesos_enteros([libro.peso for libro in libros], peso_max)
+    orden = sorted(range(n), key=lambda i: -pesos[i])
+    w = [pesos[i] for i in orden]
+
+    inicial = (0, 1, 2, 3)
+    frontera = [(-sum(w[p] for p in inicial), inicial)]
+    vistos = {inicial}
+    resultado = []
+    while frontera and len(resultado) < k:
+        negativo, posiciones = heapq.heappop(frontera)
+        if -negativo <= limite:
+            break  # the rest are lighter still
+        resultado.append({
+            "libros": tuple(libros[orden[p]] for p in posiciones),
+            "peso_total": -negativo / escala,
+        })
+        for x in range(4):
+            siguiente = posiciones[x] + 1
+            tope = posiciones[x + 1] if x < 3 else n
+            if siguiente < tope:
+                sucesor = posiciones[:x] + (siguiente,) + posiciones[x + 1:]
+                if sucesor not in vistos:
+                    vistos.add(sucesor)
+                    heapq.heappush(frontera, (negativo + w[posiciones[x]] - w[siguiente], sucesor))
+    return resultado
+
+
 # ============================================================
 #   2) BACKTRACKING - Maximize VALUE without exceeding 8 kg
 # ============================================================
@@ -1,23 +1,77 @@
 # app/controllers/crudLibros.py
-from fastapi import HTTPException
+from typing import List, Optional
+
+from fastapi import HTTPException, UploadFile
 
 from app.models.libro_model import Libro
 from app.schemas.libro_schema import LibroCreate, LibroOut, LibroUpdate
 from app.services.libro_service import LibroService
+from app.utils.cache import CacheResultados
+from app.utils.exportacion import respuesta_exportacion
+from app.utils.libros.importacion import detectar_formato, leer_registros
+from app.utils.libros.texto import tokenizar
+from app.utils.paginacion import LIMITE_MAXIMO, listar_pagina
+from app.utils.serializacion import respuesta_json
+
+# Keys of LibroOut, in schema order (fast serialization of large lists)
+CAMPOS_LIBRO = list(LibroOut.model_fields)
+
+# Results of the read endpoints, keyed by normalized query + catalog version
+_cache = CacheResultados()
+
+
+# Cached service call: a catalog write (or external edit) invalidates it
+def _cacheado(clave, calcular):
+    return _cache.obtener(clave, LibroService.version(), calcular)
 
 
 # Books controller: orchestrates LibroService calls and validates responses
 class LibroController:
 
     @staticmethod
-    # List all available books
-    def listar_libros():
-        """List all books.
+    # Current data version of the catalog (ETag source)
+    def version():
+        """Return the data version behind the list and detail endpoints.
 
         Parameters: none.
-        Returns: List[Libro].
+        Returns: opaque token from LibroService.version().
+        """
+        return LibroService.version()
+
+    @staticmethod
+    # List books: optional filters, keyset page (limit/after) and projection
+    def listar_libros(filtros: Optional[dict] = None, limit: Optional[int] = None, after: Optional[str] = None, fields: Optional[str] = None):
+        """List books, optionally filtered, paginated and projected.
+
+        Parameters:
+        - filtros: dict column -> value (equality; None values ignored).
+        - limit: page size (None = every match).
+        - after: cursor from the X-Next-Cursor header of the previous page.
+        - fields: comma separated columns to return (None = all).
+        Returns: JSON Response with a list of Libro (X-Next-Cursor if more pages follow).
+        Raises: HTTPException 400 for an invalid cursor or field.
+        """
+        try:
+            return listar_pagina(LibroService.paginar, LibroService.columnas(), filtros or {}, limit, after, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @staticmethod
+    # Stream the whole catalog as NDJSON or CSV
+    def exportar_libros(formato: str):
+        """Export all books as a streamed download.
+
+        Parameters:
+        - formato: "ndjson" or "csv".
+        Returns: StreamingResponse (rows read from storage while sending).
+        Raises: HTTPException 400 if the format is not supported.
         """
-        return LibroService.cargar_libros()
+        try:
+            return respuesta_exportacion(
+                LibroService.iterar_libros(), LibroService.columnas(), formato, "libros"
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
     @staticmethod
     # Get a book by ISBN or raise 404 if not found
@@ -50,6 +104,23 @@ class LibroController:
             raise HTTPException(status_code=400, detail="ISBN already exists")
         return nuevo
 
+    @staticmethod
+    # Bulk import books from an uploaded CSV/NDJSON feed
+    def importar_libros(archivo: UploadFile, formato: Optional[str] = None):
+        """Import books from an uploaded CSV or NDJSON file.
+
+        Parameters:
+        - archivo: UploadFile with the feed.
+        - formato: optional "csv" or "ndjson" (otherwise inferred from name/type).
+        Returns: dict with totals and the per-row error report.
+        Raises: HTTPException 400 if the format is not supported, the file is not UTF-8 or the CSV is malformed.
+        """
+        try:
+            tipo = detectar_formato(archivo.filename, archivo.content_type, formato)
+            return LibroService.importar(leer_registros(archivo.file, tipo))
+        except ValueError as e:  # includes UnicodeDecodeError and malformed CSV
+            raise HTTPException(status_code=400, detail=str(e))
+
     @staticmethod
     # Update a book by ISBN using schema data
     def actualizar_libro(isbn: str, data: LibroUpdate):
@@ -86,40 +157,107 @@ class LibroController:
         return {"message": "Book deleted"}
     
     @staticmethod
-    # Return books sorted by ISBN (Insertion Sort)
+    # Books with a numeric field inside a range, keyset paginated
+    def libros_rango(campo: str, minimo: Optional[float] = None, maximo: Optional[float] = None, limit: Optional[int] = None, after: Optional[str] = None, fields: Optional[str] = None):
+        """Return books with `minimo <= campo <= maximo`, ascending by that field.
+
+        Parameters:
+        - campo: peso, valor, stock or paginas.
+        - minimo / maximo: inclusive bounds (None = unbounded).
+        - limit: page size (None = the whole range).
+        - after: cursor from the X-Next-Cursor header of the previous page.
+        - fields: comma separated columns to return (None = all).
+        Returns: JSON Response with a list of Libro (X-Next-Cursor if more pages follow).
+        Raises: HTTPException 400 for an invalid field, cursor or projection.
+        """
+        def paginar(criterios, despues, limite):
+            return LibroService.rango(campo, minimo, maximo, despues, limite)
+
+        try:
+            return listar_pagina(paginar, LibroService.columnas(), {}, limit, after, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @staticmethod
+    # Top-k books by one field (cheapest, heaviest, most stocked...)
+    def libros_top(campo: str, orden: str = "asc", k: int = 10):
+        """Return the k first books by one field.
+
+        Parameters:
+        - campo: sortable field (valor, peso, stock, paginas, ...).
+        - orden: "asc" or "desc".
+        - k: number of books.
+        Returns: JSON Response with at most k Libro.
+        Raises: HTTPException 400 for an unknown field or order.
+        """
+        try:
+            libros = LibroService.top(campo, orden, k)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return respuesta_json(libros, CAMPOS_LIBRO)
+
+    @staticmethod
+    # Books in any multi-field order, keyset paginated (presorted views)
+    def libros_ordenados(por: str, limit: Optional[int] = None, after: Optional[str] = None, fields: Optional[str] = None):
+        """Return books sorted by a field combination, one page at a time.
+
+        Parameters:
+        - por: e.g. "valor,-peso,titulo" ("-" = descending).
+        - limit: page size (None = every book).
+        - after: cursor from the X-Next-Cursor header of the previous page.
+        - fields: comma separated columns to return (None = all).
+        Returns: JSON Response with a list of Libro (X-Next-Cursor if more pages follow).
+        Raises: HTTPException 400 for an invalid order, cursor or field.
+        """
+        def paginar(criterios, despues, limite):
+            return LibroService.ordenados(por, despues, limite)
+
+        try:
+            return listar_pagina(paginar, LibroService.columnas(), {}, limit, after, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @staticmethod
+    # Return books sorted by ISBN (presorted view)
     def libros_ordenados_isbn():
         """Return books sorted by ISBN.
 
         Parameters: none.
-        Returns: sorted list or HTTPException 404 if no books.
+        Returns: JSON Response with the sorted list or HTTPException 404 if no books.
         """
-        libros = LibroService.ordernar_por_isbn()
+        libros = _cacheado(("ordenados", "isbn"), LibroService.ordernar_por_isbn)
         if not libros:
             raise HTTPException(status_code=404, detail="No books to sort")
-        return libros
+        return respuesta_json(libros, CAMPOS_LIBRO)
     
     @staticmethod
-    # Return books sorted by price/value (Merge Sort)
+    # Return books sorted by price/value (presorted view)
     def libros_ordenados_precio():
         """Return books sorted by price/value.
 
         Parameters: none.
-        Returns: sorted list or HTTPException 404 if no books.
+        Returns: JSON Response with the sorted list or HTTPException 404 if no books.
         """
-        libros = LibroService.obtener_por_precio()
+        libros = _cacheado(("ordenados", "precio"), LibroService.obtener_por_precio)
         if not libros:
             raise HTTPException(status_code=404, detail="No books to sort")
-        return libros
+        return respuesta_json(libros, CAMPOS_LIBRO)
     
     @staticmethod
-    # Return deficient combinations (brute force)
-    def estanteria_deficiente():
-        """Detect deficient combinations (brute force).
+    # Return deficient combinations (weight > 8 kg)
+    def estanteria_deficiente(workers: Optional[int] = None):
+        """Detect deficient combinations (weight > 8 kg, compared exactly).
 
-        Parameters: none.
-        Returns: list of combinations or HTTPException 404 if no data.
+        Parameters:
+        - workers: processes for a parallel scan (None = sequential).
+        Returns: list of combinations, HTTPException 404 if no data
+        or 400 if a weight is NaN or infinite.
         """
-        libros = LibroService.estanteria_deficiente()
+        try:
+            libros = LibroService.estanteria_deficiente(workers)
+        except ValueError as e:
+            # Non finite weights stored before validation existed
+            raise HTTPException(status_code=400, detail=str(e))
         if not libros:
             raise HTTPException(status_code=404, detail="No books to organize")
         return libros
@@ -138,12 +276,12 @@ class LibroController:
         return libros
     
     @staticmethod
-    # Sum of book values by author (stack-style recursion)
+    # Sum of book values by author (O(1) materialized aggregate)
     def valor_total_autor(autor: str):
         """Calculate total value of books by an author.
 
         Parameters:
-        - autor: str
+        - autor: str (case/accent insensitive)
         Returns: dict with 'autor', 'valor_total' and 'libros' or HTTPException 404 if no matches.
         """
         resultado = LibroService.valor_total_por_autor(autor)
@@ -152,12 +290,12 @@ class LibroController:
         return {"autor": autor, **resultado}
 
     @staticmethod
-    # Average weight of books by author (tail recursion)
+    # Average weight of books by author (O(1) materialized aggregate)
     def peso_promedio_autor(autor: str):
         """Calculate average weight of books by an author.
 
         Parameters:
-        - autor: str
+        - autor: str (case/accent insensitive)
         Returns: dict with 'autor', 'peso_promedio' and 'libros' or HTTPException 404 if no matches.
         """
         resultado = LibroService.peso_promedio_por_autor(autor)
@@ -166,15 +304,69 @@ class LibroController:
         return {"autor": autor, **resultado}
 
     @staticmethod
-    # Linear search of books by title/author in general inventory
-    def buscar_lineal(texto: str):
-        """Linear search by title or author in general inventory.
+    # Aggregates of many authors in one call
+    def resumen_autores(autores: List[str]):
+        """Return count, totals and titles for several authors.
+
+        Parameters:
+        - autores: author names (case/accent insensitive).
+        Returns: dict name -> aggregates (None for authors without books).
+        Raises: HTTPException 400 if no author or more than LIMITE_MAXIMO are given.
+        """
+        if not autores or len(autores) > LIMITE_MAXIMO:
+            raise HTTPException(status_code=400, detail=f"Give between 1 and {LIMITE_MAXIMO} authors")
+        return LibroService.resumen_autores(autores)
+
+    @staticmethod
+    # Autocomplete suggestions for the search box
+    def autocompletar(prefijo: str, limite: int = 10):
+        """Titles/authors starting with a prefix.
+
+        Parameters:
+        - prefijo: str typed so far.
+        - limite: maximum number of suggestions.
+        Returns: list of {"texto", "tipo"} (empty list if nothing matches).
+        """
+        return LibroService.autocompletar(prefijo, limite)
+
+    @staticmethod
+    # Typo-tolerant search of books by title/author
+    def buscar_fuzzy(texto: str, limite: Optional[int] = 10):
+        """Fuzzy search (trigram candidates + Jaccard similarity).
+
+        Parameters:
+        - texto: str (query, may contain typos)
+        - limite: maximum number of results.
+        Returns: JSON Response (Libro list by similarity) or HTTPException 404 if nothing is close enough.
+        """
+        clave = ("fuzzy", tuple(tokenizar(texto)), limite)
+        resultados = _cacheado(clave, lambda: LibroService.buscar_fuzzy(texto, limite))
+        if not resultados:
+            raise HTTPException(status_code=404, detail="No similar books found")
+        return respuesta_json(resultados, CAMPOS_LIBRO)
+
+    @staticmethod
+    # Ranked full-text search of books by title/author/publisher
+    def buscar_libros(texto: str, limite: Optional[int] = None):
+        """Full-text search (inverted index, accent folding, prefix matching).
 
         Parameters:
         - texto: str (query)
-        Returns: List[Libro] or HTTPException 404 if no matches.
+        - limite: maximum number of results (None = all).
+        Returns: JSON Response (Libro list by relevance) or HTTPException 404 if no matches.
         """
-        resultados = LibroService.buscar_lineal(texto)
+        clave = ("buscar", tuple(tokenizar(texto)), limite)
+        resultados = _cacheado(clave, lambda: LibroService.buscar(texto, limite))
         if not resultados:
             raise HTTPException(status_code=404, detail="No matches for the search")
-        return resultados
+        return respuesta_json(resultados, CAMPOS_LIBRO)
+
+    @staticmethod
+    # Hit/miss counters of the read cache
+    def estadisticas_cache():
+        """Return the result cache counters.
+
+        Parameters: none.
+        Returns: dict (entradas, bytes, aciertos, fallos, tasa_aciertos, expulsiones, ...).
+        """
+        return _cache.estadisticas()
@@ -1,21 +1,60 @@
+from typing import Optional
+
 from fastapi import HTTPException
 
 from app.schemas.prestamo_schema import PrestamoCreate, PrestamoUpdate
 from app.services.prestamo_service import PrestamoService
+from app.utils.exportacion import respuesta_exportacion
+from app.utils.paginacion import listar_pagina
 
 
 # Loans controller: uses PrestamoService and handles HTTP errors
 class PrestamoController:
 
     @staticmethod
-    # List all loans
-    def listar_prestamos():
-        """Get all loans.
+    # Current data version of the loans table (ETag source)
+    def version():
+        """Return the data version behind the list and detail endpoints.
 
         Parameters: none.
-        Returns: List[Prestamo] (list of loans).
+        Returns: opaque token from PrestamoService.version().
+        """
+        return PrestamoService.version()
+
+    @staticmethod
+    # List loans: optional filters, keyset page (limit/after) and projection
+    def listar_prestamos(filtros: Optional[dict] = None, limit: Optional[int] = None, after: Optional[str] = None, fields: Optional[str] = None):
+        """List loans, optionally filtered, paginated and projected.
+
+        Parameters:
+        - filtros: dict column -> value (equality; None values ignored).
+        - limit: page size (None = every match).
+        - after: cursor from the X-Next-Cursor header of the previous page.
+        - fields: comma separated columns to return (None = all).
+        Returns: JSON Response with a list of Prestamo (X-Next-Cursor if more pages follow).
+        Raises: HTTPException 400 for an invalid cursor or field.
         """
-        return PrestamoService.listar()
+        try:
+            return listar_pagina(PrestamoService.paginar, PrestamoService.columnas(), filtros or {}, limit, after, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @staticmethod
+    # Stream the whole loan history as NDJSON or CSV
+    def exportar_prestamos(formato: str):
+        """Export all loans as a streamed download.
+
+        Parameters:
+        - formato: "ndjson" or "csv".
+        Returns: StreamingResponse (rows read from storage while sending).
+        Raises: HTTPException 400 if the format is not supported.
+        """
+        try:
+            return respuesta_exportacion(
+                PrestamoService.iterar_prestamos(), PrestamoService.columnas(), formato, "prestamos"
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
     @staticmethod
     # Get a loan by ID or 404 if not found
@@ -1,21 +1,42 @@
+from typing import Optional
+
 from fastapi import HTTPException
 
 from app.schemas.reserva_schema import ReservaCreate
 from app.services.reserva_service import ReservaService
+from app.utils.paginacion import listar_pagina
 
 
 # Reservations controller: uses ReservaService and handles HTTP errors
 class ReservaController:
 
     @staticmethod
-    # List all reservations
-    def listar_reservas():
-        """List all reservations.
+    # Current data version of the reservations table (ETag source)
+    def version():
+        """Return the data version behind the list and detail endpoints.
 
         Parameters: none.
-        Returns: List[Reserva].
+        Returns: opaque token from ReservaService.version().
+        """
+        return ReservaService.version()
+
+    @staticmethod
+    # List reservations: optional filters, keyset page (limit/after) and projection
+    def listar_reservas(filtros: Optional[dict] = None, limit: Optional[int] = None, after: Optional[str] = None, fields: Optional[str] = None):
+        """List reservations, optionally filtered, paginated and projected.
+
+        Parameters:
+        - filtros: dict column -> value (equality; None values ignored).
+        - limit: page size (None = every match).
+        - after: cursor from the X-Next-Cursor header of the previous page.
+        - fields: comma separated columns to return (None = all).
+        Returns: JSON Response with a list of Reserva (X-Next-Cursor if more pages follow).
+        Raises: HTTPException 400 for an invalid cursor or field.
         """
-        return ReservaService.listar()
+        try:
+            return listar_pagina(ReservaService.paginar, ReservaService.columnas(), filtros or {}, limit, after, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
     @staticmethod
     # Get a reservation by ID or 404 if not found
@@ -1,22 +1,43 @@
+from typing import Optional
+
 from fastapi import HTTPException
 
 from app.models.user_model import Usuario
 from app.schemas.user_schema import UsuarioCreate, UsuarioOut, UsuarioUpdate
 from app.services.user_service import UsuarioService
+from app.utils.paginacion import listar_pagina
 
 
 # Users controller: orchestrates UsuarioService and handles HTTP errors
 class UsuarioController:
 
     @staticmethod
-    # List all users
-    def listar_usuarios():
-        """List all users.
+    # Current data version of the users table (ETag source)
+    def version():
+        """Return the data version behind the list and detail endpoints.
 
         Parameters: none.
-        Returns: List[Usuario].
+        Returns: opaque token from UsuarioService.version().
+        """
+        return UsuarioService.version()
+
+    @staticmethod
+    # List users: optional filters, keyset page (limit/after) and projection
+    def listar_usuarios(filtros: Optional[dict] = None, limit: Optional[int] = None, after: Optional[str] = None, fields: Optional[str] = None):
+        """List users, optionally filtered, paginated and projected.
+
+        Parameters:
+        - filtros: dict column -> value (equality; None values ignored).
+        - limit: page size (None = every match).
+        - after: cursor from the X-Next-Cursor header of the previous page.
+        - fields: comma separated columns to return (None = all).
+        Returns: JSON Response with a list of Usuario (X-Next-Cursor if more pages follow).
+        Raises: HTTPException 400 for an invalid cursor or field.
         """
-        return UsuarioService.cargar_usuarios()
+        try:
+            return listar_pagina(UsuarioService.paginar, UsuarioService.columnas(), filtros or {}, limit, after, fields)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
     @staticmethod
     # Get a user by ID or 404 if not found
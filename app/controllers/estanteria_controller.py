@@ -1,24 +1,109 @@
+from itertools import islice
+from math import comb, isfinite
+
 from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
 from app.services.libro_service import LibroService
-from app.algorithms.estanterias import combinaciones_peligrosas, estanteria_optima
+from app.algorithms.estanterias import (
+    MAX_WORKERS,
+    PESO_MAX,
+    combinaciones_mas_pesadas,
+    combinaciones_peligrosas_paralelo,
+    contar_combinaciones_peligrosas,
+    estanteria_optima,
+    iterar_combinaciones_peligrosas,
+)
+from app.utils.exportacion import FORMATOS_EXPORTACION, generar_ndjson_filas
+
+# Most combinations a single stream sends (early termination cap)
+MAX_COMBINACIONES_STREAM = 1_000_000
+
+# Most combinations returned by the top-k query
+MAX_TOP_COMBINACIONES = 1000
+
+
+# Books to combine: at least 4, all with a finite weight
+def _libros_para_combinaciones():
+    libros = LibroService.cargar_libros()
 
-# Shelves controller: brute force and backtracking
+    if len(libros) < 4:
+        raise HTTPException(
+            status_code=400,
+            detail="Se necesitan al menos 4 libros para analizar combinaciones."
+        )
+
+    invalidos = [l.isbn for l in libros if not isfinite(l.peso)]
+    if invalidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Libros con peso no válido (NaN o infinito): {', '.join(invalidos)}"
+        )
+    return libros
+
+
+# Shelves controller: dangerous combinations and backtracking
 class EstanteriaController:
 
     @staticmethod
-    # Return combinations of 4 books with weight > 8 kg (brute force)
-    def estanteria_deficiente():
-        libros = LibroService.cargar_libros()
+    # Return combinations of 4 books with weight > 8 kg (exact block engine, optionally parallel)
+    def estanteria_deficiente(workers=None):
+        libros = _libros_para_combinaciones()
+
+        if workers:
+            resultado = combinaciones_peligrosas_paralelo(libros, workers=workers)
+        else:
+            resultado = list(iterar_combinaciones_peligrosas(libros))
+
+        return {
+            "total_combinaciones_encontradas": len(resultado),
+            "combinaciones": [
+                {
+                    "peso_total": combo["peso_total"],
+                    "libros": [
+                        {
+                            "isbn": l.isbn,
+                            "titulo": l.titulo,
+                            "peso": l.peso,
+                            "valor": l.valor
+                        }
+                        for l in combo["libros"]
+                    ]
+                }
+                for combo in resultado
+            ]
+        }
 
-        if len(libros) < 4:
-            raise HTTPException(
-                status_code=400,
-                detail="Se necesitan al menos 4 libros para analizar combinaciones."
-            )
+    @staticmethod
+    # Stream the combinations of 4 books with weight > 8 kg as NDJSON
+    def estanteria_deficiente_stream(limit=None, offset=0):
+        libros = _libros_para_combinaciones()
+
+        # Generator chain: nothing is computed until the client reads
+        # (the `offset` skipped combinations are still enumerated)
+        tope = min(limit or MAX_COMBINACIONES_STREAM, MAX_COMBINACIONES_STREAM)
+        combinaciones = islice(iterar_combinaciones_peligrosas(libros), offset, offset + tope)
+        filas = (
+            {
+                "peso_total": combo["peso_total"],
+                "libros": [
+                    {"isbn": l.isbn, "titulo": l.titulo, "peso": l.peso, "valor": l.valor}
+                    for l in combo["libros"]
+                ],
+            }
+            for combo in combinaciones
+        )
+        return StreamingResponse(generar_ndjson_filas(filas), media_type=FORMATOS_EXPORTACION["ndjson"])
 
-        resultado = combinaciones_peligrosas(libros)
+    @staticmethod
+    # Return the k heaviest combinations of 4 books with weight > 8 kg (best first)
+    def estanteria_deficiente_top(k=20):
+        libros = _libros_para_combinaciones()
+
+        resultado = combinaciones_mas_pesadas(libros, k)
 
         return {
+            "k": k,
+            "peso_maximo": PESO_MAX,
             "total_combinaciones_encontradas": len(resultado),
             "combinaciones": [
                 {
@@ -37,6 +122,18 @@ class EstanteriaController:
             ]
         }
 
+    @staticmethod
+    # Count the combinations of 4 books with weight > 8 kg (no enumeration)
+    def estanteria_deficiente_resumen():
+        libros = _libros_para_combinaciones()
+
+        return {
+            "total_libros": len(libros),
+            "peso_maximo": PESO_MAX,
+            "total_combinaciones": comb(len(libros), 4),
+            "total_combinaciones_encontradas": contar_combinaciones_peligrosas(libros),
+        }
+
     @staticmethod
     # Return the optimal value combination without exceeding 8 kg (backtracking)
     def estanteria_optima():
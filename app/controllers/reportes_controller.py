@@ -0,0 +1,55 @@
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+
+from app.services.reporte_service import ReporteService
+from app.utils.agregacion import pagina_grupos, parsear_agrupacion
+from app.utils.cache import CacheResultados
+from app.utils.paginacion import CABECERA_CURSOR, codificar_cursor, decodificar_cursor
+from app.utils.serializacion import dumps
+
+# Whole group-by results, reused while paging through them (one cache per
+# entity, so a write to one table keeps the reports of the others)
+_caches = {entidad: CacheResultados() for entidad in ReporteService.entidades()}
+
+
+# Reports controller: group-by aggregates with keyset pagination
+class ReporteController:
+
+    @staticmethod
+    # Data version of the entity behind a report (ETag source)
+    def version(entidad: str):
+        """Return the entity's data version (None for an unknown entity, which then fails with 400)."""
+        try:
+            return ReporteService.version(entidad)
+        except ValueError:
+            return None
+
+    @staticmethod
+    # Group-by report: any columns, count/sum/avg/min/max, paginated
+    def agregar(entidad: str, agrupar: Optional[str] = None, metricas: Optional[str] = None, limit: Optional[int] = None, after: Optional[str] = None):
+        """Aggregate a table and return one page of groups.
+
+        Parameters:
+        - entidad: libros, prestamos or reservas.
+        - agrupar: comma separated group columns (None = one global group).
+        - metricas: e.g. "sum:valor,avg:peso,count".
+        - limit: page size (None = every group).
+        - after: cursor from the X-Next-Cursor header of the previous page.
+        Returns: JSON Response with the groups, sorted by the group columns
+        (X-Next-Cursor if more pages follow).
+        Raises: HTTPException 400 for an invalid entity, column, metric or cursor.
+        """
+        try:
+            campos = parsear_agrupacion(agrupar, ReporteService.columnas(entidad))
+            grupos = _caches[entidad].obtener(
+                (agrupar or "", metricas or ""),
+                ReporteService.version(entidad),
+                lambda: ReporteService.agregar(entidad, agrupar, metricas),
+            )
+            pagina, siguiente = pagina_grupos(grupos, campos, decodificar_cursor(after), limit)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        cabeceras = {CABECERA_CURSOR: codificar_cursor(siguiente)} if siguiente is not None else None
+        return Response(content=dumps(pagina), media_type="application/json", headers=cabeceras)
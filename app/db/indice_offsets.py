@@ -0,0 +1,139 @@
+# app/db/indice_offsets.py
+import csv
+import mmap
+import os
+import struct
+from typing import Dict, Optional, Tuple
+
+from app.db.tabla_csv import firma_archivo
+
+# Index file layout (little endian):
+#   header:  magic(8) | csv mtime_ns (q) | csv size (q) | entries (q) | key width (I) | pad (I)
+#   entries: key (key width bytes, NUL padded, sorted) | offset (Q) | length (I)
+_MAGIC = b"BIBIDX01"
+_CABECERA = struct.Struct("<8sqqqII")
+_POSICION = struct.Struct("<QI")
+
+
+# Sidecar index: primary key -> (byte offset, length) of its CSV row
+class IndiceOffsets:
+    """Persistent index over a CSV file for point lookups without a full parse.
+
+    The index file (`<csv>.idx` by default) stores the CSV signature it was
+    built from and a sorted array of fixed-width entries (key, offset,
+    length). Lookups mmap the index, binary-search the key (O(log n) probes,
+    no parsing) and then read and decode exactly one line of the CSV. When
+    the CSV size/mtime no longer matches the index header the index is
+    rebuilt with one sequential scan of the file (written to a temporary
+    file and swapped in, so open mappings stay valid).
+    """
+
+    # Constructor: CSV path, key column and index path
+    def __init__(self, ruta_csv: str, clave: str, ruta_indice: Optional[str] = None):
+        self.ruta_csv = ruta_csv
+        self.clave = clave
+        self.ruta_indice = ruta_indice or ruta_csv + ".idx"
+
+    # Read the index header; None if missing or corrupt
+    def _cabecera(self):
+        try:
+            with open(self.ruta_indice, mode="rb") as file:
+                datos = file.read(_CABECERA.size)
+        except FileNotFoundError:
+            return None
+        if len(datos) != _CABECERA.size:
+            return None
+        cabecera = _CABECERA.unpack(datos)
+        return cabecera if cabecera[0] == _MAGIC else None
+
+    # True if the index was built from the current CSV contents
+    def vigente(self) -> bool:
+        """Return True if the index header matches the CSV size/mtime."""
+        cabecera = self._cabecera()
+        return cabecera is not None and (cabecera[1], cabecera[2]) == firma_archivo(self.ruta_csv)
+
+    # Scan the CSV once and write a fresh index
+    def reconstruir(self):
+        """Rebuild the index from the CSV (one sequential scan).
+
+        Parameters: none.
+        Returns: None (side effect: writes the index file).
+        """
+        firma = firma_archivo(self.ruta_csv)
+        posiciones: Dict[bytes, Tuple[int, int]] = {}
+        with open(self.ruta_csv, mode="rb") as file:
+            encabezado = file.readline()
+            columnas = next(csv.reader([encabezado.decode("utf-8")]))
+            indice_clave = columnas.index(self.clave)
+            offset = len(encabezado)
+            inicio, registro = offset, b""
+            for linea in file:
+                offset += len(linea)
+                registro += linea
+                if registro.count(b'"') % 2:
+                    continue  # quoted field spans several lines
+                if registro.strip():
+                    fila = next(csv.reader(registro.decode("utf-8").splitlines(keepends=True)))
+                    # the last occurrence wins, as when loading the table
+                    posiciones[fila[indice_clave].encode("utf-8")] = (inicio, len(registro))
+                inicio, registro = offset, b""
+
+        ancho = max((len(k) for k in posiciones), default=1)
+        temporal = f"{self.ruta_indice}.{os.getpid()}.tmp"
+        with open(temporal, mode="wb") as file:
+            file.write(_CABECERA.pack(_MAGIC, firma[0], firma[1], len(posiciones), ancho, 0))
+            for clave in sorted(posiciones):
+                file.write(clave.ljust(ancho, b"\0"))
+                file.write(_POSICION.pack(*posiciones[clave]))
+        os.replace(temporal, self.ruta_indice)
+
+    # Binary search over the mmapped entries
+    def _posicion(self, clave: str) -> Optional[Tuple[int, int]]:
+        with open(self.ruta_indice, mode="rb") as file:
+            _, _, _, total, ancho, _ = _CABECERA.unpack(file.read(_CABECERA.size))
+            buscada = clave.encode("utf-8")
+            if total == 0 or len(buscada) > ancho:
+                return None
+            buscada = buscada.ljust(ancho, b"\0")
+            tam = ancho + _POSICION.size
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+                bajo, alto = 0, total - 1
+                while bajo <= alto:
+                    medio = (bajo + alto) // 2
+                    inicio = _CABECERA.size + medio * tam
+                    actual = datos[inicio:inicio + ancho]
+                    if actual == buscada:
+                        return _POSICION.unpack_from(datos, inicio + ancho)
+                    if actual < buscada:
+                        bajo = medio + 1
+                    else:
+                        alto = medio - 1
+        return None
+
+    def buscar(self, clave: str) -> Optional[dict]:
+        """Return the CSV row for a key as a dict (header -> value).
+
+        Rebuilds the index first if it is missing or stale.
+
+        Parameters:
+        - clave: primary key value.
+        Returns: dict with the row, or None if the key is not in the CSV.
+        """
+        for _ in range(2):
+            if not self.vigente():
+                self.reconstruir()
+            posicion = self._posicion(clave)
+            if posicion is None:
+                return None
+            offset, longitud = posicion
+            with open(self.ruta_csv, mode="rb") as file:
+                columnas = next(csv.reader([file.readline().decode("utf-8")]))
+                file.seek(offset)
+                registro = file.read(longitud).decode("utf-8", errors="replace")
+            fila = next(csv.reader(registro.splitlines(keepends=True)), [])
+            datos = dict(zip(columnas, fila))
+            if datos.get(self.clave) == clave:
+                return datos
+            # the CSV changed between the check and the read: rebuild and retry
+            self.reconstruir()
+        return None
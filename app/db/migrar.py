@@ -0,0 +1,40 @@
+# app/db/migrar.py
+"""Import the CSV tables into the SQLite database.
+
+Usage (from the project root):
+    python -m app.db.migrar [--db app/db/data/biblioteca.db] [--tablas libros prestamos]
+
+Each table is read with the CSV engine (the loans journal is applied) and
+written to SQLite in a single transaction, replacing its previous content.
+Afterwards run the API with BIBLIOTECA_STORAGE=sqlite.
+"""
+
+import argparse
+
+from app.db.tablas import SQLITE_PATH, TABLAS, repositorio_csv, repositorio_sqlite
+
+
+# Copy the given tables from CSV to SQLite; return rows per table
+def migrar(ruta_db: str = SQLITE_PATH, tablas=None) -> dict:
+    """Copy CSV tables into SQLite.
+
+    Parameters:
+    - ruta_db: SQLite database file.
+    - tablas: iterable of table names (default: all).
+    Returns: dict table -> number of imported rows.
+    """
+    resultado = {}
+    for nombre in tablas or TABLAS:
+        filas = repositorio_csv(nombre).listar()
+        repositorio_sqlite(nombre, ruta_db).guardar(filas)
+        resultado[nombre] = len(filas)
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import the CSV tables into SQLite")
+    parser.add_argument("--db", default=SQLITE_PATH, help="SQLite database file")
+    parser.add_argument("--tablas", nargs="*", choices=list(TABLAS), help="tables to import (default: all)")
+    args = parser.parse_args()
+    for nombre, total in migrar(args.db, args.tablas).items():
+        print(f"{nombre}: {total} rows imported into {args.db}")
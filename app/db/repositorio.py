@@ -0,0 +1,85 @@
+# app/db/repositorio.py
+from abc import ABC, abstractmethod
+from typing import Iterator, List, Optional, Tuple
+
+
+# Storage contract shared by every engine (CSV, SQLite)
+class Repositorio(ABC):
+    """Keyed table of domain objects (Libro, Usuario, Prestamo, Reserva).
+
+    Services only talk to this interface; the engine behind it is chosen in
+    `app.db.tablas`. Rows keep their insertion order. Objects returned by
+    `listar`/`filtrar` may be shared by the engine and must be treated as
+    read-only; `obtener` always returns an object the caller may modify.
+
+    Every engine exposes `campos` (column order) and `clave` (primary key).
+    """
+
+    @abstractmethod
+    def listar(self) -> List[object]:
+        """Return all rows in insertion order."""
+
+    @abstractmethod
+    def iterar(self) -> Iterator[object]:
+        """Stream all rows in insertion order with constant memory."""
+
+    @abstractmethod
+    def version(self):
+        """Return a cheap token that changes whenever the table contents change.
+
+        Covers writes made through this object and changes made outside the
+        process (edited file, another connection). Used to invalidate data
+        derived from the table (in-memory indexes, caches).
+        """
+
+    @abstractmethod
+    def obtener(self, clave: str):
+        """Return the row with that primary key, or None."""
+
+    @abstractmethod
+    def existe(self, clave: str) -> bool:
+        """Return True if a row with that primary key exists."""
+
+    @abstractmethod
+    def filtrar(self, criterios: dict, orden: Optional[str] = None) -> List[object]:
+        """Return rows whose columns equal `criterios`, optionally sorted by `orden`.
+
+        Ties (and the unsorted case) keep insertion order.
+        """
+
+    @abstractmethod
+    def pagina(self, criterios: dict, despues: Optional[str], limite: int) -> Tuple[List[object], Optional[str]]:
+        """Return one page of rows matching `criterios`, in primary key order.
+
+        Keyset pagination: the page starts right after the key `despues`
+        (None = first page), so the cost depends on the page, not on the
+        offset. Sequential numeric keys are ordered as numbers.
+        Returns (rows, key to pass as `despues` for the next page or None).
+        """
+
+    @abstractmethod
+    def siguiente_id(self) -> str:
+        """Return the next sequential numeric key ("1" if the table is empty)."""
+
+    @abstractmethod
+    def insertar(self, obj) -> bool:
+        """Store a new row; False if the key already exists."""
+
+    @abstractmethod
+    def insertar_varios(self, objs: List[object]) -> int:
+        """Store many new rows in a single write; return how many were stored.
+
+        Rows whose key already exists are skipped.
+        """
+
+    @abstractmethod
+    def actualizar(self, clave: str, obj) -> bool:
+        """Replace the row with that key; False if not found."""
+
+    @abstractmethod
+    def eliminar(self, clave: str) -> bool:
+        """Delete the row with that key; False if not found."""
+
+    @abstractmethod
+    def guardar(self, objs: List[object]):
+        """Replace the whole table with the given objects."""
@@ -0,0 +1,328 @@
+# app/db/tabla_csv.py
+import bisect
+import copy
+import csv
+import os
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.db.repositorio import Repositorio
+
+
+# Signature of a file on disk: (mtime_ns, size), or None if missing
+def firma_archivo(ruta: str):
+    """Return the (mtime_ns, size) signature of a file.
+
+    Parameters:
+    - ruta: path of the file.
+    Returns: tuple (mtime_ns, size) or None if the file does not exist.
+    """
+    try:
+        st = os.stat(ruta)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+# In-memory CSV table: parse once, serve reads from memory
+class TablaCSV(Repositorio):
+    """Process-wide in-memory copy of a CSV table.
+
+    The file is parsed on first use and kept in a dict keyed by the primary
+    key (insertion order = file order). Every read compares the current file
+    signature (mtime/size) with the one recorded at load time, so the table
+    is re-parsed only when the file was changed outside this process. Writes
+    go through the table: they rewrite the file and record the new signature,
+    so they never force a re-parse.
+
+    Objects returned by `listar` are shared and must be treated as read-only;
+    `obtener` returns a copy that callers may modify freely.
+
+    With an `indice` (IndiceOffsets), point lookups made while the table is
+    not loaded, or is stale, read a single row through the sidecar index
+    instead of parsing the whole file.
+
+    `pagina` walks a sorted list of keys (built on first use, kept up to
+    date by inserts and deletes) with a binary search to the cursor.
+    """
+
+    # Constructor: table description, nothing is read until first use
+    def __init__(
+        self,
+        ruta: str,
+        campos: List[str],
+        clave: str,
+        fabrica: Callable[[dict], object],
+        indice=None,
+        clave_numerica: bool = False,
+    ):
+        self.ruta = ruta          # CSV path
+        self.campos = campos      # Column order (header)
+        self.clave = clave        # Primary key column
+        self.fabrica = fabrica    # Builds an object from a CSV row (dict)
+        self.indice = indice      # Optional IndiceOffsets for cold lookups
+        self.clave_numerica = clave_numerica  # Sequential ids: page in numeric order
+        self._filas: Optional[Dict[str, object]] = None
+        self._firma = None
+        self._orden: Optional[List[tuple]] = None  # sorted (valor_orden, clave)
+        self._escrituras = 0      # writes made through this object
+        self._lock = threading.RLock()
+
+    # Create the CSV with its header if it doesn't exist
+    def _asegurar_archivo(self):
+        if not os.path.exists(self.ruta):
+            with open(self.ruta, mode="w", encoding="utf-8", newline="") as file:
+                csv.writer(file).writerow(self.campos)
+
+    # Signature used to detect changes made outside this process
+    def _firma_actual(self):
+        return firma_archivo(self.ruta)
+
+    # Parse the whole file into memory and record its signature
+    def _cargar(self):
+        self._asegurar_archivo()
+        filas: Dict[str, object] = {}
+        firma = self._firma_actual()
+        with open(self.ruta, mode="r", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                filas[row[self.clave]] = self.fabrica(row)
+        self._filas = filas
+        self._firma = firma
+        self._orden = None
+
+    # True if the rows in memory match the file on disk
+    def _en_memoria(self) -> bool:
+        return self._filas is not None and self._firma_actual() == self._firma
+
+    # Current rows, reloading only if the file changed on disk
+    def _vigentes(self) -> Dict[str, object]:
+        if self._filas is None or self._firma_actual() != self._firma:
+            self._cargar()
+        return self._filas
+
+    # Sort value of a key (numeric keys compare as numbers)
+    def _valor_orden(self, clave: str) -> tuple:
+        if self.clave_numerica and clave.isdigit():
+            return (0, int(clave))
+        return (1, clave)
+
+    # Sorted keys for keyset pagination, built lazily
+    def _ordenadas(self) -> List[tuple]:
+        if self._orden is None:
+            self._orden = sorted((self._valor_orden(k), k) for k in self._vigentes())
+        return self._orden
+
+    # Keep the sorted keys in step with an insert or delete (if built)
+    def _ordenar_clave(self, clave: str, agregar: bool):
+        if self._orden is None:
+            return
+        entrada = (self._valor_orden(clave), clave)
+        if agregar:
+            bisect.insort(self._orden, entrada)
+        else:
+            i = bisect.bisect_left(self._orden, entrada)
+            if i < len(self._orden) and self._orden[i] == entrada:
+                del self._orden[i]
+
+    # Serialize one object as a CSV row (explicit columns only)
+    def _fila(self, obj) -> dict:
+        return {c: getattr(obj, c) for c in self.campos}
+
+    # Rewrite the file from memory (temp file + atomic swap, so readers that
+    # already opened it keep a consistent snapshot) and remember the signature
+    def _escribir(self):
+        self._escrituras += 1
+        temporal = f"{self.ruta}.{os.getpid()}.tmp"
+        with open(temporal, mode="w", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=self.campos)
+            writer.writeheader()
+            for obj in self._filas.values():
+                writer.writerow(self._fila(obj))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporal, self.ruta)
+        self._firma = self._firma_actual()
+
+    # Persist a single-row change ("put" or "del"); CSV rewrites the file
+    def _persistir(self, op: str, clave: str, obj):
+        self._escribir()
+
+    def version(self):
+        """Return (writes through this object, file signature): one stat, no parsing."""
+        with self._lock:
+            return (self._escrituras, self._firma_actual())
+
+    def iterar(self) -> Iterator[object]:
+        """Stream the rows straight from the file, one at a time.
+
+        Memory stays constant whatever the table size. Writes swap in a new
+        file, so an iteration in progress keeps reading the version it opened.
+
+        Parameters: none.
+        Returns: iterator of fresh objects in file order.
+        """
+        with self._lock:
+            self._asegurar_archivo()
+            file = open(self.ruta, mode="r", encoding="utf-8", newline="")
+        with file:
+            for row in csv.DictReader(file):
+                yield self.fabrica(row)
+
+    def listar(self) -> List[object]:
+        """Return all rows in file order.
+
+        Parameters: none.
+        Returns: new list with the shared (read-only) objects.
+        """
+        with self._lock:
+            return list(self._vigentes().values())
+
+    def obtener(self, clave: str):
+        """Find a row by primary key.
+
+        Parameters:
+        - clave: primary key value.
+        Returns: a copy of the object, or None if it does not exist.
+        """
+        with self._lock:
+            if self.indice is not None and not self._en_memoria():
+                self._asegurar_archivo()
+                row = self.indice.buscar(clave)
+                return self.fabrica(row) if row is not None else None
+            obj = self._vigentes().get(clave)
+        return copy.copy(obj) if obj is not None else None
+
+    def existe(self, clave: str) -> bool:
+        """Return True if a row with that primary key exists."""
+        return self.obtener(clave) is not None
+
+    def filtrar(self, criterios: dict, orden: Optional[str] = None) -> List[object]:
+        """Return rows matching all `criterios` (column == value), scanning memory.
+
+        Parameters:
+        - criterios: dict column -> value.
+        - orden: optional column to sort by (stable: ties keep file order).
+        Returns: list of shared (read-only) objects.
+        """
+        with self._lock:
+            filas = [
+                obj for obj in self._vigentes().values()
+                if all(getattr(obj, c) == v for c, v in criterios.items())
+            ]
+        if orden:
+            filas.sort(key=lambda obj: getattr(obj, orden))
+        return filas
+
+    def pagina(self, criterios: dict, despues: Optional[str], limite: int) -> Tuple[List[object], Optional[str]]:
+        """Return the rows after key `despues` that match `criterios`, in key order.
+
+        Binary search to the cursor, then scan forward until the page (plus
+        one look-ahead row) is full.
+
+        Parameters:
+        - criterios: dict column -> value (equality).
+        - despues: last key of the previous page, or None for the first page.
+        - limite: page size.
+        Returns: (list of shared read-only objects, next cursor key or None).
+        """
+        with self._lock:
+            filas = self._vigentes()
+            orden = self._ordenadas()
+            i = bisect.bisect_right(orden, (self._valor_orden(despues), despues)) if despues is not None else 0
+            resultado = []
+            while i < len(orden) and len(resultado) <= limite:
+                obj = filas[orden[i][1]]
+                i += 1
+                if all(getattr(obj, c) == v for c, v in criterios.items()):
+                    resultado.append(obj)
+        if len(resultado) > limite:
+            resultado.pop()
+            return resultado, getattr(resultado[-1], self.clave)
+        return resultado, None
+
+    def siguiente_id(self) -> str:
+        """Return max(numeric key) + 1 as str, or "1" if the table is empty."""
+        with self._lock:
+            claves = self._vigentes().keys()
+            return str(max((int(k) for k in claves), default=0) + 1)
+
+    def insertar(self, obj) -> bool:
+        """Append a new row.
+
+        Parameters:
+        - obj: object to store (its primary key attribute must be unique).
+        Returns: True if stored, False if the key already exists.
+        """
+        with self._lock:
+            filas = self._vigentes()
+            clave = getattr(obj, self.clave)
+            if clave in filas:
+                return False
+            filas[clave] = obj
+            self._ordenar_clave(clave, True)
+            self._persistir("put", clave, obj)
+            return True
+
+    def insertar_varios(self, objs: List[object]) -> int:
+        """Append many rows with a single file write.
+
+        Parameters:
+        - objs: objects to store; those whose key already exists are skipped.
+        Returns: number of rows stored.
+        """
+        with self._lock:
+            filas = self._vigentes()
+            nuevos = 0
+            for obj in objs:
+                clave = getattr(obj, self.clave)
+                if clave not in filas:
+                    filas[clave] = obj
+                    nuevos += 1
+            if nuevos:
+                self._orden = None
+                self._escribir()
+            return nuevos
+
+    def actualizar(self, clave: str, obj) -> bool:
+        """Replace the row with that key, keeping its position.
+
+        Parameters:
+        - clave: primary key of the row to replace.
+        - obj: new object.
+        Returns: True if replaced, False if not found.
+        """
+        with self._lock:
+            filas = self._vigentes()
+            if clave not in filas:
+                return False
+            filas[clave] = obj
+            self._persistir("put", clave, obj)
+            return True
+
+    def eliminar(self, clave: str) -> bool:
+        """Delete the row with that key.
+
+        Parameters:
+        - clave: primary key.
+        Returns: True if deleted, False if not found.
+        """
+        with self._lock:
+            filas = self._vigentes()
+            if clave not in filas:
+                return False
+            del filas[clave]
+            self._ordenar_clave(clave, False)
+            self._persistir("del", clave, None)
+            return True
+
+    def guardar(self, objs: List[object]):
+        """Replace the whole table with the given objects (overwrites).
+
+        Parameters:
+        - objs: list of objects to persist.
+        Returns: None (side effect: writes file).
+        """
+        with self._lock:
+            self._filas = {getattr(o, self.clave): o for o in objs}
+            self._orden = None
+            self._escribir()
@@ -0,0 +1,138 @@
+# app/db/tabla_journal.py
+import csv
+import os
+from typing import Callable, Dict, Iterator, List, Optional
+
+from app.db.tabla_csv import TablaCSV, firma_archivo
+
+
+# Journaled CSV table: single-row changes are appended, never rewritten
+class TablaCSVJournal(TablaCSV):
+    """In-memory CSV table whose single-row writes go to an append-only journal.
+
+    The base CSV keeps its usual format. Each insert/update/delete appends one
+    record (`op,<columns...>`, op = "put" or "del") to the journal file and
+    fsyncs it, so a write costs O(1) on disk whatever the size of the table.
+    Loading parses the base file and replays the journal on top of it; this
+    is also how a crash between writes is recovered. Compaction folds the
+    journal into the base file (written to a temporary file and swapped in)
+    and empties the journal. It runs on the first load of the process when
+    the journal is not empty, when the journal reaches `umbral_compactacion`
+    records, and on full rewrites (`guardar`).
+    """
+
+    # Constructor: same as TablaCSV plus the journal path and threshold
+    def __init__(
+        self,
+        ruta: str,
+        campos: List[str],
+        clave: str,
+        fabrica: Callable[[dict], object],
+        ruta_journal: str,
+        umbral_compactacion: int = 1000,
+        clave_numerica: bool = False,
+    ):
+        super().__init__(ruta, campos, clave, fabrica, clave_numerica=clave_numerica)
+        self.ruta_journal = ruta_journal
+        self.umbral_compactacion = umbral_compactacion
+        self._registros_journal = 0
+
+    # The table changes if either the base file or the journal changes
+    def _firma_actual(self):
+        return (firma_archivo(self.ruta), firma_archivo(self.ruta_journal))
+
+    # Drop a partially written last record (crash in the middle of an append)
+    def _reparar_journal(self):
+        if not os.path.exists(self.ruta_journal):
+            return
+        with open(self.ruta_journal, mode="rb+") as file:
+            datos = file.read()
+            if datos and not datos.endswith(b"\n"):
+                file.truncate(datos.rfind(b"\n") + 1)
+
+    # Parse the base file, then replay the journal over it
+    def _cargar(self):
+        primera_carga = self._filas is None
+        self._reparar_journal()
+        super()._cargar()
+        registros = 0
+        if os.path.exists(self.ruta_journal):
+            with open(self.ruta_journal, mode="r", encoding="utf-8", newline="") as file:
+                for row in csv.reader(file):
+                    if len(row) != len(self.campos) + 1:
+                        continue  # malformed record: ignore
+                    op, valores = row[0], dict(zip(self.campos, row[1:]))
+                    if op == "put":
+                        self._filas[valores[self.clave]] = self.fabrica(valores)
+                    elif op == "del":
+                        self._filas.pop(valores[self.clave], None)
+                    registros += 1
+        self._registros_journal = registros
+        if primera_carga and registros:
+            self.compactar()
+
+    # Append one record to the journal and flush it to disk
+    def _persistir(self, op: str, clave: str, obj):
+        if obj is not None:
+            valores = [self._fila(obj)[c] for c in self.campos]
+        else:
+            valores = [clave if c == self.clave else "" for c in self.campos]
+        self._escrituras += 1
+        with open(self.ruta_journal, mode="a", encoding="utf-8", newline="") as file:
+            csv.writer(file).writerow([op] + valores)
+            file.flush()
+            os.fsync(file.fileno())
+        self._registros_journal += 1
+        if self._registros_journal >= self.umbral_compactacion:
+            self._escribir()
+        else:
+            self._firma = self._firma_actual()
+
+    # Full rewrite: write the base file atomically, then empty the journal
+    def _escribir(self):
+        super()._escribir()
+        # replaying an old journal over the new base is harmless (idempotent)
+        if os.path.exists(self.ruta_journal):
+            os.remove(self.ruta_journal)
+        self._registros_journal = 0
+        self._firma = self._firma_actual()
+
+    def iterar(self) -> Iterator[object]:
+        """Stream the base file with the journal applied, one row at a time.
+
+        The journal (bounded by the compaction threshold) is read first, then
+        the base file is streamed: updated rows are replaced in place, deleted
+        rows skipped and new rows emitted at the end, as when loading.
+
+        Parameters: none.
+        Returns: iterator of fresh objects.
+        """
+        cambios: Dict[str, Optional[dict]] = {}
+        if os.path.exists(self.ruta_journal):
+            with open(self.ruta_journal, mode="r", encoding="utf-8", newline="") as file:
+                for row in csv.reader(file):
+                    if len(row) != len(self.campos) + 1 or row[0] not in ("put", "del"):
+                        continue
+                    valores = dict(zip(self.campos, row[1:]))
+                    cambios[valores[self.clave]] = valores if row[0] == "put" else None
+        for obj in super().iterar():
+            clave = getattr(obj, self.clave)
+            if clave in cambios:
+                valores = cambios.pop(clave)
+                if valores is not None:
+                    yield self.fabrica(valores)
+            else:
+                yield obj
+        for valores in cambios.values():
+            if valores is not None:
+                yield self.fabrica(valores)
+
+    def compactar(self):
+        """Fold the journal into the base CSV and empty the journal.
+
+        Parameters: none.
+        Returns: None (side effect: rewrites the base file, removes the journal).
+        """
+        with self._lock:
+            self._vigentes()
+            self._escribir()
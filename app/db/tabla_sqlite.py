@@ -0,0 +1,255 @@
+# app/db/tabla_sqlite.py
+import sqlite3
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.db.repositorio import Repositorio
+
+
+# SQLite table: indexed point lookups and single-row writes
+class TablaSQLite(Repositorio):
+    """Repository backed by one SQLite table.
+
+    The primary key column is a TEXT PRIMARY KEY (B-tree), so lookups,
+    updates and deletes by key are O(log n) and never rewrite the table.
+    Extra secondary indexes (e.g. `user_id` or `(isbn, fecha_reserva)`)
+    serve `filtrar`. Insertion order is the SQLite rowid. The connection is
+    opened lazily and shared between threads behind a lock.
+
+    Change detection is per table: triggers bump this table's row in a
+    shared `_versiones(tabla, n)` counter table on every insert, update or
+    delete, whichever connection or process makes it. Writes to the other
+    tables of the same database file leave this table's version alone.
+    """
+
+    # Constructor: table description, nothing is opened until first use
+    def __init__(
+        self,
+        ruta_db: str,
+        nombre: str,
+        campos: List[str],
+        clave: str,
+        fabrica: Callable[[dict], object],
+        tipos: Optional[Dict[str, str]] = None,
+        indices: Sequence[Tuple[str, ...]] = (),
+        clave_numerica: bool = False,
+    ):
+        self.ruta_db = ruta_db    # SQLite file
+        self.nombre = nombre      # Table name
+        self.campos = campos      # Column order
+        self.clave = clave        # Primary key column
+        self.fabrica = fabrica    # Builds an object from a row (dict)
+        self.tipos = tipos or {}  # Column -> SQL type (TEXT by default)
+        self.indices = indices    # Secondary indexes (tuples of columns)
+        self.clave_numerica = clave_numerica  # Sequential ids (siguiente_id)
+        self._conexion: Optional[sqlite3.Connection] = None
+        self._escrituras = 0      # writes made through this object
+        self._lock = threading.RLock()
+
+    # Open the database and create table/indexes if needed
+    def _conectar(self) -> sqlite3.Connection:
+        if self._conexion is None:
+            conexion = sqlite3.connect(self.ruta_db, check_same_thread=False)
+            conexion.row_factory = sqlite3.Row
+            conexion.execute("PRAGMA journal_mode=WAL")
+            columnas = ", ".join(
+                f"{c} {self.tipos.get(c, 'TEXT')}" + (" PRIMARY KEY" if c == self.clave else "")
+                for c in self.campos
+            )
+            conexion.execute(f"CREATE TABLE IF NOT EXISTS {self.nombre} ({columnas})")
+            if self.clave_numerica:
+                # numeric view of the key, so MAX() for new ids uses an index too
+                conexion.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{self.nombre}_{self.clave}_num "
+                    f"ON {self.nombre} (CAST({self.clave} AS INTEGER))"
+                )
+            for columnas_indice in self.indices:
+                conexion.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{self.nombre}_{'_'.join(columnas_indice)} "
+                    f"ON {self.nombre} ({', '.join(columnas_indice)})"
+                )
+            # per-table change counter, kept by triggers
+            conexion.execute("CREATE TABLE IF NOT EXISTS _versiones (tabla TEXT PRIMARY KEY, n INTEGER NOT NULL)")
+            conexion.execute("INSERT OR IGNORE INTO _versiones (tabla, n) VALUES (?, 0)", (self.nombre,))
+            for operacion in ("INSERT", "UPDATE", "DELETE"):
+                conexion.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS trg_{self.nombre}_version_{operacion.lower()} "
+                    f"AFTER {operacion} ON {self.nombre} BEGIN "
+                    f"UPDATE _versiones SET n = n + 1 WHERE tabla = '{self.nombre}'; END"
+                )
+            conexion.commit()
+            self._conexion = conexion
+        return self._conexion
+
+    # Run a SELECT and build objects from the rows
+    def _consultar(self, sql: str, parametros: Sequence = ()) -> List[object]:
+        with self._lock:
+            filas = self._conectar().execute(sql, parametros).fetchall()
+        return [self.fabrica(dict(f)) for f in filas]
+
+    # Run a write statement in its own transaction; return affected rows
+    def _ejecutar(self, sql: str, parametros: Sequence = ()) -> int:
+        with self._lock:
+            self._escrituras += 1
+            conexion = self._conectar()
+            with conexion:
+                return conexion.execute(sql, parametros).rowcount
+
+    # Column values of an object, in column order
+    def _valores(self, obj) -> list:
+        return [getattr(obj, c) for c in self.campos]
+
+    def listar(self) -> List[object]:
+        """Return all rows in insertion order (fresh objects)."""
+        return self._consultar(f"SELECT * FROM {self.nombre} ORDER BY rowid")
+
+    def iterar(self) -> Iterator[object]:
+        """Stream all rows in insertion order, fetched in small batches.
+
+        Uses its own read connection (a consistent WAL snapshot), so a long
+        export does not hold the lock shared with writers.
+        """
+        self._conectar()  # make sure the table exists
+        conexion = sqlite3.connect(self.ruta_db, check_same_thread=False)
+        conexion.row_factory = sqlite3.Row
+        try:
+            cursor = conexion.execute(f"SELECT * FROM {self.nombre} ORDER BY rowid")
+            while True:
+                filas = cursor.fetchmany(500)
+                if not filas:
+                    break
+                for f in filas:
+                    yield self.fabrica(dict(f))
+        finally:
+            conexion.close()
+
+    def version(self):
+        """Return (writes through this object, this table's change counter).
+
+        The counter is bumped by triggers, so it also moves when another
+        connection changes this table, but not when it changes another one.
+        """
+        with self._lock:
+            fila = self._conectar().execute("SELECT n FROM _versiones WHERE tabla = ?", (self.nombre,)).fetchone()
+        return (self._escrituras, fila[0])
+
+    def obtener(self, clave: str):
+        """Find a row by primary key (index lookup); None if missing."""
+        filas = self._consultar(f"SELECT * FROM {self.nombre} WHERE {self.clave} = ?", (clave,))
+        return filas[0] if filas else None
+
+    def existe(self, clave: str) -> bool:
+        """Return True if a row with that primary key exists."""
+        with self._lock:
+            fila = self._conectar().execute(
+                f"SELECT 1 FROM {self.nombre} WHERE {self.clave} = ?", (clave,)
+            ).fetchone()
+        return fila is not None
+
+    def filtrar(self, criterios: dict, orden: Optional[str] = None) -> List[object]:
+        """Return rows matching all `criterios` (served by the secondary indexes).
+
+        Parameters:
+        - criterios: dict column -> value.
+        - orden: optional column to sort by (ties keep insertion order).
+        Returns: list of objects.
+        """
+        for columna in list(criterios) + ([orden] if orden else []):
+            if columna not in self.campos:
+                raise ValueError(f"Unknown column: {columna}")
+        where = " AND ".join(f"{c} = ?" for c in criterios) or "1"
+        order = f"{orden}, rowid" if orden else "rowid"
+        return self._consultar(
+            f"SELECT * FROM {self.nombre} WHERE {where} ORDER BY {order}",
+            list(criterios.values()),
+        )
+
+    def pagina(self, criterios: dict, despues: Optional[str], limite: int) -> Tuple[List[object], Optional[str]]:
+        """Return the rows after key `despues` that match `criterios`, in key order.
+
+        `WHERE key > ? ORDER BY key LIMIT n+1` walks the primary key index
+        (or the numeric key index for sequential ids) from the cursor on.
+
+        Parameters:
+        - criterios: dict column -> value (equality).
+        - despues: last key of the previous page, or None for the first page.
+        - limite: page size.
+        Returns: (list of objects, next cursor key or None).
+        """
+        for columna in criterios:
+            if columna not in self.campos:
+                raise ValueError(f"Unknown column: {columna}")
+        orden = f"CAST({self.clave} AS INTEGER)" if self.clave_numerica else self.clave
+        condiciones = [f"{c} = ?" for c in criterios]
+        parametros = list(criterios.values())
+        if despues is not None:
+            condiciones.append(f"{orden} > " + ("CAST(? AS INTEGER)" if self.clave_numerica else "?"))
+            parametros.append(despues)
+        where = " AND ".join(condiciones) or "1"
+        filas = self._consultar(
+            f"SELECT * FROM {self.nombre} WHERE {where} ORDER BY {orden} LIMIT ?",
+            parametros + [limite + 1],
+        )
+        if len(filas) > limite:
+            filas.pop()
+            return filas, getattr(filas[-1], self.clave)
+        return filas, None
+
+    def siguiente_id(self) -> str:
+        """Return max(numeric key) + 1 as str, or "1" if the table is empty."""
+        with self._lock:
+            fila = self._conectar().execute(
+                f"SELECT MAX(CAST({self.clave} AS INTEGER)) FROM {self.nombre}"
+            ).fetchone()
+        return str((fila[0] or 0) + 1)
+
+    def insertar(self, obj) -> bool:
+        """Insert a new row; False if the key already exists."""
+        marcas = ", ".join("?" for _ in self.campos)
+        try:
+            self._ejecutar(
+                f"INSERT INTO {self.nombre} ({', '.join(self.campos)}) VALUES ({marcas})",
+                self._valores(obj),
+            )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def insertar_varios(self, objs: List[object]) -> int:
+        """Insert many rows in one transaction; existing keys are skipped."""
+        marcas = ", ".join("?" for _ in self.campos)
+        with self._lock:
+            self._escrituras += 1
+            conexion = self._conectar()
+            with conexion:
+                antes = conexion.total_changes
+                conexion.executemany(
+                    f"INSERT OR IGNORE INTO {self.nombre} ({', '.join(self.campos)}) VALUES ({marcas})",
+                    [self._valores(o) for o in objs],
+                )
+                return conexion.total_changes - antes
+
+    def actualizar(self, clave: str, obj) -> bool:
+        """Update the row with that key in place; False if not found."""
+        asignaciones = ", ".join(f"{c} = ?" for c in self.campos)
+        return self._ejecutar(
+            f"UPDATE {self.nombre} SET {asignaciones} WHERE {self.clave} = ?",
+            self._valores(obj) + [clave],
+        ) > 0
+
+    def eliminar(self, clave: str) -> bool:
+        """Delete the row with that key; False if not found."""
+        return self._ejecutar(f"DELETE FROM {self.nombre} WHERE {self.clave} = ?", (clave,)) > 0
+
+    def guardar(self, objs: List[object]):
+        """Replace the whole table with the given objects (single transaction)."""
+        marcas = ", ".join("?" for _ in self.campos)
+        with self._lock:
+            self._escrituras += 1
+            conexion = self._conectar()
+            with conexion:
+                conexion.execute(f"DELETE FROM {self.nombre}")
+                conexion.executemany(
+                    f"INSERT INTO {self.nombre} ({', '.join(self.campos)}) VALUES ({marcas})",
+                    [self._valores(o) for o in objs],
+                )
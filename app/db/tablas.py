@@ -0,0 +1,127 @@
+# app/db/tablas.py
+import os
+from typing import Dict
+
+from app.db.indice_offsets import IndiceOffsets
+from app.db.repositorio import Repositorio
+from app.db.tabla_csv import TablaCSV
+from app.db.tabla_journal import TablaCSVJournal
+from app.db.tabla_sqlite import TablaSQLite
+from app.models.libro_model import Libro
+from app.models.prestamo_model import Prestamo
+from app.models.reserva_model import Reserva
+from app.models.user_model import Usuario
+
+# Storage configuration (environment variables)
+# - BIBLIOTECA_STORAGE: "csv" (default) or "sqlite"
+# - BIBLIOTECA_DATA_DIR: folder with the CSV files (default app/db/data)
+# - BIBLIOTECA_SQLITE_PATH: SQLite file (default <data dir>/biblioteca.db)
+# - PRESTAMOS_JOURNAL: "0" disables the loans journal in the CSV engine
+DATA_DIR = os.getenv("BIBLIOTECA_DATA_DIR", "app/db/data")
+MOTOR = os.getenv("BIBLIOTECA_STORAGE", "csv").lower()
+SQLITE_PATH = os.getenv("BIBLIOTECA_SQLITE_PATH", os.path.join(DATA_DIR, "biblioteca.db"))
+
+
+# Build a Prestamo from a row (empty return date -> None)
+def _prestamo_desde_fila(row: dict) -> Prestamo:
+    return Prestamo(
+        prestamo_id=row["prestamo_id"],
+        user_id=row["user_id"],
+        isbn=row["isbn"],
+        fecha_prestamo=row["fecha_prestamo"],
+        fecha_devolucion=row["fecha_devolucion"] or None,
+        devuelto=row["devuelto"],
+    )
+
+
+# Table descriptions: columns, primary key, row factory, SQL types, indexes
+# (clave_numerica: the key is a sequential number generated by siguiente_id;
+#  indice_offsets: CSV engine keeps a <csv>.idx sidecar for cold point lookups)
+TABLAS: Dict[str, dict] = {
+    "libros": {
+        "archivo": "libros.csv",
+        "campos": ["isbn", "titulo", "autor", "peso", "valor", "stock", "paginas", "editorial", "idioma"],
+        "clave": "isbn",
+        "fabrica": lambda row: Libro(**row),
+        "tipos": {"peso": "REAL", "valor": "INTEGER", "stock": "INTEGER", "paginas": "INTEGER"},
+        "indices": [("autor",), ("idioma",)],
+        "indice_offsets": True,
+    },
+    "usuarios": {
+        "archivo": "usuarios.csv",
+        "campos": ["user_id", "nombre", "correo", "telefono"],
+        "clave": "user_id",
+        "fabrica": lambda row: Usuario(**row),
+        "tipos": {},
+        "indices": [],
+    },
+    "prestamos": {
+        "archivo": "prestamos.csv",
+        "campos": ["prestamo_id", "user_id", "isbn", "fecha_prestamo", "fecha_devolucion", "devuelto"],
+        "clave": "prestamo_id",
+        "fabrica": _prestamo_desde_fila,
+        "tipos": {},
+        "indices": [("user_id",), ("isbn",)],
+        "clave_numerica": True,
+    },
+    "reservas": {
+        "archivo": "reservas.csv",
+        "campos": ["reserva_id", "user_id", "isbn", "fecha_reserva"],
+        "clave": "reserva_id",
+        "fabrica": lambda row: Reserva(**row),
+        "tipos": {},
+        "indices": [("user_id",), ("isbn", "fecha_reserva")],
+        "clave_numerica": True,
+    },
+}
+
+
+# CSV engine for a table (loans use the append-only journal by default)
+def repositorio_csv(nombre: str) -> Repositorio:
+    """Build the CSV repository for a table.
+
+    Parameters:
+    - nombre: table name (key of TABLAS).
+    Returns: TablaCSV (or TablaCSVJournal for loans).
+    """
+    t = TABLAS[nombre]
+    ruta = os.path.join(DATA_DIR, t["archivo"])
+    if nombre == "prestamos" and os.getenv("PRESTAMOS_JOURNAL", "1") != "0":
+        return TablaCSVJournal(
+            ruta, t["campos"], t["clave"], t["fabrica"], ruta + ".journal",
+            clave_numerica=t.get("clave_numerica", False),
+        )
+    indice = IndiceOffsets(ruta, t["clave"]) if t.get("indice_offsets") else None
+    return TablaCSV(ruta, t["campos"], t["clave"], t["fabrica"], indice, t.get("clave_numerica", False))
+
+
+# SQLite engine for a table
+def repositorio_sqlite(nombre: str, ruta_db: str = SQLITE_PATH) -> Repositorio:
+    """Build the SQLite repository for a table.
+
+    Parameters:
+    - nombre: table name (key of TABLAS).
+    - ruta_db: SQLite database file.
+    Returns: TablaSQLite.
+    """
+    t = TABLAS[nombre]
+    return TablaSQLite(
+        ruta_db, nombre, t["campos"], t["clave"], t["fabrica"],
+        t["tipos"], t["indices"], t.get("clave_numerica", False),
+    )
+
+
+# Repository for a table using the engine selected by BIBLIOTECA_STORAGE
+def repositorio(nombre: str) -> Repositorio:
+    """Build the repository for a table with the configured engine.
+
+    Parameters:
+    - nombre: "libros", "usuarios", "prestamos" or "reservas".
+    Returns: Repositorio.
+    Raises: ValueError if BIBLIOTECA_STORAGE is not "csv" or "sqlite".
+    """
+    if MOTOR == "csv":
+        return repositorio_csv(nombre)
+    if MOTOR == "sqlite":
+        return repositorio_sqlite(nombre)
+    raise ValueError(f"Unknown storage engine: {MOTOR}")
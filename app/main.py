@@ -1,6 +1,10 @@
+from math import isfinite
+
 from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -9,6 +13,7 @@ from app.routes.user_routes import router as user_router
 from app.routes.prestamos_routes import router as prestamos_router
 from app.routes.reservas_routes import router as reservas_router
 from app.routes.estanterias import router as estanterias_router
+from app.routes.reportes_routes import router as reportes_router
 
 # FastAPI application entrypoint
 app = FastAPI(title="CSV Library API")
@@ -20,8 +25,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],  # pagination cursor / data version read by the templates
 )
 
+
+# Validation errors: echo NaN/inf inputs as text, JSON cannot encode them
+@app.exception_handler(RequestValidationError)
+async def error_validacion(request: Request, exc: RequestValidationError):
+    errores = []
+    for error in exc.errors():
+        entrada = error.get("input")
+        if isinstance(entrada, float) and not isfinite(entrada):
+            error = {**error, "input": str(entrada)}
+        errores.append(error)
+    return JSONResponse(status_code=422, content={"detail": jsonable_encoder(errores)})
+
+
 # Static files: CSS/JS/images under /static
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
@@ -76,9 +95,10 @@ def vista_estanterias(request: Request):
 
 
 # API routers: register JSON endpoints
-# (books, users, loans, reservations, shelves)
+# (books, users, loans, reservations, shelves, reports)
 app.include_router(libros_router)
 app.include_router(user_router)
 app.include_router(prestamos_router)
 app.include_router(reservas_router)
 app.include_router(estanterias_router)
+app.include_router(reportes_router)
@@ -1,6 +1,11 @@
 # app/models/libro2_model.py
+from app.models.registro import Registro
+
+
+# Book copy with a shelf assignment (used by the shelf algorithms)
+class Libro2(Registro):
+    __slots__ = ("isbn", "titulo", "autor", "peso", "valor", "stock", "paginas", "editorial", "idioma", "estanteria")
 
-class Libro2:
     def __init__(self, isbn, titulo, autor, peso, valor, stock, paginas, editorial, idioma):
         # Copy all fields same as Libro
         self.isbn = isbn
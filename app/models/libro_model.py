@@ -1,14 +1,19 @@
-# Represents a book in the catalog
-class Libro:
+from app.models.registro import Registro, interned
+
+
+# Represents a book in the catalog (slotted: no per-instance __dict__)
+class Libro(Registro):
+    __slots__ = ("isbn", "titulo", "autor", "peso", "valor", "stock", "paginas", "editorial", "idioma")
+
     # Constructor: sets basic data and normalizes types
     def __init__(self, isbn, titulo, autor, peso, valor, stock, paginas, editorial, idioma):
         self.isbn = isbn            # Unique book identifier
         self.titulo = titulo        # Book title
-        self.autor = autor          # Author(s)
+        self.autor = interned(autor)  # Author(s) (shared string)
         self.peso = float(peso)     # Weight in kg (float)
         self.valor = int(valor)     # Price/value (int)
         self.stock = int(stock)     # Available units (int)
         self.paginas = int(paginas) # Number of pages (int)
-        self.editorial = editorial  # Publisher
-        self.idioma = idioma        # Language
+        self.editorial = interned(editorial)  # Publisher (shared string)
+        self.idioma = interned(idioma)        # Language (shared string)
         
\ No newline at end of file
@@ -1,5 +1,10 @@
-# Represents a loan of a book to a user
-class Prestamo:
+from app.models.registro import Registro, interned
+
+
+# Represents a loan of a book to a user (slotted: no per-instance __dict__)
+class Prestamo(Registro):
+    __slots__ = ("prestamo_id", "user_id", "isbn", "fecha_prestamo", "fecha_devolucion", "devuelto")
+
     # Constructor: creates a loan with identifiers and dates
     def __init__(
         self,
@@ -11,9 +16,9 @@ class Prestamo:
         devuelto: str = "0",
     ):
         self.prestamo_id = prestamo_id  # Unique loan ID
-        self.user_id = user_id          # ID of the user borrowing the book
-        self.isbn = isbn                # ISBN of the borrowed book
-        self.fecha_prestamo = fecha_prestamo  # Loan date
-        self.fecha_devolucion = fecha_devolucion  # Return date (may be None)
+        self.user_id = interned(user_id)  # ID of the user borrowing the book
+        self.isbn = interned(isbn)        # ISBN of the borrowed book
+        self.fecha_prestamo = interned(fecha_prestamo)  # Loan date
+        self.fecha_devolucion = interned(fecha_devolucion)  # Return date (may be None)
         # Return status: "0" not returned, "1" returned (CSV-friendly)
-        self.devuelto = devuelto
+        self.devuelto = interned(devuelto)
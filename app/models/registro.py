@@ -0,0 +1,39 @@
+# app/models/registro.py
+import sys
+
+
+# Share one copy of repeated strings (authors, languages, dates, user ids...)
+def interned(valor):
+    """Return the interned version of a str (other values unchanged)."""
+    return sys.intern(valor) if type(valor) is str else valor
+
+
+# Base for the compact domain records (no per-instance __dict__)
+class Registro:
+    """Base class for `__slots__` records.
+
+    Subclasses declare their attributes in `__slots__`, so instances carry
+    no `__dict__` and cannot grow new attributes. Iterating a record yields
+    (attribute, value) pairs, which makes `dict(obj)` (and FastAPI's
+    `jsonable_encoder`) work as it did with plain classes.
+    """
+
+    __slots__ = ()
+
+    # Attribute names in declaration order (base classes first)
+    @classmethod
+    def _atributos(cls):
+        nombres = []
+        for clase in reversed(cls.__mro__):
+            nombres.extend(clase.__dict__.get("__slots__", ()))
+        return nombres
+
+    # (attribute, value) pairs: dict(obj) -> {attribute: value}
+    def __iter__(self):
+        for nombre in self._atributos():
+            yield nombre, getattr(self, nombre)
+
+    # Readable representation for logs and debugging
+    def __repr__(self):
+        campos = ", ".join(f"{k}={v!r}" for k, v in self)
+        return f"{type(self).__name__}({campos})"
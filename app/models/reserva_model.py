@@ -1,5 +1,10 @@
-# Represents a reservation of a book by a user
-class Reserva:
+from app.models.registro import Registro, interned
+
+
+# Represents a reservation of a book by a user (slotted: no per-instance __dict__)
+class Reserva(Registro):
+    __slots__ = ("reserva_id", "user_id", "isbn", "fecha_reserva")
+
     # Constructor: creates a reservation with identifiers and date
     def __init__(
         self,
@@ -9,6 +14,6 @@ class Reserva:
         fecha_reserva: str,
     ):
         self.reserva_id = reserva_id   # Unique reservation ID
-        self.user_id = user_id         # ID of the user reserving
-        self.isbn = isbn               # ISBN of the reserved book
-        self.fecha_reserva = fecha_reserva  # Date the reservation is made
+        self.user_id = interned(user_id)  # ID of the user reserving
+        self.isbn = interned(isbn)        # ISBN of the reserved book
+        self.fecha_reserva = interned(fecha_reserva)  # Date the reservation is made
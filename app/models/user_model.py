@@ -1,5 +1,10 @@
-# Represents a user in the system
-class Usuario:
+from app.models.registro import Registro
+
+
+# Represents a user in the system (slotted: no per-instance __dict__)
+class Usuario(Registro):
+    __slots__ = ("user_id", "nombre", "correo", "telefono")
+
     # Constructor: creates a user with contact details
     def __init__(self, user_id, nombre, correo, telefono):
         self.user_id = user_id  # Unique user ID
@@ -1,16 +1,62 @@
-from fastapi import APIRouter
-from app.controllers.estanteria_controller import EstanteriaController
+from typing import Optional
+
+from fastapi import APIRouter, Query
+from app.controllers.estanteria_controller import (
+    MAX_COMBINACIONES_STREAM,
+    MAX_TOP_COMBINACIONES,
+    MAX_WORKERS,
+    EstanteriaController,
+)
 
 router = APIRouter(prefix="/estanteria", tags=["Estanterías"])
 
 @router.get("/deficiente")
-def estanteria_deficiente():
-    """Combinations of 4 books > 8 kg (brute force)"""
+def estanteria_deficiente(workers: Optional[int] = Query(None, ge=1, le=MAX_WORKERS)):
+    """Combinations of 4 books > 8 kg (block engine)"""
+    """
+    Block engine over exactly scaled weights:
+    - All combinations of 4 books whose weight > 8 kg, in combinations order
+    - workers=N: same scan split by first book across N processes
+      (same combinations as the sequential scan)
+    """
+    return EstanteriaController.estanteria_deficiente(workers)
+
+
+@router.get("/deficiente/resumen")
+def estanteria_deficiente_resumen():
+    """Number of combinations of 4 books > 8 kg (count only, O(n^2 log n))"""
+    """
+    Pair sums sorted once + two pointers:
+    - Same count as /deficiente without listing the combinations
+    """
+    return EstanteriaController.estanteria_deficiente_resumen()
+
+
+@router.get("/deficiente/stream")
+def estanteria_deficiente_stream(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_COMBINACIONES_STREAM),
+    offset: int = Query(0, ge=0, le=MAX_COMBINACIONES_STREAM),
+):
+    """Combinations of 4 books > 8 kg as NDJSON, one per line, while they are found"""
+    """
+    Generator + StreamingResponse:
+    - Constant memory, first line sent as soon as it is found
+    - limit / offset select a window; at most MAX_COMBINACIONES_STREAM lines
+    - offset skips combinations by enumerating them (cost grows with the
+      offset), so it is bounded by MAX_COMBINACIONES_STREAM as well
+    """
+    return EstanteriaController.estanteria_deficiente_stream(limit, offset)
+
+
+@router.get("/deficiente/top")
+def estanteria_deficiente_top(k: int = Query(20, ge=1, le=MAX_TOP_COMBINACIONES)):
+    """The k heaviest combinations of 4 books > 8 kg, heaviest first"""
     """
-    Brute force algorithm:
-    - All combinations of 4 books whose weight > 8 kg
+    Best-first search (lazy k-best enumeration):
+    - Books sorted by weight, bounded heap of candidate combinations
+    - O(n log n + k log k), no full enumeration
     """
-    return EstanteriaController.estanteria_deficiente()
+    return EstanteriaController.estanteria_deficiente_top(k)
 
 
 @router.get("/optima")
@@ -1,10 +1,13 @@
 # app/routes/libro_routes.py
-from fastapi import APIRouter
-from typing import List
+from fastapi import APIRouter, File, Query, Request, Response, UploadFile
+from typing import List, Optional
+from app.algorithms.estanterias import MAX_WORKERS
 from app.controllers.crudLibros import LibroController
-from app.schemas.libro_schema import LibroCreate, LibroUpdate, LibroOut
+from app.schemas.libro_schema import LibroCreate, LibroUpdate, LibroOut, SugerenciaOut
 from app.schemas.estanteria_schema import EstanteriaResponse
 from app.schemas.estanteria2_schema import EstanteriasOptimasResponse
+from app.utils.condicional import respuesta_condicional
+from app.utils.paginacion import LIMITE_MAXIMO
 
 router = APIRouter(prefix="/libros", tags=["Books"])
 
@@ -13,38 +16,182 @@ router = APIRouter(prefix="/libros", tags=["Books"])
 # ============================================
 
 @router.get("/", response_model=List[LibroOut])
-def listar():
-    """List all books"""
-    return LibroController.listar_libros()
+def listar(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    autor: Optional[str] = None,
+    idioma: Optional[str] = None,
+    editorial: Optional[str] = None,
+):
+    """List books (ISBN order when paginated).
+
+    Parameters:
+    - limit / after: keyset page; the next cursor comes in X-Next-Cursor.
+    - fields: comma separated columns to return (e.g. isbn,titulo).
+    - autor, idioma, editorial: exact-match filters.
+    Sends an ETag; a matching If-None-Match gets 304 without reading the catalog.
+    """
+    filtros = {"autor": autor, "idioma": idioma, "editorial": editorial}
+    return respuesta_condicional(
+        request, response, LibroController.version,
+        lambda: LibroController.listar_libros(filtros, limit, after, fields),
+    )
+
+
+@router.get("/export")
+def exportar(formato: str = "ndjson"):
+    """Stream the full catalog (NDJSON or CSV) with constant memory.
+
+    Parameters:
+    - formato: "ndjson" (default) or "csv".
+    """
+    return LibroController.exportar_libros(formato)
 
 
 @router.get("/buscar", response_model=List[LibroOut])
-def buscar_lineal(q: str):
-    """Search books by title or author using linear search.
-    
+def buscar(q: str, limit: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO)):
+    """Search books by title, author or publisher (ranked by relevance).
+
+    Parameters:
+    - q: query words (case and accent insensitive, prefixes allowed).
+    - limit: maximum number of results.
+    Returns: list of matching books, best first.
+    """
+    return LibroController.buscar_libros(q, limit)
+
+
+@router.get("/cache/estadisticas")
+def estadisticas_cache():
+    """Hit/miss counters and usage of the read result cache"""
+    return LibroController.estadisticas_cache()
+
+
+@router.get("/autocompletar", response_model=List[SugerenciaOut])
+def autocompletar(prefijo: str, limit: int = Query(10, ge=1, le=100)):
+    """Suggest titles and authors starting with a prefix (search box).
+
+    Parameters:
+    - prefijo: text typed so far.
+    - limit: maximum number of suggestions (default 10).
+    """
+    return LibroController.autocompletar(prefijo, limit)
+
+
+@router.get("/buscar/fuzzy", response_model=List[LibroOut])
+def buscar_fuzzy(q: str, limit: int = Query(10, ge=1, le=LIMITE_MAXIMO)):
+    """Typo-tolerant search by title or author ("Quijotte", "Garcia Marques").
+
+    Parameters:
+    - q: query words.
+    - limit: maximum number of results (default 10).
+    Returns: list of the most similar books, best first.
+    """
+    return LibroController.buscar_fuzzy(q, limit)
+
+
+@router.get("/ordenados", response_model=List[LibroOut])
+def obtener_libros_ordenados(
+    request: Request,
+    response: Response,
+    por: str = "isbn",
+    limit: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """Get books sorted by any field combination.
+
     Parameters:
-    - q: query string (case-insensitive).
-    Returns: list of matching books.
+    - por: comma separated fields, "-" prefix for descending (e.g. valor,-peso,titulo).
+      Fields: isbn, titulo, autor, editorial, idioma, peso, valor, stock, paginas.
+    - limit / after: keyset page; the next cursor comes in X-Next-Cursor.
+    - fields: comma separated columns to return.
     """
-    return LibroController.buscar_lineal(q)
+    return respuesta_condicional(
+        request, response, LibroController.version,
+        lambda: LibroController.libros_ordenados(por, limit, after, fields),
+    )
+
+
+@router.get("/rango", response_model=List[LibroOut])
+def obtener_rango(
+    request: Request,
+    response: Response,
+    campo: str = "valor",
+    minimo: Optional[float] = Query(None, alias="min"),
+    maximo: Optional[float] = Query(None, alias="max"),
+    limit: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """Get books with min <= campo <= max, ascending (e.g. campo=peso&max=1: under 1 kg).
+
+    Parameters:
+    - campo: valor, peso, paginas or stock.
+    - min / max: inclusive bounds (either may be omitted).
+    - limit / after: keyset page; the next cursor comes in X-Next-Cursor.
+    - fields: comma separated columns to return.
+    """
+    return respuesta_condicional(
+        request, response, LibroController.version,
+        lambda: LibroController.libros_rango(campo, minimo, maximo, limit, after, fields),
+    )
+
+
+@router.get("/top", response_model=List[LibroOut])
+def obtener_top(
+    request: Request,
+    response: Response,
+    campo: str = "valor",
+    orden: str = "asc",
+    k: int = Query(10, ge=1, le=LIMITE_MAXIMO),
+):
+    """Get the k first books by one field (e.g. campo=valor&orden=asc: the cheapest).
+
+    Parameters:
+    - campo: valor, peso, stock, paginas (or any sortable field).
+    - orden: "asc" or "desc".
+    - k: number of books.
+    """
+    return respuesta_condicional(
+        request, response, LibroController.version,
+        lambda: LibroController.libros_top(campo, orden, k),
+    )
 
 
 @router.get("/ordenados/isbn", response_model=List[LibroOut])
 def obtener_libros_ordenados_isbn():
-    """Get books sorted by ISBN (Insertion Sort)"""
+    """Get books sorted by ISBN (same as /ordenados?por=isbn)"""
     return LibroController.libros_ordenados_isbn()
 
 
 @router.get("/ordenados/precio", response_model=List[LibroOut])
 def obtener_libros_ordenados_precio():
-    """Get books sorted by price (Merge Sort)"""
+    """Get books sorted by price (same as /ordenados?por=valor)"""
     return LibroController.libros_ordenados_precio()
 
 
+@router.post("/import")
+def importar(archivo: UploadFile = File(...), formato: Optional[str] = None):
+    """Bulk import books from a CSV (with header) or NDJSON upload.
+
+    Parameters:
+    - archivo: multipart file field.
+    - formato: optional "csv" or "ndjson" (default: inferred from file name/type).
+    Returns: totals and a per-row error report; accepted rows are stored in one write.
+    """
+    return LibroController.importar_libros(archivo, formato)
+
+
 @router.get("/estanteria/deficiente", response_model=List[EstanteriaResponse])
-def estanteria_deficiente():
-    """Detect 4-book combinations > 8 kg (Brute Force)"""
-    return LibroController.estanteria_deficiente()
+def estanteria_deficiente(workers: Optional[int] = Query(None, ge=1, le=MAX_WORKERS)):
+    """Detect 4-book combinations > 8 kg (exact block engine)
+
+    - workers: split the scan across N processes (default: sequential).
+    """
+    return LibroController.estanteria_deficiente(workers)
 
 
 @router.get("/estanteria/optima", response_model=EstanteriasOptimasResponse)
@@ -55,24 +202,35 @@ def estanteria_optima():
 
 @router.get("/autor/{autor}/valor-total")
 def valor_total(autor: str):
-    """Calculate total value of books by author (Stack recursion)"""
+    """Total value of books by author (case/accent insensitive)"""
     return LibroController.valor_total_autor(autor)
 
 
 @router.get("/autor/{autor}/peso-promedio")
 def peso_promedio(autor: str):
-    """Calculate average weight of books by author (Tail recursion)"""
+    """Average weight of books by author (case/accent insensitive)"""
     return LibroController.peso_promedio_autor(autor)
 
 
+@router.get("/autores/resumen")
+def resumen_autores(autor: List[str] = Query(...)):
+    """Count, value/weight totals and titles for many authors in one call.
+
+    Parameters:
+    - autor: repeat the parameter once per author (?autor=A&autor=B).
+    Returns: {requested name: aggregates or null}.
+    """
+    return LibroController.resumen_autores(autor)
+
+
 # ============================================
 # DYNAMIC ROUTES (must go AT THE END)
 # ============================================
 
 @router.get("/{isbn}", response_model=LibroOut)
-def obtener(isbn: str):
-    """Get a book by ISBN"""
-    return LibroController.obtener_libro(isbn)
+def obtener(isbn: str, request: Request, response: Response):
+    """Get a book by ISBN (ETag / 304 like the list)"""
+    return respuesta_condicional(request, response, LibroController.version, lambda: LibroController.obtener_libro(isbn))
 
 
 @router.post("/", response_model=LibroOut)
@@ -1,20 +1,43 @@
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request, Response
 from app.controllers.crudPrestamos import PrestamoController
 from app.schemas.prestamo_schema import PrestamoCreate, PrestamoUpdate
+from app.utils.condicional import respuesta_condicional
+from app.utils.paginacion import LIMITE_MAXIMO
 
 router = APIRouter(prefix="/prestamos", tags=["Préstamos"])
 
 
 @router.get("/")
-def listar_prestamos():
-    """List all loans"""
-    return PrestamoController.listar_prestamos()
+def listar_prestamos(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    user_id: Optional[str] = None,
+    isbn: Optional[str] = None,
+    devuelto: Optional[str] = None,
+):
+    """List loans (numeric id order when paginated; cursor in X-Next-Cursor)"""
+    filtros = {"user_id": user_id, "isbn": isbn, "devuelto": devuelto}
+    return respuesta_condicional(
+        request, response, PrestamoController.version,
+        lambda: PrestamoController.listar_prestamos(filtros, limit, after, fields),
+    )
+
+
+@router.get("/export")
+def exportar_prestamos(formato: str = "ndjson"):
+    """Stream the full loan history (NDJSON or CSV) with constant memory"""
+    return PrestamoController.exportar_prestamos(formato)
 
 
 @router.get("/{prestamo_id}")
-def obtener_prestamo(prestamo_id: str):
+def obtener_prestamo(prestamo_id: str, request: Request, response: Response):
     """Get a loan by ID"""
-    return PrestamoController.obtener_prestamo(prestamo_id)
+    return respuesta_condicional(request, response, PrestamoController.version, lambda: PrestamoController.obtener_prestamo(prestamo_id))
 
 
 @router.post("/")
@@ -0,0 +1,33 @@
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request, Response
+from app.controllers.reportes_controller import ReporteController
+from app.utils.condicional import respuesta_condicional
+from app.utils.paginacion import LIMITE_MAXIMO
+
+router = APIRouter(prefix="/reportes", tags=["Reportes"])
+
+
+@router.get("/agregar")
+def agregar(
+    request: Request,
+    response: Response,
+    entidad: str,
+    agrupar: Optional[str] = None,
+    metricas: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO),
+    after: Optional[str] = None,
+):
+    """Group-by report over books, loans or reservations.
+
+    Parameters:
+    - entidad: libros, prestamos or reservas.
+    - agrupar: comma separated columns (e.g. editorial or editorial,idioma; empty = totals).
+    - metricas: comma separated count, sum:<col>, avg:<col>, min:<col>, max:<col>.
+    - limit / after: page of groups; the next cursor comes in X-Next-Cursor.
+    Example: /reportes/agregar?entidad=libros&agrupar=editorial&metricas=sum:valor,avg:peso,count
+    """
+    return respuesta_condicional(
+        request, response, lambda: ReporteController.version(entidad),
+        lambda: ReporteController.agregar(entidad, agrupar, metricas, limit, after),
+    )
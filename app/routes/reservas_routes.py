@@ -1,20 +1,36 @@
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request, Response
 from app.controllers.crudReservas import ReservaController
 from app.schemas.reserva_schema import ReservaCreate
+from app.utils.condicional import respuesta_condicional
+from app.utils.paginacion import LIMITE_MAXIMO
 
 router = APIRouter(prefix="/reservas", tags=["Reservas"])
 
 
 @router.get("/")
-def listar_reservas():
-    """List all reservations"""
-    return ReservaController.listar_reservas()
+def listar_reservas(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    user_id: Optional[str] = None,
+    isbn: Optional[str] = None,
+):
+    """List reservations (numeric id order when paginated; cursor in X-Next-Cursor)"""
+    filtros = {"user_id": user_id, "isbn": isbn}
+    return respuesta_condicional(
+        request, response, ReservaController.version,
+        lambda: ReservaController.listar_reservas(filtros, limit, after, fields),
+    )
 
 
 @router.get("/{reserva_id}")
-def obtener_reserva(reserva_id: str):
+def obtener_reserva(reserva_id: str, request: Request, response: Response):
     """Get a reservation by ID"""
-    return ReservaController.obtener_reserva(reserva_id)
+    return respuesta_condicional(request, response, ReservaController.version, lambda: ReservaController.obtener_reserva(reserva_id))
 
 
 @router.post("/")
@@ -1,18 +1,32 @@
-from fastapi import APIRouter
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request, Response
 from app.controllers.crudUser import UsuarioController
 from app.schemas.user_schema import UsuarioCreate, UsuarioUpdate
+from app.utils.condicional import respuesta_condicional
+from app.utils.paginacion import LIMITE_MAXIMO
 
 router = APIRouter(prefix="/usuarios", tags=["Usuarios"])
 
 @router.get("/")
-def listar():
-    """List all users"""
-    return UsuarioController.listar_usuarios()
+def listar(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=LIMITE_MAXIMO),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    correo: Optional[str] = None,
+):
+    """List users (user_id order when paginated; cursor in X-Next-Cursor)"""
+    return respuesta_condicional(
+        request, response, UsuarioController.version,
+        lambda: UsuarioController.listar_usuarios({"correo": correo}, limit, after, fields),
+    )
 
 @router.get("/{user_id}")
-def obtener(user_id: str):
+def obtener(user_id: str, request: Request, response: Response):
     """Get a user by ID"""
-    return UsuarioController.obtener_usuario(user_id)
+    return respuesta_condicional(request, response, UsuarioController.version, lambda: UsuarioController.obtener_usuario(user_id))
 
 @router.post("/")
 def crear(data: UsuarioCreate):
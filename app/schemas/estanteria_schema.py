@@ -2,6 +2,6 @@ from typing import List, Optional
 from pydantic import BaseModel
 
 class EstanteriaResponse(BaseModel):
-    """Response for unsafe shelf combinations (brute force)."""
+    """Response for unsafe shelf combinations (weight > 8 kg)."""
     libros: List[str]
     peso_total: float 
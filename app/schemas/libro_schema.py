@@ -1,10 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class LibroBase(BaseModel):
     """Base attributes for a book entity."""
     titulo: str
     autor: str
-    peso: float
+    peso: float = Field(allow_inf_nan=False)  # NaN/inf would break weight sums
     valor: int
     stock: int
     paginas: int
@@ -23,3 +23,8 @@ class LibroUpdate(LibroBase):
 class LibroOut(LibroBase):
     """Response model for book data (includes ISBN)."""
     isbn: str
+
+class SugerenciaOut(BaseModel):
+    """Autocomplete suggestion: a title or author starting with the prefix."""
+    texto: str
+    tipo: str  # "titulo" or "autor"
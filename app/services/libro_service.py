@@ -1,53 +1,112 @@
 # app/services/libro_service.py
-import csv
-import os
-from typing import List, Optional
+import json
+from itertools import islice
+from typing import Iterable, List, Optional, Tuple
 
+from pydantic import ValidationError
+
+from app.algorithms.estanterias import combinaciones_peligrosas_paralelo, iterar_combinaciones_peligrosas
+from app.db.tablas import repositorio
 from app.models.libro_model import Libro
+from app.schemas.libro_schema import LibroCreate
 from app.utils.libros.adaptador_estanteria import adaptar_estanterias_optimas
+from app.utils.libros.convert_libro2 import convertir_a_libros2
 from app.utils.libros.estanteria_backtracking import estanteria_backtracking
-from app.utils.libros.estanterias_fuerzaBruta import estanterias_fuerzaBruta
-from app.utils.libros.librosOrdenados import libros_ordenados_isbn
-from app.utils.libros.libroSort import ordenar_libros_por_precio
-from app.utils.libros.recursion_cola import peso_promedio_tail_con_libros
-from app.utils.libros.recursion_pila import valor_total_recursivo_con_libros
+from app.utils.libros.indice_autocompletado import IndiceAutocompletado
+from app.utils.libros.indice_autores import IndiceAutores
+from app.utils.libros.indice_invertido import IndiceInvertido
+from app.utils.libros.indice_trigramas import IndiceTrigramas
+from app.utils.libros.indices_catalogo import IndicesCatalogo
+from app.utils.libros.indice_orden import IndiceOrden, parsear_orden
 from app.utils.libros.inventario import Inventario
-
-CSV_PATH = "app/db/data/libros.csv"
-
-# Book service: CSV IO, CRUD, and utilities/algorithms
+from app.utils.paginacion import LIMITE_MAXIMO
+
+# Process-wide catalog repository (CSV engine: parsed once, reloaded only
+# if the file changes on disk; SQLite engine: indexed by ISBN)
+_catalogo = repositorio("libros")
+
+# Derived in-memory indexes, kept in step with the writes made here
+_indices = IndicesCatalogo(
+    _catalogo,
+    inventario=Inventario,
+    busqueda=IndiceInvertido,
+    fuzzy=IndiceTrigramas,
+    autocompletado=IndiceAutocompletado,
+    orden=IndiceOrden,
+    autores=IndiceAutores,
+)
+
+# Rows validated per batch during bulk imports
+TAMANO_LOTE = 1000
+
+# Book service: storage access, CRUD, and utilities/algorithms
 class LibroService:
 
     @staticmethod
-    # Read all books from CSV and return the list
+    # Read all books (CSV engine serves them from memory)
     def cargar_libros() -> List[Libro]:
-        """Read all books from the CSV and return a list of `Libro`.
+        """Return all books from the catalog repository.
+
+        With the CSV engine the file is parsed only on first use or when it
+        changed on disk. The returned `Libro` objects may be shared: do not
+        modify them.
 
         Parameters: none.
         Returns: List[Libro] (may be empty).
         """
-        libros = []
-        with open(CSV_PATH, mode="r", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                libros.append(Libro(**row))
-        return libros
+        return _catalogo.listar()
+
+    @staticmethod
+    # One page of books: equality filters + keyset cursor on the primary key
+    def paginar(criterios: dict, despues: Optional[str] = None, limite: Optional[int] = None) -> Tuple[List[Libro], Optional[str]]:
+        """Return books matching `criterios`, one page at a time.
+
+        Parameters:
+        - criterios: dict column -> value (equality).
+        - despues: last key of the previous page (None = first page).
+        - limite: page size; None returns every match in storage order.
+        Returns: (list of Libro, key of the last row if more pages follow, else None).
+        """
+        if limite is None and despues is None:
+            return (_catalogo.filtrar(criterios) if criterios else _catalogo.listar()), None
+        return _catalogo.pagina(criterios, despues, limite or LIMITE_MAXIMO)
 
     @staticmethod
-    # Overwrite the CSV with the provided list
+    # Catalog data version (changes on every write or external edit)
+    def version():
+        """Return the catalog data version token (used to key cached results).
+
+        Parameters: none.
+        Returns: opaque hashable value; equal tokens mean unchanged data.
+        """
+        return _catalogo.version()
+
+    @staticmethod
+    # Stream all books straight from storage (constant memory)
+    def iterar_libros():
+        """Stream all books from storage, one at a time.
+
+        Parameters: none.
+        Returns: iterator of Libro (fresh objects, storage order).
+        """
+        return _catalogo.iterar()
+
+    @staticmethod
+    # Column names of the books table
+    def columnas() -> List[str]:
+        """Return the stored book columns, in storage order."""
+        return list(_catalogo.campos)
+
+    @staticmethod
+    # Overwrite the storage with the provided list
     def guardar_libros(libros: List[Libro]):
-        """Overwrite the CSV with the provided list of books.
+        """Overwrite the stored catalog with the provided list of books.
 
         Parameters:
         - libros: List[Libro] to persist.
-        Returns: None (side effect: writes file).
+        Returns: None (side effect: writes storage).
         """
-        with open(CSV_PATH, mode="w", encoding="utf-8", newline="") as file:
-            fieldnames = ["isbn", "titulo", "autor", "peso", "valor", "stock", "paginas", "editorial", "idioma"]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            for libro in libros:
-                writer.writerow(libro.__dict__)
+        _indices.aplicar(lambda: _catalogo.guardar(libros))
 
     @staticmethod
     # Find a book by its ISBN, or None if it doesn't exist
@@ -56,12 +115,9 @@ class LibroService:
 
         Parameters:
         - isbn: str
-        Returns: Libro if found, otherwise None.
+        Returns: copy of the Libro if found (safe to modify), otherwise None.
         """
-        for libro in LibroService.cargar_libros():
-            if libro.isbn == isbn:
-                return libro
-        return None
+        return _catalogo.obtener(isbn)
 
     @staticmethod
     # Create a book if there's no duplicate ISBN
@@ -72,14 +128,8 @@ class LibroService:
         - libro: Libro instance to create.
         Returns: Created Libro or None if a duplicate already exists.
         """
-        libros = LibroService.cargar_libros()
-
-        # avoid duplicates
-        if any(l.isbn == libro.isbn for l in libros):
+        if not _indices.aplicar(lambda: _catalogo.insertar(libro), libro.isbn, libro):
             return None
-
-        libros.append(libro)
-        LibroService.guardar_libros(libros)
         return libro
 
     @staticmethod
@@ -92,13 +142,9 @@ class LibroService:
         - data: Libro instance with new data.
         Returns: Updated Libro or None if it does not exist.
         """
-        libros = LibroService.cargar_libros()
-        for i, l in enumerate(libros):
-            if l.isbn == isbn:
-                libros[i] = data
-                LibroService.guardar_libros(libros)
-                return data
-        return None
+        if not _indices.aplicar(lambda: _catalogo.actualizar(isbn, data), isbn, data):
+            return None
+        return data
 
     @staticmethod
     # Delete by ISBN; returns True if found and removed
@@ -109,36 +155,205 @@ class LibroService:
         - isbn: str
         Returns: True if deleted, False if not found.
         """
-        libros = LibroService.cargar_libros()
-        nuevos = [l for l in libros if l.isbn != isbn]
-        if len(nuevos) == len(libros):
-            return False
-        LibroService.guardar_libros(nuevos)
-        return True
+        return _indices.aplicar(lambda: _catalogo.eliminar(isbn), isbn)
+
+    @staticmethod
+    # Bulk import: validate streamed rows in batches, commit once
+    def importar(registros: Iterable[Tuple[int, Optional[dict], Optional[str]]]) -> dict:
+        """Import many books with a single write to storage.
+
+        Rows are consumed lazily in batches of TAMANO_LOTE, validated against
+        `LibroCreate` and checked for duplicate ISBNs with hash sets: the
+        catalog's ISBNs are read once up front (one pass, no per-row lookup)
+        and earlier rows of the same feed are tracked as they are accepted.
+        All accepted rows are stored together at the end.
+
+        Parameters:
+        - registros: iterable of (fila, datos, error) as produced by
+          `app.utils.libros.importacion.leer_registros`.
+        Returns: dict {'total', 'importados', 'rechazados', 'errores': [{'fila', 'isbn', 'error'}]}.
+        """
+        aceptados: List[Libro] = []
+        errores = []
+        vistos = set()
+        existentes = {libro.isbn for libro in _catalogo.listar()}
+        total = 0
+        registros = iter(registros)
+
+        while True:
+            lote = list(islice(registros, TAMANO_LOTE))
+            if not lote:
+                break
+            for fila, datos, error in lote:
+                total += 1
+                isbn = datos.get("isbn") if isinstance(datos, dict) else None
+                if error is None:
+                    try:
+                        libro = Libro(**LibroCreate(**datos).dict())
+                    except ValidationError as e:
+                        error = "; ".join(
+                            f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+                        )
+                if error is None:
+                    if libro.isbn in vistos:
+                        error = "duplicate ISBN in the file"
+                    elif libro.isbn in existentes:
+                        error = "ISBN already exists"
+                if error is not None:
+                    errores.append({"fila": fila, "isbn": isbn, "error": error})
+                    continue
+                vistos.add(libro.isbn)
+                aceptados.append(libro)
+
+        importados = _indices.aplicar(lambda: _catalogo.insertar_varios(aceptados)) if aceptados else 0
+        return {
+            "total": total,
+            "importados": importados,
+            "rechazados": len(errores),
+            "errores": errores,
+        }
 
     @staticmethod
-    # Return the list ordered by ISBN (Insertion Sort)
+    # Ranked full-text search (inverted index over title/author/publisher)
+    def buscar(texto: str, limite: Optional[int] = None) -> List[Libro]:
+        """Search books by words of the title, author or publisher.
+
+        Accent and case insensitive; each word also matches as a prefix
+        ("garc" finds "García") and every word must match. Cost depends on
+        the postings touched, not on the catalog size.
+
+        Parameters:
+        - texto: free text query.
+        - limite: maximum number of results (None = all).
+        Returns: List[Libro] (shared, read-only) by descending relevance.
+        """
+        resultados = _indices.consultar("busqueda", lambda idx: idx.buscar(texto, limite))
+        return [libro for libro, _ in resultados]
+
+    @staticmethod
+    # Typo-tolerant search (trigram index over title/author words)
+    def buscar_fuzzy(texto: str, limite: Optional[int] = 10) -> List[Libro]:
+        """Search books by title/author words tolerating misspellings.
+
+        "Quijotte" finds "Don Quijote de la Mancha", "Garcia Marques" finds
+        García Márquez. Candidates come from a trigram index and are scored
+        by Jaccard similarity with a cutoff.
+
+        Parameters:
+        - texto: free text query.
+        - limite: maximum number of results (None = all).
+        Returns: List[Libro] (shared, read-only), most similar first.
+        """
+        resultados = _indices.consultar("fuzzy", lambda idx: idx.buscar(texto, limite))
+        return [libro for libro, _ in resultados]
+
+    @staticmethod
+    # Titles/authors starting with a prefix (sorted key array + bisect)
+    def autocompletar(prefijo: str, limite: int = 10) -> List[dict]:
+        """Suggest titles and authors for a typed prefix.
+
+        Cost is O(log n + limite): a bisect into a sorted array of normalized
+        keys, then a short forward walk.
+
+        Parameters:
+        - prefijo: typed text (case/accent insensitive, any word start).
+        - limite: maximum number of suggestions.
+        Returns: list of {"texto", "tipo"} ("titulo" or "autor").
+        """
+        return _indices.consultar("autocompletado", lambda idx: idx.sugerir(prefijo, limite))
+
+    @staticmethod
+    # Binary search by ISBN over the process-wide sorted inventory
+    def buscar_binaria(isbn: str) -> Optional[Libro]:
+        """Find a book in the ISBN-sorted inventory (O(log n), no rebuild).
+
+        Parameters:
+        - isbn: str
+        Returns: Libro (shared, read-only) or None.
+        """
+        return _indices.consultar("inventario", lambda inv: inv.buscar_binaria(isbn))
+
+    @staticmethod
+    # Return the list ordered by ISBN (maintained sorted view)
     def ordernar_por_isbn() -> List[Libro]:
-        """Return list of books sorted by ISBN (insertion sort).
+        """Return list of books sorted by ISBN (maintained sorted view).
 
         Parameters: none.
         Returns: List[Libro] sorted ascending by ISBN.
         """
-        libros = LibroService.cargar_libros()
-        ordedanados = libros_ordenados_isbn(libros)
-        return ordedanados
+        return LibroService.ordenados("isbn")[0]
     
     @staticmethod
-    # Return the list ordered by price/value (Merge Sort)
+    # Return the list ordered by price/value (maintained sorted view)
     def obtener_por_precio():
-        """Return list of books sorted by price/value (merge sort).
+        """Return list of books sorted by price/value (maintained sorted view).
 
         Parameters: none.
-        Returns: list sorted by attribute `valor`.
+        Returns: list sorted by attribute `valor` (ties by ISBN).
         """
-        libros= LibroService.cargar_libros()
-        ordenados=ordenar_libros_por_precio(libros)
-        return ordenados
+        return LibroService.ordenados("valor")[0]
+
+    @staticmethod
+    # Books with a numeric field inside [minimo, maximo] (bisect over a sorted view)
+    def rango(campo: str, minimo: Optional[float] = None, maximo: Optional[float] = None, despues: Optional[str] = None, limite: Optional[int] = None) -> Tuple[List[Libro], Optional[str]]:
+        """Return books with `minimo <= campo <= maximo`, ascending by that field.
+
+        Served from the field's sorted view (kept current on every write)
+        with two bisects: O(log n + page), not a catalog scan.
+
+        Parameters:
+        - campo: peso, valor, stock or paginas.
+        - minimo / maximo: inclusive bounds (None = unbounded).
+        - despues: key returned for the previous page (None = first page).
+        - limite: page size (None = the whole range).
+        Returns: (List[Libro] shared/read-only, key of the next page or None).
+        Raises: ValueError for a non numeric field or an invalid key.
+        """
+        cursor = json.loads(despues) if despues is not None else None
+        libros, siguiente = _indices.consultar("orden", lambda idx: idx.rango(campo, minimo, maximo, cursor, limite))
+        return libros, (json.dumps(siguiente, ensure_ascii=False) if siguiente is not None else None)
+
+    @staticmethod
+    # Top-k books by one field (bounded heap or maintained sorted view)
+    def top(campo: str, orden: str = "asc", k: int = 10) -> List[Libro]:
+        """Return the k first books by one field, e.g. the 10 cheapest.
+
+        Cost is O(n log k) with a bounded heap, or O(k) when a sorted view
+        for that order is already kept (see `ordenados`). Ties by ISBN.
+
+        Parameters:
+        - campo: any sortable field (valor, peso, stock, paginas, titulo, ...).
+        - orden: "asc" (smallest first) or "desc" (largest first).
+        - k: number of books.
+        Returns: List[Libro] (shared, read-only), at most k.
+        Raises: ValueError for an unknown field or order.
+        """
+        if orden not in ("asc", "desc"):
+            raise ValueError("orden must be 'asc' or 'desc'")
+        criterio = parsear_orden(("-" if orden == "desc" else "") + campo)
+        return _indices.consultar("orden", lambda idx: idx.top(criterio, k))
+
+    @staticmethod
+    # Books in any multi-field order, one page at a time (presorted views)
+    def ordenados(por: str, despues: Optional[str] = None, limite: Optional[int] = None) -> Tuple[List[Libro], Optional[str]]:
+        """Return books sorted by a field combination such as "valor,-peso,titulo".
+
+        The first request for an order builds a sorted view (O(n log n));
+        later catalog writes move single books in it, so each page costs
+        O(log n + page). Text fields use Spanish alphabetical order (case and
+        accents ignored, "ñ" after "n"); ties are broken by ISBN.
+
+        Parameters:
+        - por: comma separated fields, "-" prefix for descending.
+        - despues: key returned for the previous page (None = first page).
+        - limite: page size (None = every book).
+        Returns: (List[Libro] shared/read-only, key of the next page or None).
+        Raises: ValueError for an invalid order or key.
+        """
+        orden = parsear_orden(por)
+        cursor = json.loads(despues) if despues is not None else None
+        libros, siguiente = _indices.consultar("orden", lambda idx: idx.pagina(orden, cursor, limite))
+        return libros, (json.dumps(siguiente, ensure_ascii=False) if siguiente is not None else None)
 
     @staticmethod
     # Linear search by title/author in general inventory
@@ -150,26 +365,29 @@ class LibroService:
         Returns:
         - List[Libro] with matches.
         """
-        # Load inventory and perform linear search
-        
-
-        inventario = Inventario()
-        libros = LibroService.cargar_libros()
-        for l in libros:
-            inventario.agregar_libro(l)
-        return inventario.buscar_lineal(texto)
+        # Linear search over the process-wide inventory (no rebuild)
+        return _indices.consultar("inventario", lambda inv: inv.buscar_lineal(texto))
     
     @staticmethod
-    # Detect deficient combinations via brute force (weight > 8)
-    def estanteria_deficiente():
-        """Detect deficient combinations via brute force (weight > 8).
+    # Detect deficient combinations with the block engine (weight > 8)
+    def estanteria_deficiente(workers: Optional[int] = None):
+        """Detect deficient combinations (weight > 8), weights compared exactly as written.
 
-        Parameters: none.
+        Parameters:
+        - workers: None for the sequential scan; N to split the scan across
+          N processes (same combinations, same order).
         Returns: list of dictionaries with combinations that exceed the threshold.
+        Raises ValueError if a weight is NaN or infinite.
         """
         libros = LibroService.cargar_libros()
-        deficientes = estanterias_fuerzaBruta(libros)
-        return deficientes
+        if workers:
+            combinaciones = combinaciones_peligrosas_paralelo(libros, workers=workers)
+        else:
+            combinaciones = iterar_combinaciones_peligrosas(libros)
+        return [
+            {"libros": [libro.titulo for libro in combo["libros"]], "peso_total": combo["peso_total"]}
+            for combo in combinaciones
+        ]
     
 
 
@@ -181,42 +399,62 @@ class LibroService:
         Parameters: none.
         Returns: EstanteriasOptimasResponse (schema) with the optimal assignment.
         """
-        libros = LibroService.cargar_libros()
+        # work on copies: the algorithm assigns `estanteria` on each book
+        libros = convertir_a_libros2(LibroService.cargar_libros())
         salida = estanteria_backtracking(libros)
         return adaptar_estanterias_optimas(salida)
     
     @staticmethod
-    # Sum of book values for an author (stack-style recursion)
+    # Sum of book values for an author (materialized aggregate)
     def valor_total_por_autor(autor: str):
-        """Calculate the total value of an author's books using recursion (stack-style).
+        """Return the total value of an author's books (materialized aggregate).
 
         Parameters:
-        - autor: author name (str).
+        - autor: author name (case/accent insensitive).
         Returns: dict {'valor_total': float, 'libros': [titles]} or None if no books.
         """
-        libros = [l for l in LibroService.cargar_libros() if l.autor == autor]
-        if not libros:
+        resumen = LibroService.resumen_autor(autor)
+        if resumen is None:
             return None
-
-        total, titulos = valor_total_recursivo_con_libros(libros, len(libros) - 1)
-        return {"valor_total": total, "libros": titulos}
+        return {"valor_total": resumen["valor_total"], "libros": resumen["titulos"]}
 
 
     @staticmethod
-    # Average weight of books for an author (tail recursion)
+    # Average weight of books for an author (materialized aggregate)
     def peso_promedio_por_autor(autor: str):
-        """Calculate the average weight of an author's books using tail recursion.
+        """Return the average weight of an author's books (materialized aggregate).
 
         Parameters:
-        - autor: str
+        - autor: author name (case/accent insensitive).
         Returns: dict {'peso_promedio': float, 'libros': [titles]} or None if no books.
         """
-        libros = [l for l in LibroService.cargar_libros() if l.autor == autor]
-        if not libros:
+        resumen = LibroService.resumen_autor(autor)
+        if resumen is None:
             return None
+        return {"peso_promedio": resumen["peso_promedio"], "libros": resumen["titulos"]}
+
+    @staticmethod
+    # Per-author aggregates, maintained on every catalog write (O(1) lookup)
+    def resumen_autor(autor: str) -> Optional[dict]:
+        """Return count, value/weight totals and titles of one author.
 
-        promedio, titulos = peso_promedio_tail_con_libros(libros)
-        return {"peso_promedio": promedio, "libros": titulos}
+        Parameters:
+        - autor: author name (case, accents and extra spaces ignored).
+        Returns: dict with autor, cantidad, valor_total, peso_total,
+        peso_promedio and titulos, or None if the author has no books.
+        """
+        return _indices.consultar("autores", lambda idx: idx.resumen(autor))
+
+    @staticmethod
+    # Aggregates of many authors in one call
+    def resumen_autores(autores: List[str]) -> dict:
+        """Return the aggregates of several authors at once.
+
+        Parameters:
+        - autores: author names.
+        Returns: dict requested name -> aggregates (None if unknown).
+        """
+        return _indices.consultar("autores", lambda idx: idx.resumenes(autores))
 
 
 
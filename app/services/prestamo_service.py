@@ -1,8 +1,7 @@
-import csv
-import os
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from app.db.tablas import repositorio
 from app.models.libro_model import Libro
 from app.models.prestamo_model import Prestamo
 from app.services.libro_service import LibroService
@@ -10,102 +9,95 @@ from app.services.reserva_service import \
     ReservaService  # to process reservations
 from app.services.user_service import UsuarioService
 from app.utils.structures.pila import Pila
-from app.utils.libros.inventario import Inventario
+from app.utils.paginacion import LIMITE_MAXIMO
 
-CSV_PATH = "app/db/data/prestamos.csv"
+# Loans repository (CSV engine journals single-row changes by default)
+_prestamos = repositorio("prestamos")
 
 
 # Loan service: CRUD, returns, and history (Stack)
 class PrestamoService:
     """Service for loan management.
 
-    Provides CRUD over prestamos.csv and utilities such as history (Stack)
+    Provides CRUD over the loans repository and utilities such as history (Stack)
     and return registration that affects book stock and reservations.
     """
 
     @staticmethod
-    # Create the CSV if it doesn't exist (including headers)
-    def _ensure_file_exists():
-        """Create the loans CSV file if it does not exist.
+    # Read all loans (CSV engine serves them from memory)
+    def cargar_prestamos() -> List[Prestamo]:
+        """Return all loans.
+
+        With the CSV engine the file (plus its journal) is parsed only on
+        first use or when it changed on disk. The returned objects may be
+        shared: do not modify them.
 
         Parameters: none.
-        Returns: None (side effect: creates file with header).
+        Returns: List[Prestamo].
         """
-        if not os.path.exists(CSV_PATH):
-            with open(CSV_PATH, mode="w", encoding="utf-8", newline="") as file:
-                writer = csv.writer(file)
-                writer.writerow(
-                    [
-                        "prestamo_id",
-                        "user_id",
-                        "isbn",
-                        "fecha_prestamo",
-                        "fecha_devolucion",
-                        "devuelto",
-                    ]
-                )
+        return _prestamos.listar()
 
     @staticmethod
-    # Read all loans from CSV and return the list
-    def cargar_prestamos() -> List[Prestamo]:
-        """Read all loans from the CSV and return a list of Prestamo.
+    # Data version of the loans table (changes on every write or external edit)
+    def version():
+        """Return the loans table version token (used for ETags).
 
         Parameters: none.
-        Returns: List[Prestamo].
+        Returns: opaque hashable value; equal tokens mean unchanged data.
+        """
+        return _prestamos.version()
+
+    @staticmethod
+    # One page of loans: equality filters + keyset cursor on the primary key
+    def paginar(criterios: dict, despues: Optional[str] = None, limite: Optional[int] = None) -> Tuple[List[Prestamo], Optional[str]]:
+        """Return loans matching `criterios`, one page at a time.
+
+        Parameters:
+        - criterios: dict column -> value (equality).
+        - despues: last key of the previous page (None = first page).
+        - limite: page size; None returns every match in storage order.
+        Returns: (list of Prestamo, key of the last row if more pages follow, else None).
+        """
+        if limite is None and despues is None:
+            return (_prestamos.filtrar(criterios) if criterios else _prestamos.listar()), None
+        return _prestamos.pagina(criterios, despues, limite or LIMITE_MAXIMO)
+
+    @staticmethod
+    # Stream all loans straight from storage (constant memory)
+    def iterar_prestamos():
+        """Stream all loans from storage, one at a time.
+
+        Parameters: none.
+        Returns: iterator of Prestamo (fresh objects, storage order).
         """
-        PrestamoService._ensure_file_exists()
-        prestamos: List[Prestamo] = []
-        with open(CSV_PATH, mode="r", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                prestamos.append(
-                    Prestamo(
-                        prestamo_id=row["prestamo_id"],
-                        user_id=row["user_id"],
-                        isbn=row["isbn"],
-                        fecha_prestamo=row["fecha_prestamo"],
-                        fecha_devolucion=row["fecha_devolucion"] or None,
-                        devuelto=row["devuelto"],
-                    )
-                )
-        return prestamos
+        return _prestamos.iterar()
+
+    @staticmethod
+    # Column names of the loans table
+    def columnas() -> List[str]:
+        """Return the stored loan columns, in storage order."""
+        return list(_prestamos.campos)
 
     @staticmethod
-    # Overwrite the CSV with the provided loans list
+    # Overwrite the storage with the provided loans list
     def guardar_prestamos(prestamos: List[Prestamo]):
-        """Overwrite the loans CSV with the given list.
+        """Overwrite the stored loans with the given list (compacts the CSV journal).
 
         Parameters:
         - prestamos: List[Prestamo]
-        Returns: None (side effect: writes file).
+        Returns: None (side effect: writes storage).
         """
-        with open(CSV_PATH, mode="w", encoding="utf-8", newline="") as file:
-            fieldnames = [
-                "prestamo_id",
-                "user_id",
-                "isbn",
-                "fecha_prestamo",
-                "fecha_devolucion",
-                "devuelto",
-            ]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            for p in prestamos:
-                writer.writerow(p.__dict__)
+        _prestamos.guardar(prestamos)
 
     @staticmethod
     # Generate a new sequential ID based on existing ones
-    def _generar_id(prestamos: List[Prestamo]) -> str:
-        """Generate a new sequential ID for a loan based on the existing list.
+    def _generar_id() -> str:
+        """Generate a new sequential ID for a loan (max existing id + 1).
 
-        Parameters:
-        - prestamos: current list of Prestamo
+        Parameters: none.
         Returns: str with the new id.
         """
-        if not prestamos:
-            return "1"
-        ultimo = max(int(p.prestamo_id) for p in prestamos)
-        return str(ultimo + 1)
+        return _prestamos.siguiente_id()
 
     # CRUD básico
 
@@ -124,10 +116,7 @@ class PrestamoService:
         - prestamo_id: str
         Returns: Prestamo or None.
         """
-        for p in PrestamoService.cargar_prestamos():
-            if p.prestamo_id == prestamo_id:
-                return p
-        return None
+        return _prestamos.obtener(prestamo_id)
 
     @staticmethod
     # Create a loan if user/book exist and there's stock
@@ -153,8 +142,7 @@ class PrestamoService:
             # no hay stock, debería crearse una reserva
             return None
 
-        prestamos = PrestamoService.cargar_prestamos()
-        nuevo_id = PrestamoService._generar_id(prestamos)
+        nuevo_id = PrestamoService._generar_id()
 
         nuevo = Prestamo(
             prestamo_id=nuevo_id,
@@ -169,8 +157,7 @@ class PrestamoService:
         libro.stock -= 1
         LibroService.actualizar(isbn, libro)
 
-        prestamos.append(nuevo)
-        PrestamoService.guardar_prestamos(prestamos)
+        _prestamos.insertar(nuevo)
         return nuevo
 
     @staticmethod
@@ -185,21 +172,14 @@ class PrestamoService:
         - marks as returned, updates fecha_devolucion, increases book stock,
           saves loans and triggers assignment of the next reservation.
         """
-        prestamos = PrestamoService.cargar_prestamos()
-        prestamo_encontrado = None
-
-        for i, p in enumerate(prestamos):
-            if p.prestamo_id == prestamo_id:
-                prestamo_encontrado = p
-                if p.devuelto == "1":
-                    return p  # already returned
-                p.devuelto = "1"
-                p.fecha_devolucion = str(date.today())
-                prestamos[i] = p
-                break
-
+        prestamo_encontrado = _prestamos.obtener(prestamo_id)
         if not prestamo_encontrado:
             return None
+        if prestamo_encontrado.devuelto == "1":
+            return prestamo_encontrado  # already returned
+
+        prestamo_encontrado.devuelto = "1"
+        prestamo_encontrado.fecha_devolucion = str(date.today())
 
         # increase book stock
         libro = LibroService.obtener_por_isbn(prestamo_encontrado.isbn)
@@ -207,20 +187,14 @@ class PrestamoService:
             libro.stock += 1
             LibroService.actualizar(libro.isbn, libro)
 
-        PrestamoService.guardar_prestamos(prestamos)
+        _prestamos.actualizar(prestamo_id, prestamo_encontrado)
 
         # =====================
         # Binary search integration (Inventory ordered by ISBN)
         # =====================
         try:
-            inventario = Inventario()
-            # cargar todos los libros y mantener lista ordenada por inserción
-            libros_actuales = LibroService.cargar_libros()
-            for l in libros_actuales:
-                inventario.agregar_libro(l)
-
-            # buscar por ISBN en inventario ordenado
-            libro_en_inventario = inventario.buscar_binaria(prestamo_encontrado.isbn)
+            # buscar por ISBN en el inventario ordenado del proceso (O(log n))
+            libro_en_inventario = LibroService.buscar_binaria(prestamo_encontrado.isbn)
 
             # si se encuentra, procedemos a verificar/atender reservas FIFO
             if libro_en_inventario is not None:
@@ -245,12 +219,7 @@ class PrestamoService:
         - prestamo_id: str
         Returns: True if deleted, False if not found.
         """
-        prestamos = PrestamoService.cargar_prestamos()
-        nuevos = [p for p in prestamos if p.prestamo_id != prestamo_id]
-        if len(nuevos) == len(prestamos):
-            return False
-        PrestamoService.guardar_prestamos(nuevos)
-        return True
+        return _prestamos.eliminar(prestamo_id)
 
     # 🔹 Loan history per user using Stack (project requirement)
 
@@ -263,13 +232,9 @@ class PrestamoService:
         - user_id: str
         Returns: Stack with Prestamo objects pushed chronologically.
         """
-        prestamos = PrestamoService.cargar_prestamos()
         pila = Pila()
         # push in chronological order
-        prestamos_usuario = [
-            p for p in prestamos if p.user_id == user_id
-        ]
-        prestamos_usuario.sort(key=lambda p: p.fecha_prestamo)
+        prestamos_usuario = _prestamos.filtrar({"user_id": user_id}, orden="fecha_prestamo")
         for p in prestamos_usuario:
             pila.push(p)
         return pila
@@ -0,0 +1,72 @@
+from typing import List, Optional
+
+from app.services.libro_service import LibroService
+from app.services.prestamo_service import PrestamoService
+from app.services.reserva_service import ReservaService
+from app.utils.agregacion import agregar, parsear_agrupacion, parsear_metricas
+
+# Entities available for reports: name -> (stream, columns, data version)
+_ENTIDADES = {
+    "libros": (LibroService.iterar_libros, LibroService.columnas, LibroService.version),
+    "prestamos": (PrestamoService.iterar_prestamos, PrestamoService.columnas, PrestamoService.version),
+    "reservas": (ReservaService.iterar_reservas, ReservaService.columnas, ReservaService.version),
+}
+
+
+# Report service: group-by aggregates over any table
+class ReporteService:
+
+    @staticmethod
+    # Entity names accepted by the reports
+    def entidades() -> List[str]:
+        """Return the entities that can be aggregated."""
+        return list(_ENTIDADES)
+
+    @staticmethod
+    # Data version of an entity's table (cache/ETag key)
+    def version(entidad: str):
+        """Return the data version of the entity's table.
+
+        Parameters:
+        - entidad: libros, prestamos or reservas.
+        Returns: opaque token. Raises: ValueError for an unknown entity.
+        """
+        return ReporteService._entidad(entidad)[2]()
+
+    @staticmethod
+    # Columns of an entity's table
+    def columnas(entidad: str) -> List[str]:
+        """Return the stored columns of the entity (valid group/metric fields).
+
+        Raises: ValueError for an unknown entity.
+        """
+        return ReporteService._entidad(entidad)[1]()
+
+    @staticmethod
+    # Group-by with count/sum/avg/min/max in one streaming pass
+    def agregar(entidad: str, agrupar: Optional[str] = None, metricas: Optional[str] = None) -> List[dict]:
+        """Aggregate a table grouped by some columns.
+
+        Rows are streamed from storage and folded into one accumulator per
+        group, so memory is O(groups) whatever the table size.
+
+        Parameters:
+        - entidad: libros, prestamos or reservas.
+        - agrupar: comma separated group columns (None = one global group).
+        - metricas: e.g. "sum:valor,avg:peso,count" (None = count).
+        Returns: list of dicts (group columns + metric columns), sorted by
+        the group columns.
+        Raises: ValueError for an unknown entity, column or metric, or a
+        non numeric value under sum/avg.
+        """
+        iterar, columnas, _ = ReporteService._entidad(entidad)
+        campos = parsear_agrupacion(agrupar, columnas())
+        criterios = parsear_metricas(metricas, columnas())
+        return agregar(iterar(), campos, criterios)
+
+    # Stream/columns/version functions of an entity
+    @staticmethod
+    def _entidad(entidad: str):
+        if entidad not in _ENTIDADES:
+            raise ValueError(f"Unknown entity: {entidad} (valid: {', '.join(_ENTIDADES)})")
+        return _ENTIDADES[entidad]
@@ -1,84 +1,91 @@
-import csv
-import os
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from app.db.tablas import repositorio
 from app.models.reserva_model import Reserva
 from app.services.libro_service import LibroService
 from app.services.user_service import UsuarioService
 from app.utils.structures.cola import Cola
+from app.utils.paginacion import LIMITE_MAXIMO
 
-CSV_PATH = "app/db/data/reservas.csv"
+# Reservations repository (SQLite engine indexes (isbn, fecha_reserva))
+_reservas = repositorio("reservas")
 
 
 # Reservation service: CRUD and automatic assignment (FIFO)
 class ReservaService:
 
     @staticmethod
-    # Create the CSV if it doesn't exist (with header)
-    def _ensure_file_exists():
-        """Create the reservations CSV file if it does not exist.
+    # Read all reservations and return the list
+    def cargar_reservas() -> List[Reserva]:
+        """Read all reservations and return a list of Reserva.
 
         Parameters: none.
-        Returns: None (side effect: creates file).
+        Returns: List[Reserva] (objects may be shared, do not modify).
         """
-        if not os.path.exists(CSV_PATH):
-            with open(CSV_PATH, mode="w", encoding="utf-8", newline="") as file:
-                writer = csv.writer(file)
-                writer.writerow(["reserva_id", "user_id", "isbn", "fecha_reserva"])
+        return _reservas.listar()
 
     @staticmethod
-    # Read all reservations from CSV and return the list
-    def cargar_reservas() -> List[Reserva]:
-        """Read all reservations from CSV and return a list of Reserva.
+    # Data version of the reservations table (changes on every write or external edit)
+    def version():
+        """Return the reservations table version token (used for ETags).
+
+        Parameters: none.
+        Returns: opaque hashable value; equal tokens mean unchanged data.
+        """
+        return _reservas.version()
+
+    @staticmethod
+    # One page of reservations: equality filters + keyset cursor on the primary key
+    def paginar(criterios: dict, despues: Optional[str] = None, limite: Optional[int] = None) -> Tuple[List[Reserva], Optional[str]]:
+        """Return reservations matching `criterios`, one page at a time.
+
+        Parameters:
+        - criterios: dict column -> value (equality).
+        - despues: last key of the previous page (None = first page).
+        - limite: page size; None returns every match in storage order.
+        Returns: (list of Reserva, key of the last row if more pages follow, else None).
+        """
+        if limite is None and despues is None:
+            return (_reservas.filtrar(criterios) if criterios else _reservas.listar()), None
+        return _reservas.pagina(criterios, despues, limite or LIMITE_MAXIMO)
+
+    @staticmethod
+    # Stream all reservations straight from storage (constant memory)
+    def iterar_reservas():
+        """Stream all reservations from storage, one at a time.
 
         Parameters: none.
-        Returns: List[Reserva].
+        Returns: iterator of Reserva (fresh objects, storage order).
         """
-        ReservaService._ensure_file_exists()
-        reservas: List[Reserva] = []
-        with open(CSV_PATH, mode="r", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                reservas.append(
-                    Reserva(
-                        reserva_id=row["reserva_id"],
-                        user_id=row["user_id"],
-                        isbn=row["isbn"],
-                        fecha_reserva=row["fecha_reserva"],
-                    )
-                )
-        return reservas
+        return _reservas.iterar()
 
     @staticmethod
-    # Overwrite the CSV with the provided reservations list
+    # Column names of the reservations table
+    def columnas() -> List[str]:
+        """Return the stored reservation columns, in storage order."""
+        return list(_reservas.campos)
+
+    @staticmethod
+    # Overwrite the storage with the provided reservations list
     def guardar_reservas(reservas: List[Reserva]):
-        """Save the complete reservations list to the CSV (overwrites).
+        """Save the complete reservations list (overwrites).
 
         Parameters:
         - reservas: List[Reserva]
-        Returns: None (side effect: writes file).
+        Returns: None (side effect: writes storage).
         """
-        with open(CSV_PATH, mode="w", encoding="utf-8", newline="") as file:
-            fieldnames = ["reserva_id", "user_id", "isbn", "fecha_reserva"]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            for r in reservas:
-                writer.writerow(r.__dict__)
+        _reservas.guardar(reservas)
 
     @staticmethod
     # Generate a new sequential ID based on existing reservations
-    def _generar_id(reservas: List[Reserva]) -> str:
-        """Generate a new sequential id for reservations.
+    def _generar_id() -> str:
+        """Generate a new sequential id for reservations (max existing id + 1).
 
-        Parameters:
-        - reservas: current list of Reserva
+        Parameters: none.
         Returns: new id as str.
         """
-        if not reservas:
-            return "1"
-        ultimo = max(int(r.reserva_id) for r in reservas)
-        return str(ultimo + 1)
+        return _reservas.siguiente_id()
 
     # CRUD básico
 
@@ -97,10 +104,7 @@ class ReservaService:
         - reserva_id: str
         Returns: Reserva or None.
         """
-        for r in ReservaService.cargar_reservas():
-            if r.reserva_id == reserva_id:
-                return r
-        return None
+        return _reservas.obtener(reserva_id)
 
     @staticmethod
     # Create a reservation only if user/book exist and stock is zero
@@ -111,7 +115,7 @@ class ReservaService:
         - user_id: str
         - isbn: str
         Returns: Created Reserva or None if creation is not valid.
-        Effects: writes to CSV.
+        Effects: writes to storage.
         """
         # Validar usuario
         if not UsuarioService.obtener_por_id(user_id):
@@ -126,8 +130,7 @@ class ReservaService:
         if libro.stock > 0:
             return None
 
-        reservas = ReservaService.cargar_reservas()
-        nuevo_id = ReservaService._generar_id(reservas)
+        nuevo_id = ReservaService._generar_id()
 
         nueva = Reserva(
             reserva_id=nuevo_id,
@@ -136,8 +139,7 @@ class ReservaService:
             fecha_reserva=str(date.today()),
         )
 
-        reservas.append(nueva)
-        ReservaService.guardar_reservas(reservas)
+        _reservas.insertar(nueva)
         return nueva
 
     @staticmethod
@@ -149,12 +151,7 @@ class ReservaService:
         - reserva_id: str
         Returns: True if deleted, False if it does not exist.
         """
-        reservas = ReservaService.cargar_reservas()
-        nuevas = [r for r in reservas if r.reserva_id != reserva_id]
-        if len(nuevas) == len(reservas):
-            return False
-        ReservaService.guardar_reservas(nuevas)
-        return True
+        return _reservas.eliminar(reserva_id)
 
     # 🔹 Reservations queue per book (FIFO), project requirement
 
@@ -167,10 +164,9 @@ class ReservaService:
         - isbn: str
         Returns: Queue with Reserva objects in arrival order.
         """
-        reservas = ReservaService.cargar_reservas()
         cola = Cola()
-        reservas_libro = [r for r in reservas if r.isbn == isbn]
-        # the order in the CSV is already the arrival order
+        # insertion order is already the arrival order
+        reservas_libro = _reservas.filtrar({"isbn": isbn})
         for r in reservas_libro:
             cola.enqueue(r)
         return cola
@@ -184,25 +180,22 @@ class ReservaService:
         - isbn: str
         Returns: Assigned Reserva or None if there are no reservations.
         Effects:
-        - removes the reservation from CSV and automatically creates a loan for that user.
+        - removes the reservation from storage and automatically creates a loan for that user.
         """
         # Note: intentional local import to avoid circular dependency
         # between ReservaService and PrestamoService.
         from app.services.prestamo_service import PrestamoService
 
-        reservas = ReservaService.cargar_reservas()
-        reservas_libro = [r for r in reservas if r.isbn == isbn]
+        # FIFO: oldest reservation first (index on (isbn, fecha_reserva))
+        reservas_libro = _reservas.filtrar({"isbn": isbn}, orden="fecha_reserva")
 
         if not reservas_libro:
             return None
 
-        # FIFO: take the oldest reservation
-        reservas_libro.sort(key=lambda r: r.fecha_reserva)
         siguiente = reservas_libro[0]
 
-        # Remove it from the file
-        nuevas = [r for r in reservas if r.reserva_id != siguiente.reserva_id]
-        ReservaService.guardar_reservas(nuevas)
+        # Remove it from storage
+        _reservas.eliminar(siguiente.reserva_id)
 
         # Automatically create a loan for the reservation's user
         PrestamoService.crear(siguiente.user_id, isbn)
@@ -1,58 +1,66 @@
-import csv
-import os
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from app.db.tablas import repositorio
 from app.models.user_model import Usuario
+from app.utils.paginacion import LIMITE_MAXIMO
 
-CSV_PATH = "app/db/data/usuarios.csv"
+# Users repository (engine selected by BIBLIOTECA_STORAGE)
+_usuarios = repositorio("usuarios")
 
-# User service: CSV-based CRUD
+# User service: CRUD over the users repository
 class UsuarioService:
 
     @staticmethod
-    # Create the CSV if it doesn't exist (with header)
-    def _ensure_file_exists():
-        """Create the CSV file if it does not exist.
-        
+    # Read all users and return the list
+    def cargar_usuarios() -> List[Usuario]:
+        """Load all users.
+
         Parameters: none.
-        Returns: None. (side effect: creates the file with header if missing)
+        Returns: list of Usuario (may be empty; objects may be shared, do not modify).
         """
-        if not os.path.exists(CSV_PATH):
-            with open(CSV_PATH, mode="w", encoding="utf-8", newline="") as file:
-                writer = csv.writer(file)
-                writer.writerow(["user_id", "nombre", "correo", "telefono"])
+        return _usuarios.listar()
 
     @staticmethod
-    # Read all users from CSV and return the list
-    def cargar_usuarios() -> List[Usuario]:
-        """Load all users from the CSV.
+    # Data version of the users table (changes on every write or external edit)
+    def version():
+        """Return the users table version token (used for ETags).
 
         Parameters: none.
-        Returns: list of Usuario (may be empty).
+        Returns: opaque hashable value; equal tokens mean unchanged data.
         """
-        UsuarioService._ensure_file_exists()
-        usuarios = []
-        with open(CSV_PATH, mode="r", encoding="utf-8") as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                usuarios.append(Usuario(**row))
-        return usuarios
+        return _usuarios.version()
 
     @staticmethod
-    # Overwrite the CSV with the provided users list
+    # One page of users: equality filters + keyset cursor on the primary key
+    def paginar(criterios: dict, despues: Optional[str] = None, limite: Optional[int] = None) -> Tuple[List[Usuario], Optional[str]]:
+        """Return users matching `criterios`, one page at a time.
+
+        Parameters:
+        - criterios: dict column -> value (equality).
+        - despues: last key of the previous page (None = first page).
+        - limite: page size; None returns every match in storage order.
+        Returns: (list of Usuario, key of the last row if more pages follow, else None).
+        """
+        if limite is None and despues is None:
+            return (_usuarios.filtrar(criterios) if criterios else _usuarios.listar()), None
+        return _usuarios.pagina(criterios, despues, limite or LIMITE_MAXIMO)
+
+    @staticmethod
+    # Column names of the users table
+    def columnas() -> List[str]:
+        """Return the stored user columns, in storage order."""
+        return list(_usuarios.campos)
+
+    @staticmethod
+    # Overwrite the storage with the provided users list
     def guardar_usuarios(usuarios: List[Usuario]):
-        """Save the complete users list to the CSV (overwrites).
+        """Save the complete users list (overwrites).
 
         Parameters:
         - usuarios: List[Usuario] to serialize.
-        Returns: None (side effect: writes the file).
+        Returns: None (side effect: writes storage).
         """
-        with open(CSV_PATH, mode="w", encoding="utf-8", newline="") as file:
-            fieldnames = ["user_id", "nombre", "correo", "telefono"]
-            writer = csv.DictWriter(file, fieldnames=fieldnames)
-            writer.writeheader()
-            for u in usuarios:
-                writer.writerow(u.__dict__)
+        _usuarios.guardar(usuarios)
 
     @staticmethod
     # Find a user by ID, or None if it doesn't exist
@@ -63,10 +71,7 @@ class UsuarioService:
         - user_id: user identifier (str).
         Returns: Usuario if found, otherwise None.
         """
-        for u in UsuarioService.cargar_usuarios():
-            if u.user_id == user_id:
-                return u
-        return None
+        return _usuarios.obtener(user_id)
 
     @staticmethod
     # Create a user if there's no duplicate user_id
@@ -77,14 +82,9 @@ class UsuarioService:
         - usuario: Usuario instance to create.
         Returns: the created Usuario or None if a duplicate already exists.
         """
-        usuarios = UsuarioService.cargar_usuarios()
-
         # avoid duplicates
-        if any(u.user_id == usuario.user_id for u in usuarios):
+        if not _usuarios.insertar(usuario):
             return None
-
-        usuarios.append(usuario)
-        UsuarioService.guardar_usuarios(usuarios)
         return usuario
 
     @staticmethod
@@ -97,13 +97,9 @@ class UsuarioService:
         - data: Usuario instance with the new data.
         Returns: Updated Usuario or None if it does not exist.
         """
-        usuarios = UsuarioService.cargar_usuarios()
-        for i, u in enumerate(usuarios):
-            if u.user_id == user_id:
-                usuarios[i] = data
-                UsuarioService.guardar_usuarios(usuarios)
-                return data
-        return None
+        if not _usuarios.actualizar(user_id, data):
+            return None
+        return data
 
     @staticmethod
     # Delete by ID; returns True if found and removed
@@ -114,9 +110,4 @@ class UsuarioService:
         - user_id: id of the user to delete.
         Returns: True if deleted, False if not found.
         """
-        usuarios = UsuarioService.cargar_usuarios()
-        nuevos = [u for u in usuarios if u.user_id != user_id]
-        if len(nuevos) == len(usuarios):
-            return False
-        UsuarioService.guardar_usuarios(nuevos)
-        return True
+        return _usuarios.eliminar(user_id)
@@ -37,6 +37,34 @@ async function fetchAPI(url, method = "GET", data = null) {
   return response.json();
 }
 
+/**
+ * Pide una página de un listado paginado (GET con limit/after)
+ *
+ * @param {string} url - URL del listado, con sus filtros/fields
+ * @param {number} limite - Tamaño de página
+ * @param {string|null} cursor - Cursor devuelto por la página anterior
+ * @returns {Promise<{datos: Array<object>, siguiente: string|null}>} - Filas y
+ *   cursor de la página siguiente (null si es la última)
+ * @throws {Error} - Si la respuesta no es exitosa (status >= 400)
+ */
+async function fetchPagina(url, limite, cursor = null) {
+  const pagina = new URL(url);
+  pagina.searchParams.set("limit", limite);
+  if (cursor) {
+    pagina.searchParams.set("after", cursor);
+  }
+
+  const response = await fetch(pagina);
+  if (!response.ok) {
+    throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+  }
+
+  return {
+    datos: await response.json(),
+    siguiente: response.headers.get("X-Next-Cursor"),
+  };
+}
+
 /**
  * Renderiza una tabla genérica con los datos proporcionados
  * Útil para tablas simples sin formato especial
@@ -0,0 +1,208 @@
+# app/utils/agregacion.py
+"""Single-pass group-by aggregation over streamed records.
+
+Functions:
+- parsear_agrupacion(agrupar, columnas): validate "editorial,idioma".
+- parsear_metricas(metricas, columnas): validate "sum:valor,avg:peso,count".
+- agregar(filas, agrupar, metricas): one pass, O(groups) memory.
+- pagina_grupos(grupos, agrupar, despues, limite): sorted keyset page.
+
+Metrics: count (rows), sum, avg, min, max (None values are skipped, as in
+SQL). sum/avg need numbers; numeric strings stored in CSV ("1", "2.5") are
+converted. min/max compare numeric strings as numbers too ("9" < "10"; CSV
+ids are strings) and return the stored value; numbers sort before text.
+Result rows are named after the metric: count, sum_valor, avg_peso...
+"""
+
+import json
+import math
+from bisect import bisect_right
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+FUNCIONES_AGREGACION = ("count", "sum", "avg", "min", "max")
+
+# A metric: (function, field) — field is None for count
+Metrica = Tuple[str, Optional[str]]
+
+
+def parsear_agrupacion(agrupar: Optional[str], columnas: List[str]) -> List[str]:
+    """Parse the group-by fields.
+
+    Parameters:
+    - agrupar: comma separated columns (None or empty = one global group).
+    - columnas: valid column names.
+    Returns: list of columns.
+    Raises: ValueError for an unknown or repeated column.
+    """
+    campos = [c.strip() for c in (agrupar or "").split(",") if c.strip()]
+    for campo in campos:
+        if campo not in columnas:
+            raise ValueError(f"Unknown group field: {campo}")
+    if len(set(campos)) != len(campos):
+        raise ValueError("Repeated group field")
+    return campos
+
+
+def parsear_metricas(metricas: Optional[str], columnas: List[str]) -> List[Metrica]:
+    """Parse the metrics specification.
+
+    Parameters:
+    - metricas: e.g. "sum:valor,avg:peso,count" (None or empty = count).
+    - columnas: valid column names.
+    Returns: list of (function, field).
+    Raises: ValueError for an unknown function or column.
+    """
+    resultado: List[Metrica] = []
+    for parte in (metricas or "count").split(","):
+        parte = parte.strip()
+        if not parte:
+            continue
+        funcion, _, campo = parte.partition(":")
+        funcion, campo = funcion.strip(), campo.strip() or None
+        if funcion not in FUNCIONES_AGREGACION:
+            raise ValueError(f"Unknown metric: {funcion} (valid: {', '.join(FUNCIONES_AGREGACION)})")
+        if funcion == "count":
+            campo = None
+        elif campo is None:
+            raise ValueError(f"Metric {funcion} needs a field, e.g. {funcion}:valor")
+        elif campo not in columnas:
+            raise ValueError(f"Unknown metric field: {campo}")
+        if (funcion, campo) not in resultado:
+            resultado.append((funcion, campo))
+    return resultado or [("count", None)]
+
+
+def nombre_metrica(metrica: Metrica) -> str:
+    """Output column of a metric: "count", "sum_valor", "avg_peso"..."""
+    funcion, campo = metrica
+    return funcion if campo is None else f"{funcion}_{campo}"
+
+
+# Number stored in a record (CSV text columns hold numeric strings)
+def _numero(campo: str, valor):
+    if type(valor) in (int, float):
+        return valor
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"Non numeric value in {campo}: {valor!r}")
+
+
+# Comparison key for min/max: numbers (or numeric strings) by value, then text
+def _clave_extremo(valor) -> tuple:
+    if type(valor) in (int, float):
+        return (0, valor)
+    if type(valor) is str:
+        try:
+            numero = float(valor)
+        except ValueError:
+            return (1, valor)
+        if math.isfinite(numero):
+            return (0, numero)
+    return (1, str(valor))
+
+
+def agregar(filas: Iterable[object], agrupar: List[str], metricas: List[Metrica]) -> List[dict]:
+    """Group records and compute the metrics in a single pass.
+
+    Memory is O(groups): records are consumed one at a time (pass a
+    storage iterator to aggregate without loading the table).
+
+    Parameters:
+    - filas: iterable of records with the attributes used.
+    - agrupar: group-by attributes ([] = one global group).
+    - metricas: parsed metrics.
+    Returns: one dict per group (group fields + metric columns), sorted by
+    the group fields (None first).
+    Raises: ValueError if sum/avg meet a non numeric value.
+    """
+    clave_de = (lambda obj: ()) if not agrupar else (
+        (lambda obj, g=attrgetter(agrupar[0]): (g(obj),)) if len(agrupar) == 1 else attrgetter(*agrupar)
+    )
+    campos = sorted({campo for _, campo in metricas if campo is not None})
+    valores_de = attrgetter(*campos) if len(campos) > 1 else (
+        (lambda obj, g=attrgetter(campos[0]): (g(obj),)) if campos else (lambda obj: ())
+    )
+    posicion = {campo: i for i, campo in enumerate(campos)}
+    numericos = {campo for funcion, campo in metricas if funcion in ("sum", "avg")}
+
+    # group key -> [rows, then per field: sum, non-null count, min, max,
+    # min key, max key]
+    estados: Dict[tuple, list] = {}
+    for obj in filas:
+        clave = clave_de(obj)
+        estado = estados.get(clave)
+        if estado is None:
+            estado = estados[clave] = [0] + [0, 0, None, None, None, None] * len(campos)
+        estado[0] += 1
+        for i, valor in enumerate(valores_de(obj)):
+            if valor is None:
+                continue
+            base = 1 + 6 * i
+            campo = campos[i]
+            if campo in numericos:
+                estado[base] += _numero(campo, valor)
+            estado[base + 1] += 1
+            orden = _clave_extremo(valor)
+            if estado[base + 4] is None or orden < estado[base + 4]:
+                estado[base + 2], estado[base + 4] = valor, orden
+            if estado[base + 5] is None or orden > estado[base + 5]:
+                estado[base + 3], estado[base + 5] = valor, orden
+
+    grupos = []
+    for clave in sorted(estados, key=_orden_grupo):
+        estado = estados[clave]
+        fila = dict(zip(agrupar, clave))
+        for metrica in metricas:
+            funcion, campo = metrica
+            if funcion == "count":
+                valor = estado[0]
+            else:
+                base = 1 + 6 * posicion[campo]
+                no_nulos = estado[base + 1]
+                if funcion == "sum":
+                    valor = estado[base] if no_nulos else None
+                elif funcion == "avg":
+                    valor = estado[base] / no_nulos if no_nulos else None
+                else:
+                    valor = estado[base + 2] if funcion == "min" else estado[base + 3]
+            fila[nombre_metrica(metrica)] = valor
+        grupos.append(fila)
+    return grupos
+
+
+# Deterministic order of group keys (None before any value)
+def _orden_grupo(clave: tuple) -> tuple:
+    return tuple((v is not None, v) for v in clave)
+
+
+def pagina_grupos(grupos: List[dict], agrupar: List[str], despues: Optional[str], limite: Optional[int]) -> Tuple[List[dict], Optional[str]]:
+    """Slice a page of sorted groups after the group key `despues`.
+
+    Parameters:
+    - grupos: result of `agregar` (sorted by group fields).
+    - agrupar: group-by fields.
+    - despues: JSON list with the group key of the previous page's last row.
+    - limite: page size (None = every group).
+    Returns: (rows, key to resume from or None on the last page).
+    Raises: ValueError if the key does not match the grouping.
+    """
+    inicio = 0
+    if despues is not None:
+        try:
+            clave = json.loads(despues)
+            if not isinstance(clave, list) or len(clave) != len(agrupar):
+                raise ValueError
+            claves = [_orden_grupo(tuple(g[c] for c in agrupar)) for g in grupos]
+            inicio = bisect_right(claves, _orden_grupo(tuple(clave)))
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+    if limite is None or inicio + limite >= len(grupos):
+        return grupos[inicio:], None
+    pagina = grupos[inicio:inicio + limite]
+    return pagina, json.dumps([pagina[-1][c] for c in agrupar], ensure_ascii=False)
@@ -0,0 +1,150 @@
+# app/utils/cache.py
+"""Bounded result cache for read endpoints (LRU + TTL).
+
+Configuration (environment variables):
+- BIBLIOTECA_CACHE_ENTRADAS: max entries (default 512; 0 disables the cache)
+- BIBLIOTECA_CACHE_BYTES: approximate max size in bytes (default 32 MiB)
+- BIBLIOTECA_CACHE_TTL: seconds an entry stays valid (default 300)
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+CACHE_ENTRADAS = int(os.getenv("BIBLIOTECA_CACHE_ENTRADAS", "512"))
+CACHE_BYTES = int(os.getenv("BIBLIOTECA_CACHE_BYTES", str(32 * 1024 * 1024)))
+CACHE_TTL = float(os.getenv("BIBLIOTECA_CACHE_TTL", "300"))
+
+
+def tamano_aproximado(valor, profundidad: int = 3) -> int:
+    """Estimate the memory held by a result (containers and records, a few levels deep).
+
+    Parameters:
+    - valor: any value (lists of Libro, dicts, pydantic models...).
+    - profundidad: levels of nesting to follow.
+    Returns: size in bytes (sys.getsizeof based, shared objects counted again).
+    """
+    tamano = sys.getsizeof(valor)
+    if profundidad <= 0:
+        return tamano
+    if isinstance(valor, dict):
+        return tamano + sum(
+            tamano_aproximado(k, profundidad - 1) + tamano_aproximado(v, profundidad - 1)
+            for k, v in valor.items()
+        )
+    if isinstance(valor, (list, tuple, set, frozenset)):
+        return tamano + sum(tamano_aproximado(v, profundidad - 1) for v in valor)
+    slots = getattr(type(valor), "__slots__", None)
+    if slots:
+        return tamano + sum(tamano_aproximado(getattr(valor, s, None), profundidad - 1) for s in slots)
+    atributos = getattr(valor, "__dict__", None)
+    if atributos is not None:
+        return tamano + tamano_aproximado(atributos, profundidad - 1)
+    return tamano
+
+
+# LRU cache with TTL and a byte budget, keyed on a data version
+class CacheResultados:
+    """Memoize query results until the data they were computed from changes.
+
+    Each entry is stored under (key, data version). When a lookup arrives
+    with a new version (any catalog write or external change), every entry
+    computed from an older version is dropped at once. Entries also expire
+    after `ttl` seconds. When the entry or byte budget is exceeded, the
+    least recently used entries are evicted first.
+
+    Counters: hits, misses, evictions and invalidations (see `estadisticas`).
+    """
+
+    # Constructor: budgets (entries, approximate bytes) and TTL in seconds
+    def __init__(self, max_entradas: int = CACHE_ENTRADAS, max_bytes: int = CACHE_BYTES, ttl: float = CACHE_TTL):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entradas: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, size, expiry)
+        self._bytes = 0
+        self._version = None
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self.invalidaciones = 0
+
+    # Drop every entry (the data they were computed from changed)
+    def _vaciar(self):
+        self._entradas.clear()
+        self._bytes = 0
+
+    def obtener(self, clave: Hashable, version, calcular: Callable[[], object]):
+        """Return the cached value for `clave`, computing and storing it on a miss.
+
+        Parameters:
+        - clave: hashable, normalized description of the query.
+        - version: current data version (e.g. `LibroService.version()`).
+        - calcular: function producing the value on a miss. Exceptions
+          propagate and nothing is cached.
+        Returns: the (possibly shared) cached value; callers must not modify it.
+        """
+        if self.max_entradas <= 0:
+            return calcular()
+        ahora = time.monotonic()
+        with self._lock:
+            if version != self._version:
+                if self._entradas:
+                    self.invalidaciones += 1
+                self._vaciar()
+                self._version = version
+            entrada = self._entradas.get(clave)
+            if entrada is not None and entrada[2] > ahora:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return entrada[0]
+            if entrada is not None:
+                self._bytes -= entrada[1]
+                del self._entradas[clave]
+            self.fallos += 1
+
+        valor = calcular()
+        tamano = tamano_aproximado(valor)
+        with self._lock:
+            if version != self._version or tamano > self.max_bytes:
+                return valor  # data changed while computing, or too big to keep
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self._bytes -= anterior[1]
+            self._entradas[clave] = (valor, tamano, ahora + self.ttl)
+            self._bytes += tamano
+            while len(self._entradas) > self.max_entradas or self._bytes > self.max_bytes:
+                _, (_, tamano_expulsado, _) = self._entradas.popitem(last=False)
+                self._bytes -= tamano_expulsado
+                self.expulsiones += 1
+        return valor
+
+    def limpiar(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._vaciar()
+
+    def estadisticas(self) -> dict:
+        """Return counters and current usage.
+
+        Returns: dict with entradas, bytes, max_entradas, max_bytes, ttl,
+        aciertos, fallos, tasa_aciertos, expulsiones, invalidaciones.
+        """
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "max_entradas": self.max_entradas,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+                "expulsiones": self.expulsiones,
+                "invalidaciones": self.invalidaciones,
+            }
@@ -0,0 +1,97 @@
+# app/utils/condicional.py
+"""Conditional GETs (ETag / If-None-Match) driven by table data versions.
+
+Functions:
+- etiqueta(version, recurso, consulta): ETag for a table version
+  (`Repositorio.version()`) of one resource and query.
+- coincide(if_none_match, etag): True if the client's copy is current.
+- respuesta_condicional(request, response, version, construir): 304 or the
+  built response with an ETag header.
+
+The tag depends on the version of the table behind the resource, the
+request path and its query parameters, so a matching request is answered
+before reading rows or serializing anything, and different tables or
+variants (`?fields=`, `?limit=`, filters) never share a tag. Tags are weak
+and include a per-process token, because write counters restart with the
+process.
+"""
+
+import hashlib
+import os
+from typing import Callable, Optional, Sequence, Tuple
+
+from fastapi import Request, Response
+
+# Changes on every start: versions are only comparable within one process
+_ARRANQUE = os.urandom(8).hex()
+
+# Clients must revalidate, but may keep the body and reuse it on a 304
+CACHE_CONTROL = "no-cache"
+
+
+def etiqueta(version, recurso: str = "", consulta: Sequence[Tuple[str, str]] = ()) -> str:
+    """Build the ETag of a table version for one resource and query.
+
+    Parameters:
+    - version: token returned by `Repositorio.version()` (repr-stable tuple).
+    - recurso: resource path (e.g. "/libros/", "/prestamos/7").
+    - consulta: query parameters as (name, value) pairs; they are sorted by
+      name (repeated names keep their order), so "?a=1&b=2" and "?b=2&a=1"
+      get the same tag.
+    Returns: weak ETag, e.g. W/"3f9a...".
+    """
+    parametros = sorted(consulta, key=lambda par: par[0])
+    clave = f"{_ARRANQUE}:{recurso}:{parametros!r}:{version!r}"
+    digest = hashlib.blake2b(clave.encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def coincide(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against the current tag (weak comparison).
+
+    Parameters:
+    - if_none_match: raw header value (None if absent); may list several tags or "*".
+    - etag: current tag.
+    Returns: True if the client already has the current representation.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaco = etag[2:] if etag.startswith("W/") else etag
+    for candidato in if_none_match.split(","):
+        candidato = candidato.strip()
+        if candidato.startswith("W/"):
+            candidato = candidato[2:]
+        if candidato == opaco:
+            return True
+    return False
+
+
+def respuesta_condicional(request: Request, response: Response, version: Callable[[], object], construir: Callable[[], object]):
+    """Answer 304 if the client's tag is current, otherwise build the response.
+
+    Parameters:
+    - request: incoming request (reads If-None-Match).
+    - response: response injected by FastAPI (receives the headers when
+      `construir` returns a plain object, so response_model still applies).
+    - version: function returning the current data version of the table(s).
+    - construir: function producing the body (object or Response); only
+      called when the client's copy is stale, or for "If-None-Match: *"
+      (which matches only if the resource exists). Exceptions propagate.
+    Returns: empty 304 Response, or the result of `construir` with ETag and
+    Cache-Control headers.
+    """
+    etag = etiqueta(version(), request.url.path, request.query_params.multi_items())
+    cabeceras = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    # "*" only matches an existing resource: build first so a 404 propagates
+    comodin = bool(if_none_match) and if_none_match.strip() == "*"
+    if coincide(if_none_match, etag) and not comodin:
+        return Response(status_code=304, headers=cabeceras)
+    resultado = construir()
+    if comodin:
+        return Response(status_code=304, headers=cabeceras)
+    destino = resultado if isinstance(resultado, Response) else response
+    destino.headers.update(cabeceras)
+    return resultado
@@ -0,0 +1,109 @@
+# app/utils/exportacion.py
+"""Streaming serializers for exports (NDJSON / CSV).
+
+Functions:
+- generar_ndjson(objetos, campos): yields NDJSON bytes, one object per line.
+- generar_ndjson_filas(filas): same for ready dicts (first line sent at once).
+- generar_csv(objetos, campos): yields CSV bytes (header first).
+- respuesta_exportacion(objetos, campos, formato, nombre): StreamingResponse.
+
+Both consume `objetos` lazily and yield blocks of about `tamano_bloque`
+bytes, so memory stays constant whatever the number of rows.
+"""
+
+import csv
+import io
+from typing import Iterable, Iterator, List
+
+from fastapi.responses import StreamingResponse
+
+from app.utils.serializacion import dumps, serializador
+
+# Media type per export format
+FORMATOS_EXPORTACION = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+TAMANO_BLOQUE = 64 * 1024
+
+
+def generar_ndjson(objetos: Iterable[object], campos: List[str], tamano_bloque: int = TAMANO_BLOQUE) -> Iterator[bytes]:
+    """Serialize objects as NDJSON.
+
+    Parameters:
+    - objetos: iterable of objects with the given attributes.
+    - campos: attributes to export, in order.
+    - tamano_bloque: approximate size of each yielded chunk (bytes).
+    Yields: bytes chunks.
+    """
+    convertir = serializador(campos)
+    return generar_ndjson_filas((convertir(obj) for obj in objetos), tamano_bloque)
+
+
+def generar_ndjson_filas(filas: Iterable[dict], tamano_bloque: int = TAMANO_BLOQUE) -> Iterator[bytes]:
+    """Serialize dicts as NDJSON.
+
+    The first line is yielded on its own, so the client gets bytes as soon
+    as the first row exists even if the next ones are slow to produce.
+
+    Parameters:
+    - filas: iterable of JSON-compatible dicts (consumed lazily).
+    - tamano_bloque: approximate size of each yielded chunk (bytes).
+    Yields: bytes chunks.
+    """
+    bloque = []
+    tamano = 0
+    primera = True
+    for fila in filas:
+        linea = dumps(fila)
+        bloque.append(linea)
+        tamano += len(linea) + 1
+        if primera or tamano >= tamano_bloque:
+            yield b"\n".join(bloque) + b"\n"
+            bloque, tamano, primera = [], 0, False
+    if bloque:
+        yield b"\n".join(bloque) + b"\n"
+
+
+def generar_csv(objetos: Iterable[object], campos: List[str], tamano_bloque: int = TAMANO_BLOQUE) -> Iterator[bytes]:
+    """Serialize objects as CSV with a header row.
+
+    Parameters:
+    - objetos: iterable of objects with the given attributes.
+    - campos: columns to export, in order (None values become empty cells).
+    - tamano_bloque: approximate size of each yielded chunk (bytes).
+    Yields: bytes chunks.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(campos)
+    for obj in objetos:
+        writer.writerow([getattr(obj, c) for c in campos])
+        if buffer.tell() >= tamano_bloque:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def respuesta_exportacion(objetos: Iterable[object], campos: List[str], formato: str, nombre: str) -> StreamingResponse:
+    """Build a streaming download for an export.
+
+    Parameters:
+    - objetos: iterable of objects (consumed lazily while sending).
+    - campos: attributes to export.
+    - formato: "ndjson" or "csv".
+    - nombre: base file name for Content-Disposition (without extension).
+    Returns: StreamingResponse.
+    Raises: ValueError if the format is not supported.
+    """
+    if formato not in FORMATOS_EXPORTACION:
+        raise ValueError(f"Unsupported format: {formato}")
+    generador = generar_ndjson if formato == "ndjson" else generar_csv
+    return StreamingResponse(
+        generador(objetos, campos),
+        media_type=FORMATOS_EXPORTACION[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nombre}.{formato}"'},
+    )
@@ -11,7 +11,8 @@ def estanteria_backtracking(libros, peso_max=8.0):
         - Returns:
             * dict {"resultado": [ { "estanteria": int, "libros": [titles], "peso_total": float, "precio_total": float }, ... ] }
         - Side effects:
-            * Adds/sets attribute `estanteria` on each book object to indicate assigned shelf (0 = unassigned).
+            * Sets attribute `estanteria` on each book object to indicate assigned shelf (0 = unassigned);
+              the objects must support it (e.g. `Libro2`; slotted `Libro` does not).
         - Note:
             * Attempts to pack books into shelves maximizing value without exceeding `peso_max`, with up to 4 books per shelf.
     """
@@ -0,0 +1,78 @@
+# app/utils/libros/importacion.py
+import csv
+import io
+import json
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+FORMATOS = ("csv", "ndjson")
+
+
+def detectar_formato(nombre_archivo: Optional[str], content_type: Optional[str], formato: Optional[str] = None) -> str:
+    """Decide the format of an uploaded book feed.
+
+    Function:
+    - detectar_formato(nombre_archivo, content_type, formato=None)
+      - Receives:
+        * nombre_archivo: uploaded file name (may be None).
+        * content_type: MIME type sent by the client (may be None).
+        * formato: explicit "csv" or "ndjson" (wins over the rest).
+      - Returns:
+        * "csv" or "ndjson" (.ndjson/.jsonl or application/x-ndjson -> ndjson, else csv).
+      - Raises:
+        * ValueError if `formato` is not supported.
+    """
+    if formato:
+        formato = formato.lower()
+        if formato not in FORMATOS:
+            raise ValueError(f"Unsupported format: {formato}")
+        return formato
+    nombre = (nombre_archivo or "").lower()
+    tipo = (content_type or "").lower()
+    if nombre.endswith((".ndjson", ".jsonl")) or "ndjson" in tipo or "jsonl" in tipo:
+        return "ndjson"
+    return "csv"
+
+
+def leer_registros(archivo: BinaryIO, formato: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Stream the records of an uploaded feed one by one.
+
+    Function:
+    - leer_registros(archivo, formato)
+      - Receives:
+        * archivo: binary file object (e.g. UploadFile.file).
+        * formato: "csv" (with header) or "ndjson" (one JSON object per line).
+      - Yields:
+        * (fila, datos, error): 1-based record number, dict with the record
+          (None if unreadable) and an error message (None if the record is usable).
+      - Raises:
+        * ValueError if the CSV cannot be parsed (csv.Error) or is not UTF-8.
+      - Note:
+        * Reads incrementally; the whole upload is never loaded in memory.
+    """
+    texto = io.TextIOWrapper(archivo, encoding="utf-8-sig", newline="")
+    if formato == "csv":
+        fila = 0
+        try:
+            for fila, datos in enumerate(csv.DictReader(texto), start=1):
+                if None in datos:
+                    yield fila, datos, "more columns than the header"
+                else:
+                    yield fila, datos, None
+        except csv.Error as e:  # e.g. field larger than field limit
+            raise ValueError(f"Invalid CSV after record {fila}: {e}") from e
+        return
+
+    fila = 0
+    for linea in texto:
+        if not linea.strip():
+            continue
+        fila += 1
+        try:
+            datos = json.loads(linea)
+        except json.JSONDecodeError as e:
+            yield fila, None, f"invalid JSON: {e.msg}"
+            continue
+        if not isinstance(datos, dict):
+            yield fila, None, "each line must be a JSON object"
+            continue
+        yield fila, datos, None
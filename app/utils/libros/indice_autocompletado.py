@@ -0,0 +1,113 @@
+# app/utils/libros/indice_autocompletado.py
+import bisect
+import re
+from typing import Dict, Iterable, List, Tuple
+
+from app.models.libro_model import Libro
+from app.utils.libros.texto import normalizar
+
+# Fields offered as suggestions
+CAMPOS_AUTOCOMPLETADO = ("titulo", "autor")
+
+_INICIO_PALABRA = re.compile(r"\w+")
+
+
+# Sorted array of normalized keys for prefix autocomplete
+class IndiceAutocompletado:
+    """Prefix lookup over titles and authors.
+
+    Every title/author is stored under its normalized form (case and accents
+    folded) and under each suffix starting at a word boundary, so "marq"
+    suggests "Gabriel García Márquez". Keys live in one sorted list of
+    (key, field, original text); a prefix is answered with a bisect to the
+    first key >= prefix and a forward walk while keys still start with it:
+    O(log n + k), independent of the catalog size beyond the bisect.
+
+    The same text shared by several books (an author with many titles) is
+    stored once, with a reference count for removals.
+
+    Implements the index protocol used by `IndicesCatalogo`.
+    """
+
+    def __init__(self):
+        self._claves: List[Tuple[str, str, str]] = []
+        self._referencias: Dict[Tuple[str, str], int] = {}  # (field, text) -> books
+
+    # Sorted-array keys of one text (whole text + each word-start suffix)
+    @staticmethod
+    def _claves_texto(campo: str, texto: str) -> List[Tuple[str, str, str]]:
+        normalizado = " ".join(normalizar(texto).split())
+        inicios = dict.fromkeys(m.start() for m in _INICIO_PALABRA.finditer(normalizado))
+        return [(normalizado[i:], campo, texto) for i in [0, *inicios] if normalizado[i:]]
+
+    # (field, text) pairs offered for a book
+    @staticmethod
+    def _textos(libro: Libro) -> List[Tuple[str, str]]:
+        textos = []
+        for campo in CAMPOS_AUTOCOMPLETADO:
+            texto = (getattr(libro, campo, "") or "").strip()
+            if texto:
+                textos.append((campo, texto))
+        return textos
+
+    def cargar(self, libros: Iterable[Libro]):
+        """Build the index from scratch (one sort)."""
+        self._referencias = {}
+        for libro in libros:
+            for par in self._textos(libro):
+                self._referencias[par] = self._referencias.get(par, 0) + 1
+        self._claves = sorted(
+            {clave for campo, texto in self._referencias for clave in self._claves_texto(campo, texto)}
+        )
+
+    def agregar_libro(self, libro: Libro):
+        """Add the title/author of a new book (new texts enter by bisect)."""
+        for par in self._textos(libro):
+            if par in self._referencias:
+                self._referencias[par] += 1
+                continue
+            self._referencias[par] = 1
+            for clave in self._claves_texto(*par):
+                i = bisect.bisect_left(self._claves, clave)
+                if i == len(self._claves) or self._claves[i] != clave:
+                    self._claves.insert(i, clave)
+
+    def actualizar_libro(self, anterior: Libro, libro: Libro):
+        """Swap the texts of a book whose data changed."""
+        self.quitar_libro(anterior)
+        self.agregar_libro(libro)
+
+    def quitar_libro(self, libro: Libro):
+        """Drop the title/author of a book (texts still used by others stay)."""
+        for par in self._textos(libro):
+            restantes = self._referencias.get(par, 0) - 1
+            if restantes > 0:
+                self._referencias[par] = restantes
+                continue
+            self._referencias.pop(par, None)
+            for clave in self._claves_texto(*par):
+                i = bisect.bisect_left(self._claves, clave)
+                if i < len(self._claves) and self._claves[i] == clave:
+                    del self._claves[i]
+
+    def sugerir(self, prefijo: str, limite: int = 10) -> List[dict]:
+        """Return up to `limite` titles/authors starting with `prefijo`.
+
+        Parameters:
+        - prefijo: typed text (case and accent insensitive; also matches at
+          the start of any word).
+        - limite: maximum number of suggestions.
+        Returns: list of {"texto", "tipo"} in key order, without duplicates.
+        """
+        buscado = " ".join(normalizar(prefijo).split())
+        if not buscado:
+            return []
+        sugerencias: Dict[Tuple[str, str], None] = {}
+        i = bisect.bisect_left(self._claves, (buscado,))
+        while i < len(self._claves) and len(sugerencias) < limite:
+            clave, campo, texto = self._claves[i]
+            if not clave.startswith(buscado):
+                break
+            sugerencias.setdefault((texto, campo), None)
+            i += 1
+        return [{"texto": texto, "tipo": campo} for texto, campo in sugerencias]
@@ -0,0 +1,130 @@
+# app/utils/libros/indice_autores.py
+from typing import Dict, Iterable, List, Optional
+
+from app.models.libro_model import Libro
+from app.utils.libros.texto import normalizar
+
+
+def clave_autor(autor: str) -> str:
+    """Normalized author key: case, accents and extra spaces ignored.
+
+    Function:
+    - clave_autor(autor)
+      - Receives:
+        * autor: author name as written in the catalog or in a query.
+      - Returns:
+        * key shared by "Gabriel García Márquez" and "gabriel  garcia marquez".
+    """
+    return " ".join(normalizar(autor or "").split())
+
+
+# Running totals of one author
+class _Agregado:
+    __slots__ = ("autor", "libros", "valor_total", "peso_total")
+
+    def __init__(self, autor: str):
+        self.autor = autor                    # name as written in the catalog
+        self.libros: Dict[str, Libro] = {}    # ISBN -> book, catalog order
+        self.valor_total = 0.0
+        self.peso_total = 0.0
+
+    def agregar(self, libro: Libro):
+        self.libros[libro.isbn] = libro
+        self.valor_total += float(libro.valor)
+        self.peso_total += float(libro.peso)
+
+    # Sums again in catalog order (after an update or removal), so totals
+    # match a left-to-right sum exactly instead of drifting with subtractions
+    def recalcular(self):
+        valor = peso = 0.0
+        for libro in self.libros.values():
+            valor += float(libro.valor)
+            peso += float(libro.peso)
+        self.valor_total, self.peso_total = valor, peso
+
+    def resumen(self) -> dict:
+        cantidad = len(self.libros)
+        return {
+            "autor": self.autor,
+            "cantidad": cantidad,
+            "valor_total": self.valor_total,
+            "peso_total": self.peso_total,
+            "peso_promedio": self.peso_total / cantidad if cantidad else 0,
+            "titulos": [libro.titulo for libro in self.libros.values()],
+        }
+
+
+# Materialized per-author aggregates of the catalog
+class IndiceAutores:
+    """Count, value and weight totals and titles per author.
+
+    Keyed by `clave_autor`, so a lookup is one dict access. Adding a book
+    updates its author's totals in O(1); an update or removal re-adds that
+    author's books only (O(books of the author)), keeping the totals equal
+    to a plain sum in catalog order.
+
+    Implements the index protocol used by `IndicesCatalogo`.
+    """
+
+    def __init__(self):
+        self._autores: Dict[str, _Agregado] = {}
+
+    def cargar(self, libros: Iterable[Libro]):
+        self._autores = {}
+        for libro in libros:
+            self._agregado(libro.autor).agregar(libro)
+
+    # Aggregate of an author, created on first book
+    def _agregado(self, autor: str) -> _Agregado:
+        clave = clave_autor(autor)
+        agregado = self._autores.get(clave)
+        if agregado is None:
+            agregado = self._autores[clave] = _Agregado(autor)
+        return agregado
+
+    def agregar_libro(self, libro: Libro):
+        agregado = self._agregado(libro.autor)
+        if libro.isbn in agregado.libros:
+            agregado.libros[libro.isbn] = libro
+            agregado.recalcular()
+        else:
+            agregado.agregar(libro)
+
+    def actualizar_libro(self, anterior: Libro, libro: Libro):
+        if clave_autor(anterior.autor) != clave_autor(libro.autor):
+            self.quitar_libro(anterior)
+            self.agregar_libro(libro)
+            return
+        agregado = self._agregado(libro.autor)
+        agregado.libros[libro.isbn] = libro  # keeps its position
+        agregado.recalcular()
+
+    def quitar_libro(self, libro: Libro):
+        clave = clave_autor(libro.autor)
+        agregado = self._autores.get(clave)
+        if agregado is None or agregado.libros.pop(libro.isbn, None) is None:
+            return
+        if agregado.libros:
+            agregado.recalcular()
+        else:
+            del self._autores[clave]
+
+    def resumen(self, autor: str) -> Optional[dict]:
+        """Aggregates of one author.
+
+        Parameters:
+        - autor: author name (case/accent insensitive).
+        Returns: dict with autor, cantidad, valor_total, peso_total,
+        peso_promedio and titulos, or None if the author has no books.
+        """
+        agregado = self._autores.get(clave_autor(autor))
+        return agregado.resumen() if agregado is not None else None
+
+    def resumenes(self, autores: List[str]) -> Dict[str, Optional[dict]]:
+        """Aggregates of several authors in one pass.
+
+        Parameters:
+        - autores: author names as requested.
+        Returns: dict requested name -> aggregates (None if unknown).
+        """
+        return {autor: self.resumen(autor) for autor in autores}
@@ -0,0 +1,165 @@
+# app/utils/libros/indice_invertido.py
+import bisect
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.models.libro_model import Libro
+from app.utils.libros.texto import tokenizar
+
+# Field weights for the relevance score (title matches count the most)
+PESOS_CAMPOS = {"titulo": 3.0, "autor": 2.0, "editorial": 1.0}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# A query word that only matches as a prefix of a term scores this fraction
+FACTOR_PREFIJO = 0.5
+
+
+# Inverted index over title, author and publisher with BM25F-style ranking
+class IndiceInvertido:
+    """Full-text index for the catalog.
+
+    - Postings: term -> {isbn: weighted term frequency}, where the frequency
+      of a term in each field is multiplied by PESOS_CAMPOS.
+    - Vocabulary: sorted list of terms, so a query word also matches every
+      term it is a prefix of ("garc" -> "garcia") via bisect.
+    - Terms are accent/case folded (`texto.normalizar`).
+
+    A query touches only the postings of the terms it expands to, never the
+    whole catalog. Every query word must match (AND): words are processed
+    rarest first, and later words only probe the surviving books when that
+    is cheaper than walking their postings. Books are ranked by the sum over
+    words of the best BM25 score among their expansions.
+
+    Implements the index protocol used by `IndicesCatalogo`
+    (cargar / agregar_libro / actualizar_libro / quitar_libro).
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._vocabulario: List[str] = []
+        self._terminos_libro: Dict[str, Dict[str, float]] = {}  # isbn -> term -> weighted tf
+        self._longitudes: Dict[str, float] = {}
+        self._longitud_total = 0.0
+        self._libros: Dict[str, Libro] = {}
+
+    # Weighted term frequencies of one book
+    @staticmethod
+    def _terminos(libro: Libro) -> Dict[str, float]:
+        terminos: Dict[str, float] = defaultdict(float)
+        for campo, peso in PESOS_CAMPOS.items():
+            for token in tokenizar(getattr(libro, campo, "")):
+                terminos[token] += peso
+        return terminos
+
+    def cargar(self, libros: Iterable[Libro]):
+        """Build the index from scratch (one pass, one vocabulary sort)."""
+        self.__init__()
+        for libro in libros:
+            self._indexar(libro, ordenar=False)
+        self._vocabulario = sorted(self._postings)
+
+    # Add one book's postings (new terms enter the vocabulary by bisect)
+    def _indexar(self, libro: Libro, ordenar: bool = True):
+        terminos = self._terminos(libro)
+        for termino, frecuencia in terminos.items():
+            lista = self._postings.get(termino)
+            if lista is None:
+                lista = self._postings[termino] = {}
+                if ordenar:
+                    bisect.insort(self._vocabulario, termino)
+            lista[libro.isbn] = frecuencia
+        longitud = sum(terminos.values())
+        self._terminos_libro[libro.isbn] = terminos
+        self._longitudes[libro.isbn] = longitud
+        self._longitud_total += longitud
+        self._libros[libro.isbn] = libro
+
+    def agregar_libro(self, libro: Libro):
+        """Index a new book."""
+        if libro.isbn in self._libros:
+            self.quitar_libro(self._libros[libro.isbn])
+        self._indexar(libro)
+
+    def actualizar_libro(self, anterior: Libro, libro: Libro):
+        """Re-index a book whose data changed."""
+        self.quitar_libro(anterior)
+        self._indexar(libro)
+
+    def quitar_libro(self, libro: Libro):
+        """Remove a book's postings (terms left without postings are dropped)."""
+        terminos = self._terminos_libro.pop(libro.isbn, None)
+        if terminos is None:
+            return
+        for termino in terminos:
+            lista = self._postings[termino]
+            del lista[libro.isbn]
+            if not lista:
+                del self._postings[termino]
+                i = bisect.bisect_left(self._vocabulario, termino)
+                del self._vocabulario[i]
+        self._longitud_total -= self._longitudes.pop(libro.isbn)
+        del self._libros[libro.isbn]
+
+    # Vocabulary terms starting with a prefix (bisect on the sorted list)
+    def _expandir(self, prefijo: str) -> List[str]:
+        i = bisect.bisect_left(self._vocabulario, prefijo)
+        terminos = []
+        while i < len(self._vocabulario) and self._vocabulario[i].startswith(prefijo):
+            terminos.append(self._vocabulario[i])
+            i += 1
+        return terminos
+
+    def buscar(self, texto: str, limite: Optional[int] = None) -> List[Tuple[Libro, float]]:
+        """Ranked search.
+
+        Parameters:
+        - texto: free text; every word must match a term exactly or as a prefix.
+        - limite: maximum number of results (None = all).
+        Returns: list of (Libro, score) by descending score (ties by ISBN).
+        """
+        palabras = list(dict.fromkeys(tokenizar(texto)))
+        total = len(self._libros)
+        if not palabras or not total:
+            return []
+        promedio = self._longitud_total / total or 1.0
+
+        # rarest word first: later words only need to score the survivors
+        expansiones = sorted(
+            ((palabra, self._expandir(palabra)) for palabra in palabras),
+            key=lambda par: sum(len(self._postings[t]) for t in par[1]),
+        )
+        puntuaciones: Optional[Dict[str, float]] = None
+        for palabra, terminos in expansiones:
+            if not terminos:
+                return []
+            por_palabra: Dict[str, float] = {}
+            for termino in terminos:
+                lista = self._postings[termino]
+                idf = math.log(1 + (total - len(lista) + 0.5) / (len(lista) + 0.5))
+                factor = 1.0 if termino == palabra else FACTOR_PREFIJO
+                if puntuaciones is None or len(lista) <= len(puntuaciones):
+                    candidatos = ((isbn, f) for isbn, f in lista.items())
+                else:
+                    candidatos = ((isbn, lista[isbn]) for isbn in puntuaciones if isbn in lista)
+                for isbn, frecuencia in candidatos:
+                    if puntuaciones is not None and isbn not in puntuaciones:
+                        continue  # already failed an earlier word (AND)
+                    norma = K1 * (1 - B + B * self._longitudes[isbn] / promedio)
+                    puntuacion = factor * idf * frecuencia * (K1 + 1) / (frecuencia + norma)
+                    if puntuacion > por_palabra.get(isbn, 0.0):
+                        por_palabra[isbn] = puntuacion
+            if puntuaciones is None:
+                puntuaciones = por_palabra
+            else:
+                puntuaciones = {isbn: p + por_palabra[isbn] for isbn, p in puntuaciones.items() if isbn in por_palabra}
+            if not puntuaciones:
+                return []
+
+        orden = sorted(puntuaciones.items(), key=lambda par: (-par[1], par[0]))
+        if limite is not None:
+            orden = orden[:limite]
+        return [(self._libros[isbn], puntuacion) for isbn, puntuacion in orden]
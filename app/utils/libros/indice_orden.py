@@ -0,0 +1,274 @@
+# app/utils/libros/indice_orden.py
+import bisect
+import heapq
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.models.libro_model import Libro
+from app.utils.libros.texto import clave_colacion
+
+# Sortable fields and how their values are compared
+CAMPOS_NUMERICOS = ("peso", "valor", "stock", "paginas")
+CAMPOS_COLACION = ("titulo", "autor", "editorial", "idioma")  # Spanish alphabetical order
+CAMPOS_ORDEN = ("isbn",) + CAMPOS_COLACION + CAMPOS_NUMERICOS
+
+# Sorted views kept at the same time (least recently used is dropped)
+MAX_VISTAS = 8
+
+# A sort order: ((field, descending), ...)
+Orden = Tuple[Tuple[str, bool], ...]
+
+
+def parsear_orden(por: str) -> Orden:
+    """Parse a sort specification such as "valor,-peso,titulo".
+
+    Function:
+    - parsear_orden(por)
+      - Receives:
+        * por: comma separated fields; a leading "-" sorts that field descending.
+      - Returns:
+        * tuple of (field, descending) in priority order.
+      - Raises:
+        * ValueError for an empty spec, an unknown field or a repeated field.
+    """
+    orden = []
+    vistos = set()
+    for parte in (por or "").split(","):
+        parte = parte.strip()
+        if not parte:
+            continue
+        descendente = parte.startswith("-")
+        campo = parte.lstrip("+-").strip()
+        if campo not in CAMPOS_ORDEN:
+            raise ValueError(f"Unknown sort field: {campo} (valid: {', '.join(CAMPOS_ORDEN)})")
+        if campo in vistos:
+            raise ValueError(f"Repeated sort field: {campo}")
+        vistos.add(campo)
+        orden.append((campo, descendente))
+    if not orden:
+        raise ValueError("Empty sort specification")
+    return tuple(orden)
+
+
+# True if a cursor value has the type stored in that field
+def _tipo_valido(campo: str, valor) -> bool:
+    if campo in CAMPOS_NUMERICOS:
+        return isinstance(valor, (int, float)) and not isinstance(valor, bool)
+    return isinstance(valor, str)
+
+
+# Wrapper reversing the comparison of one key component (descending fields)
+class _Descendente:
+    __slots__ = ("valor",)
+
+    def __init__(self, valor):
+        self.valor = valor
+
+    def __lt__(self, otro):
+        return otro.valor < self.valor
+
+    def __eq__(self, otro):
+        return self.valor == otro.valor
+
+
+# Sort key of one field value
+def _clave_campo(campo: str, valor, descendente: bool):
+    if campo in CAMPOS_COLACION:
+        valor = clave_colacion(valor or "")
+    if not descendente:
+        return valor
+    if campo in CAMPOS_NUMERICOS:
+        return -valor
+    return _Descendente(valor)
+
+
+# One presorted permutation of the catalog
+class VistaOrdenada:
+    """Books sorted by one multi-field order, as parallel sorted arrays.
+
+    Keys end with the ISBN, so every key is unique: a book is found, added
+    or removed with a bisect (O(log n) search plus one list shift), and a
+    page starting after a given key is a bisect plus a slice.
+    """
+
+    def __init__(self, orden: Orden, libros: Iterable[Libro]):
+        self.orden = orden
+        pares = sorted(((self.clave(l), l) for l in libros), key=lambda p: p[0])
+        self._claves = [c for c, _ in pares]
+        self._libros = [l for _, l in pares]
+
+    def clave_valores(self, valores: List, isbn: str) -> tuple:
+        """Key of a row given its sort field values (in `orden` order) and ISBN."""
+        return tuple(_clave_campo(c, v, d) for (c, d), v in zip(self.orden, valores)) + (isbn,)
+
+    def valores(self, libro: Libro) -> List:
+        """Sort field values of a book (what a page cursor records)."""
+        return [getattr(libro, c) for c, _ in self.orden]
+
+    def clave(self, libro: Libro) -> tuple:
+        return self.clave_valores(self.valores(libro), libro.isbn)
+
+    def agregar(self, libro: Libro):
+        clave = self.clave(libro)
+        i = bisect.bisect_left(self._claves, clave)
+        self._claves.insert(i, clave)
+        self._libros.insert(i, libro)
+
+    def quitar(self, libro: Libro):
+        clave = self.clave(libro)
+        i = bisect.bisect_left(self._claves, clave)
+        if i < len(self._claves) and self._claves[i] == clave:
+            del self._claves[i]
+            del self._libros[i]
+
+    def pagina(self, despues: Optional[tuple], limite: Optional[int]) -> Tuple[List[Libro], bool]:
+        """Return the books after key `despues` (None = from the start).
+
+        Returns: (books, True if more books follow).
+        """
+        inicio = 0 if despues is None else bisect.bisect_right(self._claves, despues)
+        if limite is None:
+            return self._libros[inicio:], False
+        fin = inicio + limite
+        return self._libros[inicio:fin], fin < len(self._libros)
+
+    def rango(self, minimo, maximo, despues: Optional[tuple], limite: Optional[int]) -> Tuple[List[Libro], bool]:
+        """Return the books whose first sort field is within [minimo, maximo].
+
+        Only meaningful for an ascending single-field view. Two bisects
+        find the bounds, so the cost is O(log n + page).
+
+        Parameters:
+        - minimo / maximo: inclusive bounds (None = unbounded).
+        - despues: key of the last book of the previous page (None = from the start).
+        - limite: page size (None = the whole range).
+        Returns: (books, True if more books follow in the range).
+        """
+        primero = lambda clave: clave[0]
+        inicio = 0 if minimo is None else bisect.bisect_left(self._claves, minimo, key=primero)
+        fin = len(self._claves) if maximo is None else bisect.bisect_right(self._claves, maximo, key=primero)
+        if despues is not None:
+            inicio = max(inicio, bisect.bisect_right(self._claves, despues))
+        if limite is None or inicio + limite >= fin:
+            return self._libros[inicio:fin], False
+        return self._libros[inicio:inicio + limite], True
+
+
+# Sorted views of the catalog for any field combination
+class IndiceOrden:
+    """Presorted permutations of the catalog, maintained on write.
+
+    A view is built the first time an order is requested (one O(n log n)
+    sort) and from then on every write moves single books in it with a
+    bisect instead of resorting. Serving a page is O(log n + page). At most
+    `MAX_VISTAS` orders are kept; the least recently used one is dropped.
+
+    Implements the index protocol used by `IndicesCatalogo`.
+    """
+
+    def __init__(self):
+        self._libros: Dict[str, Libro] = {}
+        self._vistas: "OrderedDict[Orden, VistaOrdenada]" = OrderedDict()
+
+    def cargar(self, libros: Iterable[Libro]):
+        self._libros = {l.isbn: l for l in libros}
+        self._vistas.clear()
+
+    def agregar_libro(self, libro: Libro):
+        anterior = self._libros.get(libro.isbn)
+        if anterior is not None:
+            self.actualizar_libro(anterior, libro)
+            return
+        self._libros[libro.isbn] = libro
+        for vista in self._vistas.values():
+            vista.agregar(libro)
+
+    def actualizar_libro(self, anterior: Libro, libro: Libro):
+        self._libros[libro.isbn] = libro
+        for vista in self._vistas.values():
+            vista.quitar(anterior)
+            vista.agregar(libro)
+
+    def quitar_libro(self, libro: Libro):
+        self._libros.pop(libro.isbn, None)
+        for vista in self._vistas.values():
+            vista.quitar(libro)
+
+    def vista(self, orden: Orden) -> VistaOrdenada:
+        """Return the view for an order, building it on first use."""
+        vista = self._vistas.get(orden)
+        if vista is None:
+            vista = VistaOrdenada(orden, self._libros.values())
+            self._vistas[orden] = vista
+            if len(self._vistas) > MAX_VISTAS:
+                self._vistas.popitem(last=False)
+        else:
+            self._vistas.move_to_end(orden)
+        return vista
+
+    def top(self, orden: Orden, k: int) -> List[Libro]:
+        """First `k` books in the given order.
+
+        Served from the view if that order is already kept (O(k)); otherwise
+        a bounded heap over the catalog (O(n log k)) without building a view.
+
+        Parameters:
+        - orden: parsed sort order (see `parsear_orden`).
+        - k: number of books.
+        Returns: List[Libro], at most k, in order.
+        """
+        vista = self._vistas.get(orden)
+        if vista is not None:
+            self._vistas.move_to_end(orden)
+            return vista.pagina(None, k)[0]
+        clave = VistaOrdenada(orden, ()).clave
+        return heapq.nsmallest(k, self._libros.values(), key=clave)
+
+    def rango(self, campo: str, minimo, maximo, despues: Optional[list], limite: Optional[int]) -> Tuple[List[Libro], Optional[list]]:
+        """One page of the books with `minimo <= campo <= maximo`, ascending.
+
+        Served from the ascending view of that field (a sorted array of
+        values kept current on write), with bisect range lookups.
+
+        Parameters:
+        - campo: numeric field (peso, valor, stock, paginas).
+        - minimo / maximo: inclusive bounds (None = unbounded).
+        - despues: cursor of the previous page, [value, isbn] (None = first page).
+        - limite: page size (None = the whole range).
+        Returns: (books, cursor for the next page or None on the last page).
+        Raises: ValueError for a non numeric field or an invalid cursor.
+        """
+        if campo not in CAMPOS_NUMERICOS:
+            raise ValueError(f"Range queries need a numeric field: {', '.join(CAMPOS_NUMERICOS)}")
+        orden = ((campo, False),)
+        vista = self.vista(orden)
+        libros, hay_mas = vista.rango(minimo, maximo, self._clave_cursor(vista, despues), limite)
+        siguiente = vista.valores(libros[-1]) + [libros[-1].isbn] if hay_mas else None
+        return libros, siguiente
+
+    # Key of a page cursor [field values..., isbn] in a view (None = first page)
+    @staticmethod
+    def _clave_cursor(vista: VistaOrdenada, despues: Optional[list]) -> Optional[tuple]:
+        if despues is None:
+            return None
+        campos = [c for c, _ in vista.orden] + ["isbn"]
+        if not isinstance(despues, list) or len(despues) != len(campos) or not all(
+            _tipo_valido(c, v) for c, v in zip(campos, despues)
+        ):
+            raise ValueError("Invalid cursor")
+        return vista.clave_valores(despues[:-1], despues[-1])
+
+    def pagina(self, orden: Orden, despues: Optional[list], limite: Optional[int]) -> Tuple[List[Libro], Optional[list]]:
+        """One page of books in the given order.
+
+        Parameters:
+        - orden: parsed sort order (see `parsear_orden`).
+        - despues: cursor of the previous page, [field values..., isbn] (None = first page).
+        - limite: page size (None = every book).
+        Returns: (books, cursor for the next page or None on the last page).
+        Raises: ValueError if the cursor does not match the order.
+        """
+        vista = self.vista(orden)
+        libros, hay_mas = vista.pagina(self._clave_cursor(vista, despues), limite)
+        siguiente = vista.valores(libros[-1]) + [libros[-1].isbn] if hay_mas else None
+        return libros, siguiente
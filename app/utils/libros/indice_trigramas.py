@@ -0,0 +1,153 @@
+# app/utils/libros/indice_trigramas.py
+import math
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from app.models.libro_model import Libro
+from app.utils.libros.texto import tokenizar
+
+# Fields searched by the fuzzy lookup
+CAMPOS_FUZZY = ("titulo", "autor")
+
+# Minimum Jaccard similarity (over trigrams) between a query word and a word
+UMBRAL_SIMILITUD = 0.35
+
+
+# Character trigrams of a word, padded so that prefixes/suffixes count too
+def trigramas(palabra: str) -> Set[str]:
+    """Return the trigram set of a normalized word ("$$w" ... "d$" padding)."""
+    relleno = f"$${palabra}$"
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+# Trigram index over the words of titles and authors (typo tolerant lookup)
+class IndiceTrigramas:
+    """Fuzzy word index for the catalog.
+
+    The vocabulary holds every normalized word of `titulo`/`autor` with the
+    books that contain it; a second map goes from trigram to the words that
+    contain it. A query word is matched in two steps:
+
+    1. Candidate generation: words found in the postings of the query's
+       rarest trigrams (prefix filter: a word reaching the threshold must
+       share one of them), discarding words whose size makes the threshold
+       unreachable.
+    2. Scoring: Jaccard similarity = shared / (|q| + |w| - shared), kept if it
+       reaches UMBRAL_SIMILITUD.
+
+    A book scores the mean, over query words, of the best similarity among its
+    words; books missing some words still appear, ranked lower. The work
+    depends on the vocabulary words sharing trigrams with the query, not on
+    the number of books.
+
+    Implements the index protocol used by `IndicesCatalogo`.
+    """
+
+    def __init__(self):
+        self._libros_palabra: Dict[str, Dict[str, int]] = {}   # word -> {isbn: occurrences}
+        self._palabras_trigrama: Dict[str, Set[str]] = {}      # trigram -> words
+        self._trigramas: Dict[str, FrozenSet[str]] = {}        # word -> its trigrams
+        self._palabras_libro: Dict[str, Set[str]] = {}         # isbn -> words
+        self._libros: Dict[str, Libro] = {}
+
+    # Normalized words of the searched fields
+    @staticmethod
+    def _palabras(libro: Libro) -> List[str]:
+        palabras = []
+        for campo in CAMPOS_FUZZY:
+            palabras.extend(tokenizar(getattr(libro, campo, "")))
+        return palabras
+
+    def cargar(self, libros: Iterable[Libro]):
+        """Build the index from scratch."""
+        self.__init__()
+        for libro in libros:
+            self.agregar_libro(libro)
+
+    def agregar_libro(self, libro: Libro):
+        """Index the words of a new book."""
+        if libro.isbn in self._libros:
+            self.quitar_libro(self._libros[libro.isbn])
+        palabras = self._palabras(libro)
+        for palabra in palabras:
+            libros = self._libros_palabra.get(palabra)
+            if libros is None:
+                libros = self._libros_palabra[palabra] = {}
+                tris = self._trigramas[palabra] = frozenset(trigramas(palabra))
+                for tri in tris:
+                    self._palabras_trigrama.setdefault(tri, set()).add(palabra)
+            libros[libro.isbn] = libros.get(libro.isbn, 0) + 1
+        self._palabras_libro[libro.isbn] = set(palabras)
+        self._libros[libro.isbn] = libro
+
+    def actualizar_libro(self, anterior: Libro, libro: Libro):
+        """Re-index a book whose data changed."""
+        self.quitar_libro(anterior)
+        self.agregar_libro(libro)
+
+    def quitar_libro(self, libro: Libro):
+        """Remove a book (words left without books leave the vocabulary)."""
+        palabras = self._palabras_libro.pop(libro.isbn, None)
+        if palabras is None:
+            return
+        for palabra in palabras:
+            libros = self._libros_palabra[palabra]
+            del libros[libro.isbn]
+            if not libros:
+                del self._libros_palabra[palabra]
+                for tri in self._trigramas.pop(palabra):
+                    con_tri = self._palabras_trigrama[tri]
+                    con_tri.discard(palabra)
+                    if not con_tri:
+                        del self._palabras_trigrama[tri]
+        del self._libros[libro.isbn]
+
+    # Vocabulary words similar to one query word: {word: jaccard}
+    def _similares(self, palabra: str) -> Dict[str, float]:
+        tris = trigramas(palabra)
+        n = len(tris)
+        # Jaccard >= t needs at least ceil(t * n) shared trigrams, so any match
+        # shares one of the n - ceil(t * n) + 1 rarest query trigrams (prefix
+        # filter): the most common trigrams are never walked
+        minimo_comunes = math.ceil(UMBRAL_SIMILITUD * n)
+        por_rareza = sorted(tris, key=lambda tri: len(self._palabras_trigrama.get(tri, ())))
+        candidatas: Set[str] = set()
+        for tri in por_rareza[:n - minimo_comunes + 1]:
+            candidatas.update(self._palabras_trigrama.get(tri, ()))
+        minimo, maximo = n * UMBRAL_SIMILITUD, n / UMBRAL_SIMILITUD
+        similares: Dict[str, float] = {}
+        for candidata in candidatas:
+            tris_candidata = self._trigramas[candidata]
+            tamano = len(tris_candidata)
+            if tamano < minimo or tamano > maximo:
+                continue
+            comunes = len(tris & tris_candidata)
+            jaccard = comunes / (n + tamano - comunes)
+            if jaccard >= UMBRAL_SIMILITUD:
+                similares[candidata] = jaccard
+        return similares
+
+    def buscar(self, texto: str, limite: Optional[int] = 10) -> List[Tuple[Libro, float]]:
+        """Typo-tolerant search.
+
+        Parameters:
+        - texto: free text ("Quijotte", "Garcia Marques").
+        - limite: maximum number of results (None = all).
+        Returns: list of (Libro, similarity 0..1) by descending similarity (ties by ISBN).
+        """
+        palabras = list(dict.fromkeys(tokenizar(texto)))
+        if not palabras:
+            return []
+        puntuaciones: Dict[str, float] = defaultdict(float)
+        for palabra in palabras:
+            mejores: Dict[str, float] = {}
+            for similar, jaccard in self._similares(palabra).items():
+                for isbn in self._libros_palabra[similar]:
+                    if jaccard > mejores.get(isbn, 0.0):
+                        mejores[isbn] = jaccard
+            for isbn, jaccard in mejores.items():
+                puntuaciones[isbn] += jaccard / len(palabras)
+        orden = sorted(puntuaciones.items(), key=lambda par: (-par[1], par[0]))
+        if limite is not None:
+            orden = orden[:limite]
+        return [(self._libros[isbn], puntuacion) for isbn, puntuacion in orden]
@@ -0,0 +1,94 @@
+# app/utils/libros/indices_catalogo.py
+import threading
+from typing import Callable, Dict, Optional
+
+from app.models.libro_model import Libro
+
+
+# Process-wide in-memory indexes derived from the books repository
+class IndicesCatalogo:
+    """Keeps derived book indexes (Inventario, ...) in step with the catalog.
+
+    Each index is built by a factory and must provide:
+    - cargar(libros): bulk (re)build from the whole catalog.
+    - agregar_libro(libro): add one book.
+    - actualizar_libro(anterior, libro): replace a book (same ISBN).
+    - quitar_libro(libro): remove one book.
+
+    Indexes are built lazily on first use. Writes made through `aplicar` are
+    mirrored on every index (O(log n) for Inventario) instead of rebuilding
+    it. If the repository `version()` no longer matches the one recorded
+    after the last sync (file edited by hand, another process, bulk write),
+    the indexes are rebuilt from scratch on the next query.
+
+    Queries run under the same lock as the updates, so an index is never
+    read half-updated.
+    """
+
+    # Constructor: repository and index factories (name -> callable)
+    def __init__(self, repositorio, **fabricas: Callable[[], object]):
+        self._repositorio = repositorio
+        self._fabricas = fabricas
+        self._indices: Dict[str, object] = {}
+        self._libros: Dict[str, Libro] = {}  # ISBN -> book as indexed
+        self._version = None
+        self._lock = threading.RLock()
+
+    # Rebuild every index if the repository changed behind our back
+    def _al_dia(self):
+        version = self._repositorio.version()
+        if version == self._version:
+            return
+        libros = self._repositorio.listar()
+        indices = {}
+        for nombre, fabrica in self._fabricas.items():
+            indice = fabrica()
+            indice.cargar(libros)
+            indices[nombre] = indice
+        self._indices = indices
+        self._libros = {l.isbn: l for l in libros}
+        self._version = version
+
+    def consultar(self, nombre: str, consulta: Callable[[object], object]):
+        """Run a read-only query against one index.
+
+        Parameters:
+        - nombre: index name (as given to the constructor).
+        - consulta: function receiving the index.
+        Returns: whatever `consulta` returns.
+        """
+        with self._lock:
+            self._al_dia()
+            return consulta(self._indices[nombre])
+
+    def aplicar(self, escritura: Callable[[], object], isbn: Optional[str] = None, nuevo: Optional[Libro] = None):
+        """Run a repository write and mirror it on the indexes.
+
+        Parameters:
+        - escritura: function performing the write; False or 0 means nothing
+          changed (None counts as a change, e.g. `guardar`).
+        - isbn: key of the single book written (None for bulk writes, which
+          just mark the indexes for rebuild).
+        - nuevo: book stored under `isbn` after the write (None = deleted).
+        Returns: the result of `escritura`.
+        """
+        with self._lock:
+            al_dia = self._version is not None and self._version == self._repositorio.version()
+            resultado = escritura()
+            if resultado is not None and not resultado:
+                return resultado
+            if not al_dia or isbn is None:
+                self._version = None
+                return resultado
+            anterior = self._libros.pop(isbn, None)
+            for indice in self._indices.values():
+                if anterior is not None and nuevo is not None:
+                    indice.actualizar_libro(anterior, nuevo)
+                elif anterior is not None:
+                    indice.quitar_libro(anterior)
+                elif nuevo is not None:
+                    indice.agregar_libro(nuevo)
+            if nuevo is not None:
+                self._libros[isbn] = nuevo
+            self._version = self._repositorio.version()
+            return resultado
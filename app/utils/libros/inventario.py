@@ -1,39 +1,71 @@
+import bisect
+from typing import Dict, Iterable, List
+
 from app.models.libro_model import Libro
-from typing import List
 
 class Inventario:
     """
     Manages:
-    - General Inventory (unsorted)
-    - Inventory Ordered by ISBN (always ordered via Insertion)
+    - General Inventory (unsorted, insertion order, keyed by ISBN)
+    - Inventory Ordered by ISBN (always ordered via bisect insertion)
 
     Project requirement:
     - Unsorted list for linear searches
     - Sorted list for binary searches
+
+    Meant to be long-lived: one process-wide instance is kept in step with
+    the catalog writes (see `IndicesCatalogo`), so lookups never rebuild it.
     """
 
     def __init__(self):
-        self.inventario_general: List[Libro] = []
+        self.inventario_general: Dict[str, Libro] = {}
         self.inventario_ordenado: List[Libro] = []
+        self._isbns: List[str] = []  # ISBNs of inventario_ordenado (bisect keys)
 
     # ---------------------------
-    # ADD BOOK
+    # BULK LOAD (one sort, O(n log n))
+    # ---------------------------
+    def cargar(self, libros: Iterable[Libro]):
+        self.inventario_general = {libro.isbn: libro for libro in libros}
+        self.inventario_ordenado = sorted(self.inventario_general.values(), key=lambda l: l.isbn)
+        self._isbns = [libro.isbn for libro in self.inventario_ordenado]
+
+    # ---------------------------
+    # ADD BOOK (replaces a book with the same ISBN)
     # ---------------------------
     def agregar_libro(self, libro: Libro):
-        # 1. General list → just append
-        self.inventario_general.append(libro)
+        # 1. General inventory → keyed by ISBN (keeps insertion order)
+        self.inventario_general[libro.isbn] = libro
 
-        # 2. Sorted list → insert via insertion
+        # 2. Sorted list → insert at the bisect position
         self._insertar_ordenado_isbn(libro)
 
     # ---------------------------
-    # ORDERED INSERTION BY ISBN (O(n))
+    # UPDATE BOOK (same ISBN, keeps its position)
+    # ---------------------------
+    def actualizar_libro(self, anterior: Libro, libro: Libro):
+        self.inventario_general[libro.isbn] = libro
+        self._insertar_ordenado_isbn(libro)
+
+    # ---------------------------
+    # REMOVE BOOK
+    # ---------------------------
+    def quitar_libro(self, libro: Libro):
+        self.inventario_general.pop(libro.isbn, None)
+        i = bisect.bisect_left(self._isbns, libro.isbn)
+        if i < len(self._isbns) and self._isbns[i] == libro.isbn:
+            del self._isbns[i]
+            del self.inventario_ordenado[i]
+
+    # ---------------------------
+    # ORDERED INSERTION BY ISBN (O(log n) search + one list insert)
     # ---------------------------
     def _insertar_ordenado_isbn(self, libro: Libro):
-        i = 0
-        while i < len(self.inventario_ordenado) and \
-            self.inventario_ordenado[i].isbn < libro.isbn:
-            i += 1
+        i = bisect.bisect_left(self._isbns, libro.isbn)
+        if i < len(self._isbns) and self._isbns[i] == libro.isbn:
+            self.inventario_ordenado[i] = libro
+            return
+        self._isbns.insert(i, libro.isbn)
         self.inventario_ordenado.insert(i, libro)
 
     # ---------------------------
@@ -42,7 +74,7 @@ class Inventario:
     def buscar_lineal(self, texto: str) -> List[Libro]:
         texto = texto.lower()
         return [
-            libro for libro in self.inventario_general
+            libro for libro in self.inventario_general.values()
             if texto in libro.titulo.lower() or texto in libro.autor.lower()
         ]
 
@@ -50,21 +82,13 @@ class Inventario:
     # BINARY SEARCH BY ISBN
     # ---------------------------
     def buscar_binaria(self, isbn: str):
-        low = 0
-        high = len(self.inventario_ordenado) - 1
-
-        while low <= high:
-            mid = (low + high) // 2
-            if self.inventario_ordenado[mid].isbn == isbn:
-                return self.inventario_ordenado[mid]
-            elif self.inventario_ordenado[mid].isbn < isbn:
-                low = mid + 1
-            else:
-                high = mid - 1
+        i = bisect.bisect_left(self._isbns, isbn)
+        if i < len(self._isbns) and self._isbns[i] == isbn:
+            return self.inventario_ordenado[i]
         return None
 
     # ---------------------------
     # FOR GLOBAL REPORT WITH MERGE SORT
     # ---------------------------
     def get_libros_para_ordenar_por_valor(self):
-        return list(self.inventario_general)
+        return list(self.inventario_general.values())
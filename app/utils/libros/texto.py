@@ -0,0 +1,55 @@
+# app/utils/libros/texto.py
+import re
+import unicodedata
+from typing import List, Tuple
+
+_PALABRA = re.compile(r"\w+")
+
+# "ñ" is its own letter between "n" and "o" (Spanish alphabetical order)
+_ENE = "n\U0010ffff"
+
+
+def normalizar(texto: str) -> str:
+    """Fold case and accents so that "García" and "garcia" compare equal.
+
+    Function:
+    - normalizar(texto)
+      - Receives:
+        * texto: any string.
+      - Returns:
+        * casefolded string without combining marks (NFKD decomposition).
+    """
+    descompuesto = unicodedata.normalize("NFKD", texto.casefold())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def tokenizar(texto: str) -> List[str]:
+    """Split a text into normalized word tokens.
+
+    Function:
+    - tokenizar(texto)
+      - Receives:
+        * texto: any string (None-safe: empty list).
+      - Returns:
+        * list of normalized tokens in order (duplicates kept).
+    """
+    if not texto:
+        return []
+    return _PALABRA.findall(normalizar(texto))
+
+
+def clave_colacion(texto: str) -> Tuple[str, str]:
+    """Sort key for titles and names in Spanish alphabetical order.
+
+    Function:
+    - clave_colacion(texto)
+      - Receives:
+        * texto: any string.
+      - Returns:
+        * (primary key, original text): case and accents are ignored first
+          ("Árbol" next to "arbol"), "ñ" sorts after every "n" ("nube" <
+          "ñandú" < "oso"), and the original text breaks the remaining ties.
+    - Locale independent, so the order is the same on every server.
+    """
+    plegado = unicodedata.normalize("NFC", texto.casefold()).replace("ñ", _ENE)
+    return normalizar(plegado), texto
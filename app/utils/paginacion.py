@@ -0,0 +1,106 @@
+# app/utils/paginacion.py
+"""Helpers for paginated, filtered and projected list endpoints.
+
+Functions:
+- codificar_cursor(clave) / decodificar_cursor(cursor): opaque `after` cursor.
+- parsear_campos(fields, disponibles): validate a `fields=a,b` projection.
+- respuesta_pagina(objetos, siguiente, campos): JSON list + X-Next-Cursor header
+  (fast path of `app.utils.serializacion`, no per-item validation).
+- listar_pagina(paginar, columnas, filtros, limit, after, fields): all of the above.
+
+Lists keep their shape (a JSON array); the cursor of the next page travels
+in the `X-Next-Cursor` response header and is absent on the last page.
+"""
+
+import base64
+import binascii
+from typing import Callable, Iterable, List, Optional
+
+from fastapi.responses import Response
+
+from app.utils.serializacion import respuesta_json
+
+# Largest page a client may ask for
+LIMITE_MAXIMO = 1000
+
+CABECERA_CURSOR = "X-Next-Cursor"
+
+
+def codificar_cursor(clave: str) -> str:
+    """Turn the last primary key of a page into an opaque cursor (base64url)."""
+    return base64.urlsafe_b64encode(clave.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: Optional[str]) -> Optional[str]:
+    """Recover the primary key from a cursor.
+
+    Parameters:
+    - cursor: value received in `after` (None for the first page).
+    Returns: primary key (str) or None.
+    Raises: ValueError if the cursor is malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        return base64.b64decode(cursor + relleno, altchars=b"-_", validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def parsear_campos(fields: Optional[str], disponibles: List[str]) -> Optional[List[str]]:
+    """Parse a comma separated projection.
+
+    Parameters:
+    - fields: e.g. "isbn,titulo" (None or empty = every column).
+    - disponibles: valid column names.
+    Returns: list of columns in the requested order, or None.
+    Raises: ValueError if a column does not exist.
+    """
+    if not fields:
+        return None
+    campos = [c.strip() for c in fields.split(",") if c.strip()]
+    desconocidos = [c for c in campos if c not in disponibles]
+    if desconocidos:
+        raise ValueError(f"Unknown fields: {', '.join(desconocidos)}")
+    return campos or None
+
+
+def respuesta_pagina(objetos: Iterable[object], siguiente: Optional[str], campos: List[str]) -> Response:
+    """Serialize one page.
+
+    Parameters:
+    - objetos: objects of the page.
+    - siguiente: primary key to resume from (None on the last page).
+    - campos: attributes to return, in order.
+    Returns: JSON Response with the list and, if any, the X-Next-Cursor header.
+    """
+    cabeceras = {CABECERA_CURSOR: codificar_cursor(siguiente)} if siguiente is not None else None
+    return respuesta_json(objetos, campos, cabeceras)
+
+
+def listar_pagina(
+    paginar: Callable,
+    columnas: List[str],
+    filtros: dict,
+    limit: Optional[int],
+    after: Optional[str],
+    fields: Optional[str],
+) -> Response:
+    """Run a service `paginar(criterios, despues, limite)` and build the response.
+
+    Parameters:
+    - paginar: service function returning (objects, next key).
+    - columnas: table columns (valid projection fields).
+    - filtros: equality filters; None values are ignored.
+    - limit: page size (None = no paging).
+    - after: opaque cursor from a previous X-Next-Cursor.
+    - fields: comma separated projection.
+    Returns: JSON Response.
+    Raises: ValueError for an invalid cursor or field.
+    """
+    campos = parsear_campos(fields, columnas)
+    despues = decodificar_cursor(after)
+    criterios = {c: v for c, v in filtros.items() if v is not None}
+    objetos, siguiente = paginar(criterios, despues, limit)
+    return respuesta_pagina(objetos, siguiente, campos or columnas)
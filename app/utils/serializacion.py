@@ -0,0 +1,82 @@
+# app/utils/serializacion.py
+"""Fast JSON for trusted internal records (Libro, Prestamo, ...).
+
+Functions:
+- serializador(campos): precompiled record -> dict converter.
+- dumps(valor): JSON bytes (orjson when installed, stdlib json otherwise).
+- json_lista(objetos, campos): JSON array bytes.
+- respuesta_json(objetos, campos, headers): ready Response.
+
+Records coming from storage already have normalized types (see the models),
+so they can be encoded directly. Returning a Response from a route skips
+FastAPI's per-item response_model validation and jsonable_encoder; the
+response_model is still used for the OpenAPI docs.
+
+orjson is optional (`pip install orjson`); without it the stdlib encoder is
+used with compact separators.
+"""
+
+import json
+from operator import attrgetter
+from typing import Callable, Iterable, List, Optional
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# Encoder actually in use (reported by the benchmark)
+MOTOR_JSON = "orjson" if orjson is not None else "json"
+
+
+def serializador(campos: List[str]) -> Callable[[object], dict]:
+    """Build a converter from a record to a dict with the given keys.
+
+    Parameters:
+    - campos: attribute names, in output order.
+    Returns: function obj -> {campo: valor}.
+    """
+    campos = tuple(campos)
+    if len(campos) == 1:
+        campo = campos[0]
+        return lambda obj: {campo: getattr(obj, campo)}
+    obtener = attrgetter(*campos)
+    return lambda obj: dict(zip(campos, obtener(obj)))
+
+
+def dumps(valor) -> bytes:
+    """Encode plain data (dicts, lists, str, numbers, None) as UTF-8 JSON.
+
+    Parameters:
+    - valor: JSON-compatible value.
+    Returns: bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(valor)
+    return json.dumps(valor, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_lista(objetos: Iterable[object], campos: List[str]) -> bytes:
+    """Encode records as a JSON array of objects.
+
+    Parameters:
+    - objetos: records with the given attributes.
+    - campos: attributes to include, in order.
+    Returns: bytes.
+    """
+    convertir = serializador(campos)
+    return dumps([convertir(obj) for obj in objetos])
+
+
+def respuesta_json(objetos: Iterable[object], campos: List[str], headers: Optional[dict] = None) -> Response:
+    """Build a JSON list response without per-item validation.
+
+    Parameters:
+    - objetos: trusted records (already typed like the response schema).
+    - campos: attributes to include, in order.
+    - headers: extra response headers.
+    Returns: Response with media type application/json.
+    """
+    return Response(content=json_lista(objetos, campos), media_type="application/json", headers=headers)
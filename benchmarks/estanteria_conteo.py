@@ -0,0 +1,73 @@
+# benchmarks/estanteria_conteo.py
+"""Dangerous 4-book combinations: brute-force enumeration vs count only.
+
+First checks `contar_combinaciones_peligrosas` against a brute force over
+every 4-combination on many random small shelves. The check sums the
+weights as written (Decimal), like the counter does: with floats,
+3.6 + 3.3 + 0.9 + 0.2 gives 8.000000000000002 and the float brute force
+(`combinaciones_peligrosas`) counts that shelf as over 8 kg. Then times
+both on N books (the brute force only while it stays affordable).
+
+Usage:
+    python -m benchmarks.estanteria_conteo [N]   (default 60)
+"""
+
+import random
+import sys
+import time
+from decimal import Decimal
+from itertools import combinations
+from math import comb
+
+from app.algorithms.estanterias import PESO_MAX, combinaciones_peligrosas, contar_combinaciones_peligrosas
+from app.models.libro_model import Libro
+
+
+def _libros(n, rng, decimales=2):
+    return [
+        Libro(str(i), f"Libro {i}", "Autor", round(rng.uniform(0.1, 4.0), decimales), 1000, 1, 100, "E", "es")
+        for i in range(n)
+    ]
+
+
+# Brute force with exact decimal sums
+def contar_fuerza_bruta(libros):
+    pesos = [Decimal(repr(l.peso)) for l in libros]
+    return sum(1 for combo in combinations(pesos, 4) if sum(combo) > PESO_MAX)
+
+
+def verificar(casos=500, semilla=7):
+    rng = random.Random(semilla)
+    redondeo = 0
+    for _ in range(casos):
+        libros = _libros(rng.randint(0, 12), rng, rng.choice([0, 1, 2]))
+        esperado = contar_fuerza_bruta(libros)
+        obtenido = contar_combinaciones_peligrosas(libros)
+        assert obtenido == esperado, ([l.peso for l in libros], esperado, obtenido)
+        redondeo += len(combinaciones_peligrosas(libros)) != esperado
+    print(f"{casos} random shelves: count matches the brute force "
+          f"({redondeo} shelves differ from the float brute force by rounding at exactly {PESO_MAX} kg)")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    verificar()
+    libros = _libros(n, random.Random(n))
+    print(f"{n:,} books, {comb(n, 4):,} combinations of 4")
+
+    inicio = time.perf_counter()
+    conteo = contar_combinaciones_peligrosas(libros)
+    rapido = time.perf_counter() - inicio
+    print(f"count only   {rapido * 1000:10.1f} ms   {conteo:,} over the limit")
+
+    if n <= 120:
+        inicio = time.perf_counter()
+        len(combinaciones_peligrosas(libros))
+        bruto = time.perf_counter() - inicio
+        print(f"brute force  {bruto * 1000:10.1f} ms   x{bruto / rapido:,.0f} slower")
+    else:
+        print("brute force  skipped (more than 120 books)")
+
+
+if __name__ == "__main__":
+    main()
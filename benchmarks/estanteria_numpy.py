@@ -0,0 +1,95 @@
+# benchmarks/estanteria_numpy.py
+"""Dangerous 4-book combinations: float brute force vs block engines.
+
+First checks that `bloques_combinaciones_peligrosas` returns exactly the
+index tuples of an exact (Decimal) brute force, in itertools.combinations
+order, with both the NumPy engine and the pure Python fallback. Then
+measures throughput (combinations examined per second) on N books:
+
+- brute force: the loop of `combinaciones_peligrosas` (sum of four float
+  attributes per combination). Timed on the first 2,000,000 combinations
+  only and extrapolated, since the full run takes minutes at N = 200.
+- python: pure Python engine (integer weights, pruning).
+- numpy: vectorized engine, if NumPy is installed.
+
+Usage:
+    python -m benchmarks.estanteria_numpy [N]   (default 200)
+"""
+
+import random
+import sys
+import time
+from decimal import Decimal
+from itertools import combinations, islice
+from math import comb
+
+from app.algorithms import estanterias
+from app.algorithms.estanterias import PESO_MAX, bloques_combinaciones_peligrosas
+from app.models.libro_model import Libro
+
+MUESTRA_FUERZA_BRUTA = 2_000_000
+
+
+def _libros(n, rng, decimales=2):
+    return [
+        Libro(str(i), f"Libro {i}", "Autor", round(rng.uniform(0.1, 4.0), decimales), 1000, 1, 100, "E", "es")
+        for i in range(n)
+    ]
+
+
+def _indices(libros):
+    return [tuple(int(x) for x in fila) for bloque in bloques_combinaciones_peligrosas(libros) for fila in bloque]
+
+
+def _con_python(funcion, *args):
+    motor, estanterias.np = estanterias.np, None
+    try:
+        return funcion(*args)
+    finally:
+        estanterias.np = motor
+
+
+def verificar(casos=300, semilla=11):
+    rng = random.Random(semilla)
+    for _ in range(casos):
+        libros = _libros(rng.randint(0, 14), rng, rng.choice([0, 1, 2]))
+        pesos = [Decimal(repr(l.peso)) for l in libros]
+        esperado = [c for c in combinations(range(len(libros)), 4) if sum(pesos[i] for i in c) > PESO_MAX]
+        assert _indices(libros) == esperado
+        assert _con_python(_indices, libros) == esperado
+    print(f"{casos} random shelves: both engines match the exact brute force")
+
+
+# Combinations over the limit, consuming every block
+def contar(libros):
+    return sum(len(bloque) for bloque in bloques_combinaciones_peligrosas(libros))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    verificar()
+    libros = _libros(n, random.Random(n))
+    total = comb(n, 4)
+    print(f"{n:,} books, {total:,} combinations of 4")
+
+    muestra = min(total, MUESTRA_FUERZA_BRUTA)
+    inicio = time.perf_counter()
+    for combo in islice(combinations(libros, 4), muestra):
+        sum([libro.peso for libro in combo]) > PESO_MAX
+    bruto = (time.perf_counter() - inicio) * total / muestra
+    print(f"brute force  {bruto * 1000:10.1f} ms   (extrapolated from {muestra:,} combinations)")
+
+    motores = [("python", lambda: _con_python(contar, libros))]
+    if estanterias.np is not None:
+        motores.append(("numpy", lambda: contar(libros)))
+    else:
+        print("numpy not installed: skipping the vectorized engine")
+    for nombre, funcion in motores:
+        inicio = time.perf_counter()
+        encontradas = funcion()
+        segundos = time.perf_counter() - inicio
+        print(f"{nombre:12} {segundos * 1000:10.1f} ms   x{bruto / segundos:5.0f}   {encontradas:,} over the limit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/estanteria_paralelo.py
+"""Parallel brute-force shelf scan: scaling across processes.
+
+Runs `escanear_paralelo` (the scan behind `?workers=N` on the deficient
+shelf endpoints) with 1, 2, ... W processes on N books and checks that
+every run returns the same index tuples in the same order. The weights are
+drawn so that only a small share of combinations exceeds the limit, which
+keeps the time in the scan itself rather than in sending results back.
+
+The endpoints share one long-lived pool of CPU-count processes and each
+scan keeps at most W ranges in flight on it, so each worker count is run
+once to start the processes and build their pair tables, then timed (the
+warm-up time is printed too). Worker counts above the CPU count are capped
+by `escanear_paralelo`. Uses NumPy inside each worker when it is installed.
+
+Usage:
+    python -m benchmarks.estanteria_paralelo [N] [W]   (default 400, CPU count)
+"""
+
+import os
+import random
+import sys
+import time
+from math import comb
+
+from app.algorithms.estanterias import MOTOR_COMBINACIONES, PESO_MAX, _pesos_enteros, escanear_paralelo
+
+
+def _pesos(n, rng):
+    return [round(rng.uniform(0.1, 2.6), 2) for _ in range(n)]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    maximo = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    pesos, limite, _ = _pesos_enteros(_pesos(n, random.Random(n)), PESO_MAX)
+    print(f"{n:,} books, {comb(n, 4):,} combinations of 4, engine: {MOTOR_COMBINACIONES}, {os.cpu_count()} CPUs")
+
+    referencia = None
+    base = None
+    for workers in range(1, maximo + 1):
+        inicio = time.perf_counter()
+        escanear_paralelo(pesos, limite, workers)
+        arranque = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        partes = escanear_paralelo(pesos, limite, workers)
+        segundos = time.perf_counter() - inicio
+        indices = [x for parte in partes for x in parte.tolist()]
+        if referencia is None:
+            referencia = indices
+        assert indices == referencia, workers
+        base = base or segundos
+        print(f"workers={workers:<3} {segundos * 1000:10.1f} ms   x{base / segundos:4.1f}   "
+              f"(first run {arranque * 1000:.1f} ms)   {len(indices) // 4:,} over the limit")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/memoria_modelos.py
+"""Memory used by the domain records: slotted models vs plain classes.
+
+Builds N loans and N books as the CSV loader does (every field is a new
+string, as `csv.DictReader` returns them) and measures the allocated bytes
+with tracemalloc, once with the previous plain-class layout (per-instance
+`__dict__`, no interning) and once with the current slotted models.
+
+Usage:
+    python -m benchmarks.memoria_modelos [N]   (default 1_000_000)
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from app.models.libro_model import Libro
+from app.models.prestamo_model import Prestamo
+
+
+# Previous layout of Prestamo (plain class, one __dict__ per instance)
+class PrestamoPlano:
+    def __init__(self, prestamo_id, user_id, isbn, fecha_prestamo, fecha_devolucion=None, devuelto="0"):
+        self.prestamo_id = prestamo_id
+        self.user_id = user_id
+        self.isbn = isbn
+        self.fecha_prestamo = fecha_prestamo
+        self.fecha_devolucion = fecha_devolucion
+        self.devuelto = devuelto
+
+
+# Previous layout of Libro (plain class, one __dict__ per instance)
+class LibroPlano:
+    def __init__(self, isbn, titulo, autor, peso, valor, stock, paginas, editorial, idioma):
+        self.isbn = isbn
+        self.titulo = titulo
+        self.autor = autor
+        self.peso = float(peso)
+        self.valor = int(valor)
+        self.stock = int(stock)
+        self.paginas = int(paginas)
+        self.editorial = editorial
+        self.idioma = idioma
+
+
+# One CSV-like row per loan: fresh strings, realistic repetition
+def _filas_prestamos(n):
+    for i in range(n):
+        devuelto = i % 3 == 0
+        yield {
+            "prestamo_id": str(i + 1),
+            "user_id": str(i % 5000),
+            "isbn": str(9780000000000 + i % 20000),
+            "fecha_prestamo": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+            "fecha_devolucion": f"2025-{i % 12 + 1:02d}-{i % 27 + 2:02d}" if devuelto else None,
+            "devuelto": "1" if devuelto else "0",
+        }
+
+
+# One CSV-like row per book
+def _filas_libros(n):
+    for i in range(n):
+        yield {
+            "isbn": str(9780000000000 + i),
+            "titulo": f"Titulo {i}",
+            "autor": f"Autor {i % 2000}",
+            "peso": str(0.5 + i % 30 / 10),
+            "valor": str(10000 + i % 90000),
+            "stock": str(i % 10),
+            "paginas": str(100 + i % 900),
+            "editorial": f"Editorial {i % 50}",
+            "idioma": ("Español", "English", "Français")[i % 3],
+        }
+
+
+# Bytes still allocated after building the list of records
+def medir(clase, filas):
+    gc.collect()
+    tracemalloc.start()
+    registros = [clase(**fila) for fila in filas]
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del registros
+    return actual
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{n:,} rows")
+    for nombre, antes, despues, filas in (
+        ("Prestamo", PrestamoPlano, Prestamo, _filas_prestamos),
+        ("Libro", LibroPlano, Libro, _filas_libros),
+    ):
+        bytes_antes = medir(antes, filas(n))
+        bytes_despues = medir(despues, filas(n))
+        print(
+            f"{nombre:9} plain: {bytes_antes / 2**20:8.1f} MiB ({bytes_antes / n:5.0f} B/row)   "
+            f"slotted: {bytes_despues / 2**20:8.1f} MiB ({bytes_despues / n:5.0f} B/row)   "
+            f"-{100 * (1 - bytes_despues / bytes_antes):.0f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
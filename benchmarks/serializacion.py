@@ -0,0 +1,106 @@
+# benchmarks/serializacion.py
+"""JSON encoding of large book lists: response_model path vs fast path.
+
+Encodes N slotted Libro records the ways a list endpoint can:
+
+- response_model: what FastAPI does for `response_model=List[LibroOut]`
+  (pydantic validation from attributes, dump to JSON-able data, json.dumps).
+- jsonable_encoder: what paginated lists used before (dict(obj) per record).
+- fast path: `app.utils.serializacion.json_lista` with the stdlib encoder
+  and, if installed, with orjson.
+
+Every path must produce the same decoded JSON; the script checks it.
+
+Usage:
+    python -m benchmarks.serializacion [N]   (default 100_000)
+"""
+
+import json
+import sys
+import time
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.models.libro_model import Libro
+from app.schemas.libro_schema import LibroOut
+from app.utils import serializacion
+from app.utils.serializacion import json_lista
+
+CAMPOS = list(LibroOut.model_fields)
+
+
+# Same json.dumps call as fastapi.responses.JSONResponse.render
+def _render(contenido) -> bytes:
+    return json.dumps(contenido, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _libros(n):
+    return [
+        Libro(
+            str(9780000000000 + i), f"Título {i}", f"Autor {i % 2000}", 0.5 + i % 30 / 10,
+            10000 + i % 90000, i % 10, 100 + i % 900, f"Editorial {i % 50}", ("Español", "English")[i % 2],
+        )
+        for i in range(n)
+    ]
+
+
+def por_response_model(libros, adaptador=TypeAdapter(List[LibroOut])) -> bytes:
+    validados = adaptador.validate_python(libros, from_attributes=True)
+    return _render(adaptador.dump_python(validados, mode="json"))
+
+
+def por_jsonable_encoder(libros) -> bytes:
+    return _render(jsonable_encoder(libros))
+
+
+def por_json(libros) -> bytes:
+    motor, serializacion.orjson = serializacion.orjson, None
+    try:
+        return json_lista(libros, CAMPOS)
+    finally:
+        serializacion.orjson = motor
+
+
+def por_orjson(libros) -> bytes:
+    return json_lista(libros, CAMPOS)
+
+
+# Best of a few runs, in seconds
+def medir(funcion, libros, repeticiones=3):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(libros)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    libros = _libros(n)
+    caminos = [
+        ("response_model", por_response_model),
+        ("jsonable_encoder", por_jsonable_encoder),
+        ("fast path (json)", por_json),
+    ]
+    if serializacion.orjson is not None:
+        caminos.append(("fast path (orjson)", por_orjson))
+    else:
+        print("orjson not installed: skipping the orjson fast path")
+
+    referencia = json.loads(por_response_model(libros))
+    for nombre, funcion in caminos:
+        assert json.loads(funcion(libros)) == referencia, nombre
+
+    print(f"{n:,} books")
+    base = None
+    for nombre, funcion in caminos:
+        segundos = medir(funcion, libros)
+        base = base or segundos
+        print(f"{nombre:20} {segundos * 1000:9.1f} ms   x{base / segundos:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
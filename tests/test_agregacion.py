@@ -0,0 +1,31 @@
+# tests/test_agregacion.py
+from types import SimpleNamespace
+
+from app.utils.agregacion import agregar, parsear_metricas
+
+COLUMNAS = ["prestamo_id", "user_id", "fecha", "peso"]
+
+
+def _filas(*valores):
+    return [SimpleNamespace(prestamo_id=i, user_id=u, fecha=f, peso=p) for i, u, f, p in valores]
+
+
+def test_min_max_compare_numeric_strings_as_numbers():
+    filas = _filas(("9", "1", "2025-01-02", "2.5"), ("10", "1", "2025-01-01", None), ("100", "2", "2025-01-03", "0.5"))
+    metricas = parsear_metricas("min:prestamo_id,max:prestamo_id,min:fecha,max:fecha,min:peso", COLUMNAS)
+    [grupo] = agregar(filas, [], metricas)
+    # stored values are returned, compared by number
+    assert grupo["min_prestamo_id"] == "9"
+    assert grupo["max_prestamo_id"] == "100"
+    assert grupo["min_fecha"] == "2025-01-01"
+    assert grupo["max_fecha"] == "2025-01-03"
+    assert grupo["min_peso"] == "0.5"
+
+
+def test_sum_avg_count_by_group():
+    filas = _filas(("1", "a", "x", "1"), ("2", "a", "x", "2.5"), ("3", "b", "x", None))
+    grupos = agregar(filas, ["user_id"], parsear_metricas("count,sum:peso,avg:peso,max:peso", COLUMNAS))
+    assert grupos == [
+        {"user_id": "a", "count": 2, "sum_peso": 3.5, "avg_peso": 1.75, "max_peso": "2.5"},
+        {"user_id": "b", "count": 1, "sum_peso": None, "avg_peso": None, "max_peso": None},
+    ]
@@ -0,0 +1,58 @@
+# tests/test_condicional.py
+from app.utils.condicional import coincide, etiqueta, respuesta_condicional
+
+
+def test_tag_depends_on_resource_query_and_version():
+    base = etiqueta((0, 1), "/libros/", [("limit", "5")])
+    assert etiqueta((0, 1), "/prestamos/", [("limit", "5")]) != base
+    assert etiqueta((0, 1), "/libros/", [("limit", "6")]) != base
+    assert etiqueta((0, 1), "/libros/", [("limit", "5"), ("fields", "isbn")]) != base
+    assert etiqueta((0, 2), "/libros/", [("limit", "5")]) != base
+
+
+def test_query_order_is_normalized():
+    assert etiqueta((0, 1), "/libros/", [("a", "1"), ("b", "2")]) == etiqueta((0, 1), "/libros/", [("b", "2"), ("a", "1")])
+    # repeated names keep their order (it changes the response)
+    assert etiqueta((0, 1), "/r", [("autor", "A"), ("autor", "B")]) != etiqueta((0, 1), "/r", [("autor", "B"), ("autor", "A")])
+
+
+def test_weak_comparison():
+    etag = etiqueta((0, 1), "/libros/")
+    assert coincide(etag, etag)
+    assert coincide(f'"x", {etag[2:]}', etag)
+    assert coincide("*", etag)
+    assert not coincide(None, etag)
+    assert not coincide('W/"otro"', etag)
+
+
+def _cliente():
+    from fastapi import FastAPI, HTTPException, Request, Response
+    from fastapi.testclient import TestClient
+
+    app = FastAPI()
+    datos = {"1": {"isbn": "1"}}
+
+    @app.get("/libros/{isbn}")
+    def obtener(isbn: str, request: Request, response: Response):
+        def construir():
+            if isbn not in datos:
+                raise HTTPException(status_code=404, detail="Book not found")
+            return datos[isbn]
+        return respuesta_condicional(request, response, lambda: (0, 1), construir)
+
+    return TestClient(app)
+
+
+def test_wildcard_only_matches_existing_resources():
+    cliente = _cliente()
+    assert cliente.get("/libros/1", headers={"If-None-Match": "*"}).status_code == 304
+    assert cliente.get("/libros/2", headers={"If-None-Match": "*"}).status_code == 404
+
+
+def test_current_tag_gets_304_without_building():
+    cliente = _cliente()
+    respuesta = cliente.get("/libros/1")
+    assert respuesta.status_code == 200
+    etag = respuesta.headers["etag"]
+    assert cliente.get("/libros/1", headers={"If-None-Match": etag}).status_code == 304
+    assert cliente.get("/libros/2", headers={"If-None-Match": etag}).status_code == 404
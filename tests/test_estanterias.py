@@ -0,0 +1,180 @@
+# tests/test_estanterias.py
+import random
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from itertools import combinations
+
+import pytest
+
+from app.algorithms import estanterias
+from app.algorithms.estanterias import (
+    PESO_MAX,
+    bloques_combinaciones_peligrosas,
+    cerrar_pool,
+    combinaciones_mas_pesadas,
+    combinaciones_peligrosas_paralelo,
+    combinaciones_peligrosas,
+    contar_combinaciones_peligrosas,
+    iterar_combinaciones_peligrosas,
+)
+from app.models.libro_model import Libro
+
+
+def _libros(pesos):
+    return [Libro(str(i), f"Libro {i}", "Autor", p, 1000, 1, 100, "Editorial", "es") for i, p in enumerate(pesos)]
+
+
+def _aleatorios(rng, n, decimales):
+    return _libros([round(rng.uniform(0.1, 4.0), decimales) for _ in range(n)])
+
+
+# Brute force with exact decimal sums (weights as written)
+def _indices_exactos(libros, peso_max=PESO_MAX):
+    pesos = [Decimal(repr(libro.peso)) for libro in libros]
+    return [c for c in combinations(range(len(libros)), 4) if sum(pesos[i] for i in c) > peso_max]
+
+
+def _indices(libros):
+    return [tuple(int(x) for x in fila) for bloque in bloques_combinaciones_peligrosas(libros) for fila in bloque]
+
+
+def test_count_matches_brute_force():
+    rng = random.Random(21)
+    for _ in range(200):
+        # quarter-kilo weights add up exactly in floats too, so the float
+        # brute force is a valid reference, ties at exactly 8 kg included
+        libros = _libros([rng.randint(1, 16) / 4 for _ in range(rng.randint(0, 12))])
+        assert contar_combinaciones_peligrosas(libros) == len(combinaciones_peligrosas(libros))
+
+
+def test_count_ties_at_limit():
+    assert contar_combinaciones_peligrosas(_libros([2.0, 2.0, 2.0, 2.0])) == 0
+    assert contar_combinaciones_peligrosas(_libros([2.0, 2.0, 2.0, 2.0, 2.25])) == 4
+    # 8.000000000000002 in floats, exactly 8 as written
+    assert contar_combinaciones_peligrosas(_libros([3.6, 3.3, 0.9, 0.2])) == 0
+
+
+def test_count_matches_exact_brute_force_with_decimals():
+    rng = random.Random(22)
+    for _ in range(200):
+        libros = _aleatorios(rng, rng.randint(0, 12), rng.choice([0, 1, 2]))
+        assert contar_combinaciones_peligrosas(libros) == len(_indices_exactos(libros))
+
+
+def test_weights_beyond_64_bits_fall_back_to_python_ints():
+    # 1e-300 forces a scale of 10**300: far outside int64
+    libros = _libros([1e-300, 2.5, 3.0, 3.0, 2.7, 0.5])
+    esperado = _indices_exactos(libros)
+    assert esperado
+    assert _indices(libros) == esperado
+    assert contar_combinaciones_peligrosas(libros) == len(esperado)
+
+
+def test_iterator_matches_blocks_with_exact_totals():
+    rng = random.Random(23)
+    for _ in range(50):
+        libros = _aleatorios(rng, rng.randint(0, 12), 2)
+        combos = list(iterar_combinaciones_peligrosas(libros))
+        assert [tuple(libros.index(l) for l in c["libros"]) for c in combos] == _indices_exactos(libros)
+        for c in combos:
+            assert c["peso_total"] == float(sum(Decimal(repr(l.peso)) for l in c["libros"]))
+
+
+@pytest.mark.skipif(estanterias.np is None, reason="numpy not installed")
+def test_numpy_engine_with_tiny_segments_and_budget(monkeypatch):
+    # many segments, none kept: same rows as with the whole table cached
+    monkeypatch.setattr(estanterias, "TAMANO_BLOQUE", 7)
+    monkeypatch.setattr(estanterias, "MAX_BYTES_PARES", 0)
+    rng = random.Random(24)
+    for _ in range(50):
+        libros = _aleatorios(rng, rng.randint(4, 16), rng.choice([1, 2]))
+        assert _indices(libros) == _indices_exactos(libros)
+
+
+def test_python_engine_matches(monkeypatch):
+    monkeypatch.setattr(estanterias, "np", None)
+    rng = random.Random(25)
+    for _ in range(50):
+        libros = _aleatorios(rng, rng.randint(0, 12), 2)
+        assert _indices(libros) == _indices_exactos(libros)
+
+
+def test_parallel_scan_matches_sequential_order(monkeypatch):
+    monkeypatch.setattr(estanterias, "MAX_WORKERS", 2)  # use the pool even on one CPU
+    rng = random.Random(26)
+    casos = [_aleatorios(rng, rng.randint(0, 14), 2) for _ in range(10)]
+    try:
+        for libros in casos:
+            esperado = _indices_exactos(libros)
+            for workers in (1, 2):
+                combos = combinaciones_peligrosas_paralelo(libros, workers=workers)
+                assert [tuple(libros.index(l) for l in c["libros"]) for c in combos] == esperado
+    finally:
+        cerrar_pool()
+
+
+def test_parallel_scans_share_one_pool_across_threads(monkeypatch):
+    monkeypatch.setattr(estanterias, "MAX_WORKERS", 3)
+    libros = _aleatorios(random.Random(28), 16, 2)
+    esperado = _indices_exactos(libros)
+    try:
+        pool = estanterias._obtener_pool()
+        with ThreadPoolExecutor(max_workers=4) as hilos:
+            # alternating worker counts must neither resize nor close the shared pool
+            resultados = list(hilos.map(lambda w: combinaciones_peligrosas_paralelo(libros, workers=w), [2, 3, 2, 3, 2, 3]))
+        assert estanterias._obtener_pool() is pool
+        for combos in resultados:
+            assert [tuple(libros.index(l) for l in c["libros"]) for c in combos] == esperado
+    finally:
+        cerrar_pool()
+
+
+def test_top_k_matches_sorted_brute_force():
+    rng = random.Random(27)
+    for _ in range(300):
+        # few distinct weights: many ties, also at exactly 8 kg
+        libros = _libros([rng.choice([0.5, 1.0, 2.0, 2.25, 3.5]) for _ in range(rng.randint(0, 10))])
+        pesos = [Decimal(repr(libro.peso)) for libro in libros]
+        todas = sorted(
+            ((sum(pesos[i] for i in c), frozenset(c)) for c in combinations(range(len(libros)), 4)),
+            key=lambda par: -par[0],
+        )
+        peligrosas = [par for par in todas if par[0] > PESO_MAX]
+        k = rng.randint(1, len(peligrosas) + 5)  # may exceed the qualifying combinations
+        esperado = peligrosas[:k]
+
+        obtenido = combinaciones_mas_pesadas(libros, k)
+        assert [c["peso_total"] for c in obtenido] == [float(p) for p, _ in esperado]
+        grupos = [frozenset(libros.index(l) for l in c["libros"]) for c in obtenido]
+        assert len(set(grupos)) == len(grupos)
+        for grupo, (peso, _) in zip(grupos, esperado):
+            assert sum(pesos[i] for i in grupo) == peso
+        # every combination strictly heavier than the last one returned is there
+        if esperado:
+            assert {g for p, g in peligrosas if p > esperado[-1][0]} <= set(grupos)
+
+
+def test_top_k_edge_cases():
+    assert combinaciones_mas_pesadas(_libros([3.0, 3.0, 3.0]), 5) == []
+    assert combinaciones_mas_pesadas(_libros([2.0, 2.0, 2.0, 2.0]), 5) == []
+    assert combinaciones_mas_pesadas(_libros([3.0] * 5), 0) == []
+    assert len(combinaciones_mas_pesadas(_libros([3.0] * 6), 100)) == 15
+
+
+@pytest.mark.parametrize("malo", [float("nan"), float("inf"), float("-inf")])
+def test_non_finite_weights_are_rejected(malo):
+    libros = _libros([3.0, 2.0, 1.0, malo, 2.5])
+    with pytest.raises(ValueError):
+        contar_combinaciones_peligrosas(libros)
+    with pytest.raises(ValueError):
+        combinaciones_mas_pesadas(libros, 3)
+
+
+def test_service_default_and_parallel_agree_at_exact_limit(monkeypatch):
+    from app.services.libro_service import LibroService
+    libros = _libros([3.6, 3.3, 0.9, 0.2, 4.1, 0.3])
+    monkeypatch.setattr(LibroService, "cargar_libros", staticmethod(lambda: libros))
+    secuencial = LibroService.estanteria_deficiente()
+    assert secuencial == LibroService.estanteria_deficiente(workers=1)
+    assert len(secuencial) == contar_combinaciones_peligrosas(libros) == len(_indices_exactos(libros))
+    assert ["Libro 0", "Libro 1", "Libro 2", "Libro 3"] not in [c["libros"] for c in secuencial]
@@ -0,0 +1,38 @@
+# tests/test_importacion.py
+import io
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.libro_schema import LibroCreate
+from app.utils.libros.importacion import leer_registros
+
+
+def _leer(texto, formato="csv"):
+    return list(leer_registros(io.BytesIO(texto.encode("utf-8")), formato))
+
+
+def test_csv_rows_and_extra_columns():
+    registros = _leer("isbn,titulo\n1,A\n2,B,extra\n")
+    assert registros[0] == (1, {"isbn": "1", "titulo": "A"}, None)
+    assert registros[1][2] == "more columns than the header"
+
+
+def test_csv_parser_errors_become_value_error():
+    campo = "x" * 200_000  # over csv.field_size_limit()
+    with pytest.raises(ValueError, match="Invalid CSV after record 1"):
+        _leer(f"isbn,titulo\n1,A\n2,{campo}\n")
+
+
+def test_ndjson_bad_lines_are_reported():
+    registros = _leer('{"isbn": "1"}\nnot json\n[1]\n', "ndjson")
+    assert registros[0] == (1, {"isbn": "1"}, None)
+    assert registros[1][2].startswith("invalid JSON")
+    assert registros[2][2] == "each line must be a JSON object"
+
+
+def test_schema_rejects_non_finite_weight():
+    datos = {"isbn": "1", "titulo": "T", "autor": "A", "peso": float("nan"), "valor": 1000,
+             "stock": 1, "paginas": 100, "editorial": "E", "idioma": "es"}
+    with pytest.raises(ValidationError):
+        LibroCreate(**datos)
@@ -0,0 +1,106 @@
+# tests/test_tabla_journal.py
+import csv
+import os
+
+from app.db.tabla_journal import TablaCSVJournal
+from app.db.tablas import TABLAS
+from app.models.prestamo_model import Prestamo
+
+CAMPOS = TABLAS["prestamos"]["campos"]
+
+
+def _tabla(tmp_path, umbral=1000):
+    ruta = str(tmp_path / "prestamos.csv")
+    return TablaCSVJournal(
+        ruta, CAMPOS, "prestamo_id", TABLAS["prestamos"]["fabrica"], ruta + ".journal",
+        umbral_compactacion=umbral, clave_numerica=True,
+    )
+
+
+def _escribir_base(tabla, filas):
+    with open(tabla.ruta, mode="w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(CAMPOS)
+        writer.writerows(filas)
+
+
+def _escribir_journal(tabla, registros, final=""):
+    with open(tabla.ruta_journal, mode="w", encoding="utf-8", newline="") as file:
+        csv.writer(file).writerows(registros)
+        file.write(final)
+
+
+def _estado(objs):
+    return [dict(obj) for obj in objs]
+
+
+def test_replay_insert_update_delete(tmp_path):
+    tabla = _tabla(tmp_path)
+    _escribir_base(tabla, [
+        ["1", "u1", "111", "2025-01-01", "", "0"],
+        ["2", "u2", "222", "2025-01-02", "", "0"],
+        ["3", "u3", "333", "2025-01-03", "", "0"],
+    ])
+    _escribir_journal(tabla, [
+        ["put", "4", "u4", "444", "2025-01-04", "", "0"],            # insert
+        ["put", "1", "u1", "111", "2025-01-01", "2025-01-09", "1"],  # update
+        ["del", "2", "", "", "", "", ""],                            # delete
+    ])
+
+    esperado = [
+        {"prestamo_id": "1", "user_id": "u1", "isbn": "111", "fecha_prestamo": "2025-01-01",
+         "fecha_devolucion": "2025-01-09", "devuelto": "1"},
+        {"prestamo_id": "3", "user_id": "u3", "isbn": "333", "fecha_prestamo": "2025-01-03",
+         "fecha_devolucion": None, "devuelto": "0"},
+        {"prestamo_id": "4", "user_id": "u4", "isbn": "444", "fecha_prestamo": "2025-01-04",
+         "fecha_devolucion": None, "devuelto": "0"},
+    ]
+    # streaming applies the journal without loading the table
+    assert _estado(tabla.iterar()) == esperado
+    assert _estado(tabla.listar()) == esperado
+    assert tabla.obtener("2") is None
+
+
+def test_truncated_last_record_is_dropped(tmp_path):
+    tabla = _tabla(tmp_path)
+    _escribir_base(tabla, [["1", "u1", "111", "2025-01-01", "", "0"]])
+    _escribir_journal(
+        tabla,
+        [["put", "2", "u2", "222", "2025-01-02", "", "0"]],
+        final="put,3,u3,33",  # crash in the middle of an append
+    )
+
+    assert [p.prestamo_id for p in tabla.listar()] == ["1", "2"]
+    # the partial record is gone, new appends start on a clean line
+    tabla.insertar(Prestamo("5", "u5", "555", "2025-01-05"))
+    recargada = _tabla(tmp_path)
+    assert [p.prestamo_id for p in recargada.listar()] == ["1", "2", "5"]
+
+
+def test_compaction_keeps_visible_state(tmp_path):
+    tabla = _tabla(tmp_path)
+    _escribir_base(tabla, [])
+    for i in range(1, 6):
+        tabla.insertar(Prestamo(str(i), f"u{i}", f"{i}" * 3, "2025-01-01"))
+    tabla.actualizar("2", Prestamo("2", "u2", "222", "2025-01-01", "2025-02-01", "1"))
+    tabla.eliminar("4")
+    antes = _estado(tabla.listar())
+    assert os.path.getsize(tabla.ruta_journal) > 0
+
+    tabla.compactar()
+
+    assert not os.path.exists(tabla.ruta_journal)
+    assert _estado(tabla.listar()) == antes
+    assert _estado(_tabla(tmp_path).listar()) == antes
+    assert _estado(_tabla(tmp_path).iterar()) == antes
+
+
+def test_threshold_compacts_automatically(tmp_path):
+    tabla = _tabla(tmp_path, umbral=3)
+    _escribir_base(tabla, [])
+    for i in range(1, 5):
+        tabla.insertar(Prestamo(str(i), "u", "111", "2025-01-01"))
+    # the third record folded the journal into the base file
+    with open(tabla.ruta_journal, encoding="utf-8") as file:
+        assert len(file.readlines()) == 1
+    assert [p.prestamo_id for p in _tabla(tmp_path).listar()] == ["1", "2", "3", "4"]
@@ -0,0 +1,43 @@
+# tests/test_tabla_sqlite.py
+import sqlite3
+
+from app.db.tablas import repositorio_sqlite
+from app.models.libro_model import Libro
+from app.models.user_model import Usuario
+
+
+def _libro(isbn):
+    return Libro(isbn, "Titulo", "Autor", 1.0, 1000, 1, 100, "Editorial", "es")
+
+
+def test_write_to_one_table_keeps_other_versions(tmp_path):
+    ruta = str(tmp_path / "biblioteca.db")
+    libros = repositorio_sqlite("libros", ruta)
+    usuarios = repositorio_sqlite("usuarios", ruta)
+    prestamos = repositorio_sqlite("prestamos", ruta)
+    libros.insertar(_libro("1"))
+    antes_libros, antes_prestamos = libros.version(), prestamos.version()
+
+    usuarios.insertar(Usuario("1", "Ana", "ana@example.com", "300"))
+    usuarios.actualizar("1", Usuario("1", "Ana M", "ana@example.com", "300"))
+    usuarios.eliminar("1")
+
+    assert libros.version() == antes_libros
+    assert prestamos.version() == antes_prestamos
+
+
+def test_version_sees_changes_from_other_connections(tmp_path):
+    ruta = str(tmp_path / "biblioteca.db")
+    libros = repositorio_sqlite("libros", ruta)
+    libros.insertar(_libro("1"))
+    antes = libros.version()
+
+    # another process/connection editing the same table
+    otra = repositorio_sqlite("libros", ruta)
+    otra.insertar(_libro("2"))
+    assert libros.version() != antes
+
+    antes = libros.version()
+    with sqlite3.connect(ruta) as conexion:
+        conexion.execute("UPDATE libros SET stock = 5 WHERE isbn = '1'")
+    assert libros.version() != antes